@@ -5,3 +5,8 @@ from frappe.model.document import Document
 
 class AIAuditLog(Document):
     pass
+
+
+def on_doctype_update():
+    # Approval history of one artifact, newest first
+    frappe.db.add_index("AI Audit Log", ["artifact_id", "timestamp"])
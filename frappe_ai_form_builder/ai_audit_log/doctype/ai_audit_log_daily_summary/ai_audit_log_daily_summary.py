@@ -0,0 +1,8 @@
+# AI Audit Log Daily Summary DocType controller
+
+import frappe
+from frappe.model.document import Document
+
+class AIAuditLogDailySummary(Document):
+    """Audit events per day, action, actor and artifact type, rolled up from expired AI Audit Log rows"""
+    pass
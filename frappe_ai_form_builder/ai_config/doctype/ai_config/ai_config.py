@@ -13,6 +13,10 @@ class AIConfig(Document):
             frappe.throw("Please enter OpenAI API Key")
         elif self.llm_provider == "anthropic" and not self.anthropic_api_key:
             frappe.throw("Please enter Anthropic API Key")
+        
+        # Reject instructions that leave no room in the prompt token budget
+        from frappe_ai_form_builder.api.prompt_registry import validate_prompt_budget
+        validate_prompt_budget(self)
     
     def on_update(self):
         """Clear cache after updating AI Config"""
@@ -20,5 +24,9 @@ class AIConfig(Document):
         frappe.cache().hdel("singles", "AI Config")
         frappe.clear_cache(doctype="AI Config")
         
+        # Rebuild the compiled spec validator from the new allowed/blacklisted fields
+        from frappe_ai_form_builder.api.spec_validator import clear_spec_validator_cache
+        clear_spec_validator_cache()
+        
         # Log the change
         frappe.logger().info(f"AI Config updated - Provider: {self.llm_provider}, Model: {self.get(f'{self.llm_provider}_model')}")
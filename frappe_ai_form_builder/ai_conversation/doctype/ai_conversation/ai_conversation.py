@@ -5,3 +5,8 @@ from frappe.model.document import Document
 
 class AIConversation(Document):
     pass
+
+
+def on_doctype_update():
+    # A user's conversations filtered by state
+    frappe.db.add_index("AI Conversation", ["user", "state"])
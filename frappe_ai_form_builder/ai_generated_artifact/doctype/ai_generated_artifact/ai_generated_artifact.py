@@ -16,13 +16,25 @@ class AIGeneratedArtifact(Document):
 				frappe.throw(_("Only System Managers can approve or reject artifacts"))
 
 	def on_update(self):
-		# Log status changes
+		# Log status changes (merged with the API's own entry for the same action)
 		if self.has_value_changed("status"):
-			frappe.get_doc({
-				"doctype": "AI Audit Log",
-				"action": self.status,
-				"artifact_id": self.name,
-				"artifact_name": self.artifact_name,
-				"actor": frappe.session.user
-			}).insert(ignore_permissions=True)
+			from frappe_ai_form_builder.api.audit_log import record_audit_event
+			record_audit_event(self.status, self.name, self.artifact_name)
 
+			# Refresh the admin review queue once the change is visible
+			from frappe_ai_form_builder.api.review_queue import invalidate_review_queue
+			frappe.db.after_commit.add(invalidate_review_queue)
+
+			# Make newly approved forms available for reuse once committed
+			if self.status == "approved" and self.artifact_type == "DocType":
+				from frappe_ai_form_builder.api.similarity_index import index_artifact
+				frappe.db.after_commit.add(lambda: index_artifact(self.name, self.artifact_name, self.content))
+
+
+def on_doctype_update():
+	# Approved/draft artifacts by type, in modified order (review queue, similarity index sync)
+	frappe.db.add_index("AI Generated Artifact", ["status", "artifact_type", "modified"])
+	# Review queue pages across all artifact types, newest first
+	frappe.db.add_index("AI Generated Artifact", ["status", "modified"])
+	# Earlier approvals of the same conversation (revision lookup)
+	frappe.db.add_index("AI Generated Artifact", ["session_id", "status"])
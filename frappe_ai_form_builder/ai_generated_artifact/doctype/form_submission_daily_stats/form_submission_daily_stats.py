@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.model.document import Document
+
+class FormSubmissionDailyStats(Document):
+	"""Submissions per Web Form per day, maintained by api.submission_stats"""
+	pass
@@ -7,4 +7,11 @@ import frappe
 from frappe.model.document import Document
 
 class FormSubmissions(Document):
-	pass
\ No newline at end of file
+	pass
+
+
+def on_doctype_update():
+	# Submissions of one form by date (queries, exports with a form filter)
+	frappe.db.add_index("Form Submissions", ["form_type", "submission_date"])
+	# Keyset pagination for exports and archiving
+	frappe.db.add_index("Form Submissions", ["submission_date", "name"])
@@ -4,25 +4,64 @@
 
 from __future__ import unicode_literals
 import frappe
+from frappe import _
 from frappe.model.document import Document
 
 class PublicForms(Document):
-	def before_save(self):
-		"""Calculate submission count and set view submissions link"""
+	def validate(self):
+		"""Check that filterable fields are data fields of the form's DocType"""
+		if not self.filterable_fields:
+			return
+
+		from frappe_ai_form_builder.api.submission_tracker import (
+			MAX_FILTER_FIELDNAME_LENGTH, SAFE_FIELDNAME_PATTERN, compile_field_extractor
+		)
+
+		doctype_name = frappe.db.get_value("Web Form", self.web_form, "doc_type")
+		if not doctype_name:
+			frappe.throw(_("Web Form {0} has no DocType to index").format(self.web_form))
+
+		data_fields = dict(compile_field_extractor(frappe.get_meta(doctype_name).fields))
+		fieldnames = self.filterable_fields.split()
+		for fieldname in fieldnames:
+			if fieldname not in data_fields or not SAFE_FIELDNAME_PATTERN.match(fieldname):
+				frappe.throw(_("{0} is not a data field of {1}").format(fieldname, doctype_name))
+			if len(fieldname) > MAX_FILTER_FIELDNAME_LENGTH:
+				frappe.throw(_("Field {0} is too long to index (max {1} characters)").format(
+					fieldname, MAX_FILTER_FIELDNAME_LENGTH))
+
+		self.filterable_fields = "\n".join(dict.fromkeys(fieldnames))
+
+	def on_update(self):
+		"""Refresh the public directory and rebuild the generated submission columns when filterable fields change"""
+		from frappe_ai_form_builder.api.public_directory import invalidate_public_forms_directory
+		invalidate_public_forms_directory()
+
+		if self.has_value_changed("filterable_fields"):
+			from frappe_ai_form_builder.api.submission_tracker import enqueue_filter_column_sync
+			enqueue_filter_column_sync()
+
+	def on_trash(self):
+		from frappe_ai_form_builder.api.public_directory import invalidate_public_forms_directory
+		invalidate_public_forms_directory()
+
+		if self.filterable_fields:
+			from frappe_ai_form_builder.api.submission_tracker import enqueue_filter_column_sync
+			enqueue_filter_column_sync()
+
+	def before_insert(self):
+		"""Start the maintained submission count from the daily rollup"""
+		if self.web_form:
+			from frappe_ai_form_builder.api.submission_stats import get_total_submission_count
+			self.submission_count = get_total_submission_count(self.web_form)
+
+	def onload(self):
+		"""Set view submissions link from the maintained count"""
 		if self.web_form:
-			# Get the Web Form document to find the DocType
-			web_form_doc = frappe.get_doc("Web Form", self.web_form)
-			if web_form_doc.doc_type:
-				doctype_name = web_form_doc.doc_type
-				
-				# Count submissions
-				try:
-					submission_count = frappe.db.count(doctype_name)
-					self.submission_count = submission_count
-				except:
-					self.submission_count = 0
-				
+			# Find the DocType behind the Web Form
+			doctype_name = frappe.db.get_value("Web Form", self.web_form, "doc_type")
+			if doctype_name:
 				# Set view submissions link (for admin access)
 				doctype_slug = doctype_name.lower().replace(' ', '-').replace('_', '-')
 				view_url = f"/app/{doctype_slug}"
-				self.view_submissions = f'<a href="{view_url}" target="_blank" class="btn btn-sm btn-primary">View {submission_count} Submissions</a>'
\ No newline at end of file
+				self.view_submissions = f'<a href="{view_url}" target="_blank" class="btn btn-sm btn-primary">View {self.submission_count or 0} Submissions</a>'
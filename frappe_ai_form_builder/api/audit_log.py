@@ -0,0 +1,267 @@
+"""Audit Log - Collects AI Audit Log events per transaction and writes them in one batch"""
+
+import hashlib
+
+import frappe
+from frappe.utils import add_days, cint, getdate, now_datetime
+
+AUDIT_LOG_FIELDS = (
+    "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+    "action", "artifact_id", "artifact_name", "actor", "reason", "timestamp"
+)
+
+AUDIT_ROLLUP_LOCK_KEY = "ai_form_builder:audit_rollup_lock"
+AUDIT_ROLLUP_BATCH_SIZE = 5000
+DEFAULT_RETENTION_DAYS = 365
+
+
+def record_audit_event(action, artifact_id, artifact_name=None, reason=None, actor=None, defer=False):
+    """
+    Queue an AI Audit Log entry for the current transaction.
+
+    Events are deduplicated by (artifact, action): a second event for the same
+    pair only fills in details the first one was missing. Events are discarded
+    if their transaction rolls back, so the trail always matches what was saved.
+    Those committed during a web request are bulk inserted once, when the
+    request ends; background jobs and scripts insert them just before each commit.
+
+    Args:
+        action (str): generate, draft, approved, rejected or rollback
+        artifact_id (str): AI Generated Artifact name
+        artifact_name (str, optional): Artifact display name
+        reason (str, optional): Reason given by the actor
+        actor (str, optional): User performing the action; defaults to the session user
+        defer (bool): Write the entry from a background job after commit instead
+            of inside the transaction, for high-volume paths
+    """
+    pending = _get_pending()
+    _merge_event(pending["deferred" if defer else "inline"], {
+        "action": action,
+        "artifact_id": artifact_id,
+        "artifact_name": artifact_name,
+        "actor": actor or frappe.session.user,
+        "reason": reason,
+        "timestamp": now_datetime()
+    })
+
+
+def _merge_event(events, event):
+    key = (event["artifact_id"], event["action"])
+    existing = events.get(key)
+    if existing is None:
+        events[key] = event
+    else:
+        existing["artifact_name"] = existing["artifact_name"] or event["artifact_name"]
+        existing["reason"] = existing["reason"] or event["reason"]
+
+
+def _get_pending():
+    pending = getattr(frappe.local, "ai_audit_events", None)
+    if pending is None:
+        pending = frappe.local.ai_audit_events = {"inline": {}, "deferred": {}}
+        # A request writes its events once, from the after_request hook; jobs
+        # and scripts have no request end, so they write before each commit
+        in_request = getattr(frappe.local, "request", None) is not None
+        frappe.db.before_commit.add(_stage_committed if in_request else flush_audit_events)
+        frappe.db.after_rollback.add(_discard_pending)
+    return pending
+
+
+def _discard_pending():
+    frappe.local.ai_audit_events = None
+
+
+def _stage_committed():
+    """Keep the events of a committing transaction until the request ends."""
+    pending = getattr(frappe.local, "ai_audit_events", None)
+    frappe.local.ai_audit_events = None
+    if not pending:
+        return
+
+    committed = getattr(frappe.local, "ai_audit_committed", None)
+    if committed is None:
+        committed = frappe.local.ai_audit_committed = {"inline": {}, "deferred": {}}
+    for kind, events in pending.items():
+        for event in events.values():
+            _merge_event(committed[kind], event)
+
+
+def flush_request_audit_events():
+    """Write the events committed during this request in one batch; runs after every request."""
+    committed = getattr(frappe.local, "ai_audit_committed", None)
+    frappe.local.ai_audit_committed = None
+    if not committed:
+        return
+
+    _write_events(committed)
+    frappe.db.commit()
+
+
+def flush_audit_events():
+    """Write the events collected in this transaction; runs once before commit outside requests."""
+    pending = getattr(frappe.local, "ai_audit_events", None)
+    frappe.local.ai_audit_events = None
+    if pending:
+        _write_events(pending)
+
+
+def _write_events(pending):
+    if pending["inline"]:
+        write_audit_rows(list(pending["inline"].values()))
+
+    if pending["deferred"]:
+        frappe.enqueue(
+            "frappe_ai_form_builder.api.audit_log.write_audit_rows",
+            queue="short",
+            rows=list(pending["deferred"].values()),
+            enqueue_after_commit=True
+        )
+
+
+def write_audit_rows(rows):
+    """
+    Bulk insert AI Audit Log rows.
+
+    Args:
+        rows (list): Event dicts as collected by record_audit_event
+    """
+    now = now_datetime()
+    values = []
+    for row in rows:
+        row = dict(row,
+            name=frappe.generate_hash(length=10),
+            creation=now,
+            modified=now,
+            owner=row["actor"],
+            modified_by=row["actor"],
+            docstatus=0,
+            idx=0
+        )
+        values.append(tuple(row.get(field) for field in AUDIT_LOG_FIELDS))
+
+    frappe.db.bulk_insert("AI Audit Log", AUDIT_LOG_FIELDS, values)
+
+
+def roll_up_expired_audit_logs():
+    """
+    Fold AI Audit Log rows past the retention period into daily summaries.
+
+    Runs daily. Each batch is counted into AI Audit Log Daily Summary and
+    deleted in the same transaction, so a row is never counted twice.
+    """
+    cache = frappe.cache()
+    lock_key = cache.make_key(AUDIT_ROLLUP_LOCK_KEY)
+    if not cache.set(lock_key, 1, nx=True, ex=3600):
+        return
+
+    try:
+        retention_days = cint(frappe.db.get_single_value("AI Config", "audit_log_retention_days")) or DEFAULT_RETENTION_DAYS
+        cutoff = add_days(now_datetime(), -retention_days)
+
+        while True:
+            names = frappe.db.sql_list("""
+                SELECT name FROM `tabAI Audit Log`
+                WHERE timestamp < %s
+                ORDER BY timestamp
+                LIMIT %s
+            """, (cutoff, AUDIT_ROLLUP_BATCH_SIZE))
+            if not names:
+                break
+
+            _roll_up(names)
+            frappe.db.sql("DELETE FROM `tabAI Audit Log` WHERE name IN %(names)s", {"names": tuple(names)})
+            frappe.db.commit()
+
+            if len(names) < AUDIT_ROLLUP_BATCH_SIZE:
+                break
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Audit Log Rollup Error")
+    finally:
+        cache.delete(lock_key)
+
+
+def _roll_up(names):
+    groups = frappe.db.sql("""
+        SELECT date(log.timestamp) AS summary_date, log.action, log.actor,
+            coalesce(artifact.artifact_type, '') AS artifact_type, count(*) AS event_count
+        FROM `tabAI Audit Log` log
+        LEFT JOIN `tabAI Generated Artifact` artifact ON artifact.name = log.artifact_id
+        WHERE log.name IN %(names)s
+        GROUP BY date(log.timestamp), log.action, log.actor, coalesce(artifact.artifact_type, '')
+    """, {"names": tuple(names)}, as_dict=True)
+
+    now = now_datetime()
+    user = frappe.session.user
+    for group in groups:
+        key = "\t".join(str(group[k] or "") for k in ("summary_date", "action", "actor", "artifact_type"))
+        frappe.db.multisql({
+            "mariadb": """
+                INSERT INTO `tabAI Audit Log Daily Summary`
+                    (name, creation, modified, owner, modified_by, docstatus, idx,
+                    summary_date, action, actor, artifact_type, event_count)
+                VALUES (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+                    %(summary_date)s, %(action)s, %(actor)s, %(artifact_type)s, %(event_count)s)
+                ON DUPLICATE KEY UPDATE
+                    event_count = event_count + VALUES(event_count),
+                    modified = VALUES(modified)
+            """,
+            "postgres": """
+                INSERT INTO "tabAI Audit Log Daily Summary"
+                    (name, creation, modified, owner, modified_by, docstatus, idx,
+                    summary_date, action, actor, artifact_type, event_count)
+                VALUES (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+                    %(summary_date)s, %(action)s, %(actor)s, %(artifact_type)s, %(event_count)s)
+                ON CONFLICT (name) DO UPDATE SET
+                    event_count = "tabAI Audit Log Daily Summary".event_count + EXCLUDED.event_count,
+                    modified = EXCLUDED.modified
+            """
+        }, dict(group,
+            name=hashlib.sha1(key.encode()).hexdigest()[:20],
+            now=now,
+            user=user
+        ))
+
+
+@frappe.whitelist()
+def get_audit_summary(from_date, to_date, action=None, actor=None):
+    """
+    Count audit events per day, action, actor and artifact type.
+
+    Periods past the retention window are answered from the daily summaries;
+    newer days are aggregated from AI Audit Log itself.
+
+    Args:
+        from_date (str): First day to include
+        to_date (str): Last day to include
+        action (str, optional): Only count this action
+        actor (str, optional): Only count this user's actions
+
+    Returns:
+        list: Rows with summary_date, action, actor, artifact_type and event_count
+    """
+    frappe.has_permission("AI Audit Log", "read", throw=True)
+
+    values = {"from_date": getdate(from_date), "to_date": getdate(to_date), "action": action, "actor": actor}
+    summary_conditions, log_conditions = "", ""
+    for field in ("action", "actor"):
+        if values[field]:
+            summary_conditions += f" AND {field} = %({field})s"
+            log_conditions += f" AND log.{field} = %({field})s"
+
+    return frappe.db.sql(f"""
+        SELECT summary_date, action, actor, artifact_type, sum(event_count) AS event_count
+        FROM (
+            SELECT summary_date, action, actor, artifact_type, event_count
+            FROM `tabAI Audit Log Daily Summary`
+            WHERE summary_date BETWEEN %(from_date)s AND %(to_date)s{summary_conditions}
+            UNION ALL
+            SELECT date(log.timestamp), log.action, log.actor,
+                coalesce(artifact.artifact_type, ''), 1
+            FROM `tabAI Audit Log` log
+            LEFT JOIN `tabAI Generated Artifact` artifact ON artifact.name = log.artifact_id
+            WHERE log.timestamp >= %(from_date)s AND log.timestamp < %(day_after)s{log_conditions}
+        ) events
+        GROUP BY summary_date, action, actor, artifact_type
+        ORDER BY summary_date, action, actor, artifact_type
+    """, dict(values, day_after=add_days(values["to_date"], 1)), as_dict=True)
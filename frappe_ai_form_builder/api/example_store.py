@@ -0,0 +1,171 @@
+"""Example Store - Compact few-shot examples picked per request by lexical similarity"""
+
+import json
+
+import frappe
+from frappe.utils import cint
+
+from frappe_ai_form_builder.api.form_templates import FORM_TEMPLATES
+from frappe_ai_form_builder.api.similarity_index import SimilarityIndex, get_index, spec_text, tokenize
+
+# Used when AI Config does not set prompt_example_count
+DEFAULT_EXAMPLE_COUNT = 2
+
+# Larger specs cost more prompt than they are worth as examples
+MAX_EXAMPLE_FIELDS = 15
+
+# Below this an example shares too little with the request to help
+MIN_EXAMPLE_SCORE = 0.1
+
+# Keys kept in an example spec; the rest are defaults the prompt already describes
+EXAMPLE_SPEC_KEYS = ("doctype_name", "is_web_accessible", "title_field")
+EXAMPLE_FIELD_KEYS = ("fieldname", "label", "fieldtype", "mandatory", "options")
+
+# Curated examples beyond the form templates, for request shapes templates do not cover
+SEED_EXAMPLES = {
+    "inventory_item": {
+        "title": "Inventory Item",
+        "description": "Track stock items with quantity, location and reorder level",
+        "spec": {
+            "doctype_name": "Inventory Item",
+            "is_web_accessible": False,
+            "title_field": "item_name",
+            "fields": [
+                {"fieldname": "item_name", "label": "Item Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "sku", "label": "SKU", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "category", "label": "Category", "fieldtype": "Select", "options": "Raw Material\nFinished Good\nConsumable"},
+                {"fieldname": "quantity", "label": "Quantity", "fieldtype": "Int", "mandatory": True},
+                {"fieldname": "reorder_level", "label": "Reorder Level", "fieldtype": "Int"},
+                {"fieldname": "unit_cost", "label": "Unit Cost", "fieldtype": "Currency"},
+                {"fieldname": "storage_location", "label": "Storage Location", "fieldtype": "Data"}
+            ]
+        }
+    },
+    "incident_report": {
+        "title": "Incident Report",
+        "description": "Report a safety incident or inspection finding with severity and photos",
+        "spec": {
+            "doctype_name": "Incident Report",
+            "is_web_accessible": True,
+            "title_field": "incident_title",
+            "fields": [
+                {"fieldname": "incident_title", "label": "Incident Title", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "incident_date", "label": "Incident Date", "fieldtype": "Datetime", "mandatory": True},
+                {"fieldname": "location", "label": "Location", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "severity", "label": "Severity", "fieldtype": "Select", "options": "Low\nMedium\nHigh\nCritical", "mandatory": True},
+                {"fieldname": "description", "label": "Description", "fieldtype": "Text", "mandatory": True},
+                {"fieldname": "photo", "label": "Photo", "fieldtype": "Attach"},
+                {"fieldname": "reported_by", "label": "Reported By", "fieldtype": "Data"}
+            ]
+        }
+    }
+}
+
+# Seeds ship with the app, so one index serves every site on this worker
+_seed_index = None
+
+
+def get_examples(text, limit=None):
+    """
+    Pick the examples most relevant to a form request.
+
+    Seeds (form templates and SEED_EXAMPLES) and approved DocType artifacts
+    are scored by TF-IDF cosine similarity against the request; the best
+    ones that are small enough are rendered as compact examples.
+
+    Args:
+        text (str): The user's request so far
+        limit (int, optional): Number of examples; AI Config's prompt_example_count by default
+
+    Returns:
+        list: {"id", "text"} dicts, most relevant first
+    """
+    if limit is None:
+        limit = get_example_count()
+    if limit <= 0 or not tokenize(text):
+        return []
+
+    candidates = _get_seed_index().query(text, limit=limit)
+    try:
+        # Extra candidates, as large artifacts are skipped below
+        candidates += get_index().query(text, limit=limit * 3)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Example Store Error")
+
+    candidates = sorted(
+        (c for c in candidates if c[1] >= MIN_EXAMPLE_SCORE), key=lambda c: c[1], reverse=True
+    )
+    specs = _load_specs([example_id for example_id, _score in candidates])
+
+    examples = []
+    for example_id, _score in candidates:
+        title, spec = specs.get(example_id, (None, None))
+        if not spec or len(spec.get("fields") or []) > MAX_EXAMPLE_FIELDS:
+            continue
+        examples.append({"id": example_id, "text": render_example(title, spec)})
+        if len(examples) == limit:
+            break
+
+    return examples
+
+
+def render_example(title, spec):
+    """Compact example: the request it answers and its spec, one field per line."""
+    compact = {key: spec[key] for key in EXAMPLE_SPEC_KEYS if spec.get(key) not in (None, "")}
+    fields = [
+        json.dumps({key: field[key] for key in EXAMPLE_FIELD_KEYS if field.get(key) not in (None, "", False)})
+        for field in spec.get("fields") or []
+    ]
+    head = json.dumps(compact)[1:-1]
+    body = "{" + (f"{head}, " if head else "") + "\"fields\": [\n  " + ",\n  ".join(fields) + "\n]}"
+
+    return f"Example for a request like \"{title}\":\n```json\n{body}\n```"
+
+
+def get_example_count():
+    """Examples per prompt from AI Config."""
+    try:
+        count = frappe.db.get_single_value("AI Config", "prompt_example_count")
+    except Exception:
+        count = None
+    return DEFAULT_EXAMPLE_COUNT if count is None else cint(count)
+
+
+def _load_specs(example_ids):
+    """Titles and specs by example id, with approved artifacts read in one query."""
+    specs = {}
+    artifact_ids = []
+    for example_id in example_ids:
+        if example_id.startswith("seed:"):
+            seed = _get_seeds()[example_id]
+            specs[example_id] = (seed["title"], seed["spec"])
+        else:
+            artifact_ids.append(example_id)
+
+    if artifact_ids:
+        for artifact in frappe.get_all("AI Generated Artifact",
+            filters={"name": ["in", artifact_ids], "status": "approved"},
+            fields=["name", "artifact_name", "content"]
+        ):
+            try:
+                specs[artifact.name] = (artifact.artifact_name, json.loads(artifact.content or "{}"))
+            except ValueError:
+                continue
+
+    return specs
+
+
+def _get_seeds():
+    seeds = {f"seed:{key}": template for key, template in FORM_TEMPLATES.items()}
+    seeds.update({f"seed:{key}": seed for key, seed in SEED_EXAMPLES.items()})
+    return seeds
+
+
+def _get_seed_index():
+    global _seed_index
+    if _seed_index is None:
+        index = SimilarityIndex()
+        for seed_id, seed in _get_seeds().items():
+            index.add(seed_id, f"{seed['description']} {spec_text(seed['title'], seed['spec'])}")
+        _seed_index = index
+    return _seed_index
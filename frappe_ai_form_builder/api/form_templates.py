@@ -0,0 +1,274 @@
+"""Form Templates - Prevalidated specifications for common forms, served without LLM calls"""
+
+import frappe
+from frappe import _
+import copy
+import json
+
+TEMPLATE_USAGE_KEY = "ai_form_builder:template_usage"
+
+# LLM turns a typical conversation needs before a spec is ready
+# (clarify, confirm, generate); each template use saves these calls
+LLM_TURNS_SAVED_PER_USE = 3
+
+RATING_OPTIONS = "1\n2\n3\n4\n5"
+
+# Bump a template's version whenever its fields change
+FORM_TEMPLATES = {
+    "customer_feedback": {
+        "version": 1,
+        "title": "Customer Feedback",
+        "description": "Collect ratings and comments from customers",
+        "spec": {
+            "doctype_name": "Customer Feedback",
+            "module": "Website",
+            "is_web_accessible": True,
+            "naming_rule": "Autoincrement",
+            "title_field": "customer_name",
+            "fields": [
+                {"fieldname": "customer_name", "label": "Customer Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "customer_email", "label": "Customer Email", "fieldtype": "Email", "mandatory": True},
+                {"fieldtype": "Section Break", "label": "Ratings"},
+                {"fieldname": "overall_experience", "label": "Overall Experience", "fieldtype": "Select", "options": RATING_OPTIONS, "mandatory": True},
+                {"fieldname": "product_quality", "label": "Product Quality", "fieldtype": "Select", "options": RATING_OPTIONS},
+                {"fieldname": "support_quality", "label": "Support", "fieldtype": "Select", "options": RATING_OPTIONS},
+                {"fieldname": "would_recommend", "label": "Would you recommend us?", "fieldtype": "Check"},
+                {"fieldtype": "Section Break", "label": "Comments"},
+                {"fieldname": "comments", "label": "Comments", "fieldtype": "Text"}
+            ]
+        }
+    },
+    "event_registration": {
+        "version": 1,
+        "title": "Event Registration",
+        "description": "Register attendees for an event",
+        "spec": {
+            "doctype_name": "Event Registration",
+            "module": "Website",
+            "is_web_accessible": True,
+            "naming_rule": "Autoincrement",
+            "title_field": "full_name",
+            "fields": [
+                {"fieldname": "full_name", "label": "Full Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "email", "label": "Email", "fieldtype": "Email", "mandatory": True},
+                {"fieldname": "phone", "label": "Phone", "fieldtype": "Data"},
+                {"fieldname": "organization", "label": "Organization", "fieldtype": "Data"},
+                {"fieldtype": "Section Break", "label": "Attendance"},
+                {"fieldname": "ticket_type", "label": "Ticket Type", "fieldtype": "Select", "options": "General\nVIP\nStudent", "mandatory": True},
+                {"fieldname": "number_of_guests", "label": "Number of Guests", "fieldtype": "Int", "default": "0"},
+                {"fieldname": "dietary_requirements", "label": "Dietary Requirements", "fieldtype": "Text"},
+                {"fieldname": "agree_to_terms", "label": "I agree to the terms and conditions", "fieldtype": "Check", "mandatory": True}
+            ]
+        }
+    },
+    "employee_onboarding": {
+        "version": 1,
+        "title": "Employee Onboarding",
+        "description": "Personal information, job details, emergency contact and documents",
+        "spec": {
+            "doctype_name": "Employee Onboarding",
+            "module": "Website",
+            "is_web_accessible": True,
+            "naming_rule": "Autoincrement",
+            "title_field": "full_name",
+            "fields": [
+                {"fieldtype": "Section Break", "label": "Personal Information"},
+                {"fieldname": "full_name", "label": "Full Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "personal_email", "label": "Personal Email", "fieldtype": "Email", "mandatory": True},
+                {"fieldname": "phone", "label": "Phone", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "date_of_birth", "label": "Date of Birth", "fieldtype": "Date"},
+                {"fieldname": "address", "label": "Address", "fieldtype": "Text"},
+                {"fieldtype": "Section Break", "label": "Job Details"},
+                {"fieldname": "job_title", "label": "Job Title", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "department", "label": "Department", "fieldtype": "Data"},
+                {"fieldname": "start_date", "label": "Start Date", "fieldtype": "Date", "mandatory": True},
+                {"fieldname": "employment_type", "label": "Employment Type", "fieldtype": "Select", "options": "Full-time\nPart-time\nContract\nIntern"},
+                {"fieldtype": "Section Break", "label": "Emergency Contact"},
+                {"fieldname": "emergency_contact_name", "label": "Emergency Contact Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "emergency_contact_phone", "label": "Emergency Contact Phone", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "emergency_contact_relation", "label": "Relationship", "fieldtype": "Data"},
+                {"fieldtype": "Section Break", "label": "Documents"},
+                {"fieldname": "id_document", "label": "ID Document", "fieldtype": "Attach"},
+                {"fieldname": "resume", "label": "Resume", "fieldtype": "Attach"}
+            ]
+        }
+    },
+    "leave_request": {
+        "version": 1,
+        "title": "Leave Request",
+        "description": "Request time off with leave type and dates",
+        "spec": {
+            "doctype_name": "Leave Request",
+            "module": "Website",
+            "is_web_accessible": False,
+            "naming_rule": "Autoincrement",
+            "title_field": "employee_name",
+            "fields": [
+                {"fieldname": "employee_name", "label": "Employee Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "employee_email", "label": "Employee Email", "fieldtype": "Email", "mandatory": True},
+                {"fieldname": "leave_type", "label": "Leave Type", "fieldtype": "Select", "options": "Annual\nSick\nPersonal\nUnpaid", "mandatory": True},
+                {"fieldname": "from_date", "label": "From Date", "fieldtype": "Date", "mandatory": True},
+                {"fieldname": "to_date", "label": "To Date", "fieldtype": "Date", "mandatory": True},
+                {"fieldname": "half_day", "label": "Half Day", "fieldtype": "Check"},
+                {"fieldname": "reason", "label": "Reason", "fieldtype": "Text"}
+            ]
+        }
+    },
+    "support_ticket": {
+        "version": 1,
+        "title": "Support Ticket",
+        "description": "Let customers report issues",
+        "spec": {
+            "doctype_name": "Support Ticket",
+            "module": "Website",
+            "is_web_accessible": True,
+            "naming_rule": "Autoincrement",
+            "title_field": "subject",
+            "fields": [
+                {"fieldname": "customer_name", "label": "Name", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "customer_email", "label": "Email", "fieldtype": "Email", "mandatory": True},
+                {"fieldname": "subject", "label": "Subject", "fieldtype": "Data", "mandatory": True},
+                {"fieldname": "priority", "label": "Priority", "fieldtype": "Select", "options": "Low\nMedium\nHigh\nUrgent", "default": "Medium"},
+                {"fieldname": "description", "label": "Description", "fieldtype": "Text", "mandatory": True},
+                {"fieldname": "attachment", "label": "Attachment", "fieldtype": "Attach"}
+            ]
+        }
+    }
+}
+
+
+@frappe.whitelist(allow_guest=True)
+def get_templates():
+    """
+    List the available form templates.
+
+    Returns:
+        list: Template key, title, description, version and field labels
+    """
+    return [
+        {
+            "template": key,
+            "title": template["title"],
+            "description": template["description"],
+            "version": template["version"],
+            "fields": [f.get("label") for f in template["spec"]["fields"] if f.get("fieldname")]
+        }
+        for key, template in FORM_TEMPLATES.items()
+    ]
+
+
+def render_template(template, parameters=None):
+    """
+    Render a template specification with user parameters.
+
+    Args:
+        template (str): Template key
+        parameters (dict|str, optional): Supported keys are doctype_name, module,
+            is_web_accessible, exclude_fields (list of fieldnames),
+            mandatory_fields (list of fieldnames) and select_options
+            ({fieldname: [choices]})
+
+    Returns:
+        dict: A validated DocType specification
+    """
+    if template not in FORM_TEMPLATES:
+        frappe.throw(_("Unknown form template: {0}").format(template))
+
+    if isinstance(parameters, str):
+        parameters = json.loads(parameters or "{}")
+    parameters = parameters or {}
+
+    spec = copy.deepcopy(FORM_TEMPLATES[template]["spec"])
+
+    for key in ("doctype_name", "module", "is_web_accessible"):
+        if parameters.get(key) not in (None, ""):
+            spec[key] = parameters[key]
+
+    exclude_fields = set(_as_list(parameters.get("exclude_fields")))
+    mandatory_fields = set(_as_list(parameters.get("mandatory_fields")))
+    select_options = parameters.get("select_options") or {}
+
+    fields = []
+    for field in spec["fields"]:
+        fieldname = field.get("fieldname")
+        if fieldname in exclude_fields:
+            continue
+        if fieldname in mandatory_fields:
+            field["mandatory"] = True
+        if fieldname in select_options and field.get("fieldtype") == "Select":
+            field["options"] = "\n".join(_as_list(select_options[fieldname]))
+        fields.append(field)
+    spec["fields"] = fields
+
+    if spec.get("title_field") in exclude_fields:
+        spec.pop("title_field")
+
+    from frappe_ai_form_builder.api.llm_adapter import validate_doctype_spec
+    validation_errors = validate_doctype_spec(spec)
+    if validation_errors:
+        frappe.throw(_("Template specification validation failed:\n{0}").format("\n".join(validation_errors)))
+
+    return spec
+
+
+def apply_template_to_conversation(conversation, template, parameters=None):
+    """
+    Store a rendered template as the conversation's draft specification.
+
+    Args:
+        conversation (Document): AI Conversation to update (not saved here)
+        template (str): Template key
+        parameters (dict|str, optional): See render_template
+
+    Returns:
+        dict: The rendered specification
+    """
+    spec = render_template(template, parameters)
+
+    conversation.template = template
+    conversation.template_version = FORM_TEMPLATES[template]["version"]
+    conversation.draft_specification = json.dumps(spec)
+
+    record_template_use(template)
+
+    return spec
+
+
+def record_template_use(template):
+    """Count a template use in Redis."""
+    try:
+        cache = frappe.cache()
+        cache.incrby(cache.make_key(f"{TEMPLATE_USAGE_KEY}:{template}"), 1)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Template Usage Counter Error")
+
+
+@frappe.whitelist()
+def get_template_usage():
+    """
+    Report template usage and the LLM calls it avoided.
+
+    Returns:
+        dict: Uses per template, total uses and estimated LLM calls saved
+    """
+    cache = frappe.cache()
+    templates = list(FORM_TEMPLATES)
+    counts = cache.mget([cache.make_key(f"{TEMPLATE_USAGE_KEY}:{template}") for template in templates])
+
+    usage = {template: int(count or 0) for template, count in zip(templates, counts)}
+    total_uses = sum(usage.values())
+
+    return {
+        "usage": usage,
+        "total_uses": total_uses,
+        "llm_calls_saved": total_uses * LLM_TURNS_SAVED_PER_USE
+    }
+
+
+def _as_list(value):
+    """Accept a list or a comma/newline separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.replace("\n", ",").split(",")
+    return [str(v).strip() for v in value if str(v).strip()]
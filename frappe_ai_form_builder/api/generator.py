@@ -4,6 +4,24 @@ import frappe
 from frappe import _
 import json
 
+# Fieldtype mapping: Convert AI-suggested types to valid Frappe types
+FIELDTYPE_MAPPING = {
+    "Email": "Data",  # Email is not a valid Frappe fieldtype, use Data instead
+    "Text Area": "Small Text",
+    "Textarea": "Small Text",
+}
+
+# DocField properties compared when updating an existing DocType in place
+SYNCED_FIELD_PROPERTIES = (
+    "label", "fieldtype", "options", "default", "description", "reqd",
+    "in_list_view", "in_standard_filter"
+)
+
+LAYOUT_FIELDTYPES = ("Column Break", "Section Break", "Tab Break")
+
+# Rolled back to when the Web Form for an approved artifact can't be created
+WEB_FORM_SAVEPOINT = "ai_form_builder_web_form"
+
 
 @frappe.whitelist(allow_guest=True)
 def generate_doctype(session_id, publish=False):
@@ -17,6 +35,7 @@ def generate_doctype(session_id, publish=False):
     Returns:
         dict: Generated artifact details
     """
+    created_doctype = None
     try:
         # Get conversation and draft specification
         conversation = frappe.get_doc("AI Conversation", session_id)
@@ -52,12 +71,12 @@ def generate_doctype(session_id, publish=False):
             artifact.frappe_doctype = created_doctype.name
             artifact.save()
         
-        frappe.db.commit()
-        
         # Log audit trail
         doctype_name = spec.get("doctype_name") or spec.get("name")
         log_audit_action("generate", artifact.name, doctype_name)
         
+        frappe.db.commit()
+        
         return {
             "artifact_id": artifact.name,
             "doctype_name": spec.get("doctype_name") or spec.get("name"),
@@ -67,22 +86,30 @@ def generate_doctype(session_id, publish=False):
         }
         
     except Exception as e:
+        frappe.db.rollback()
+        if created_doctype:
+            drop_created_doctype(created_doctype.name)
         frappe.log_error(frappe.get_traceback(), "AI Form Builder - Generate DocType Error")
         frappe.throw(_("Failed to generate DocType: {0}").format(str(e)))
 
 
 @frappe.whitelist(allow_guest=True)
-def approve_artifact(artifact_id=None, doc=None):
+def approve_artifact(artifact_id=None, doc=None, update_existing=None):
     """
     Approve and publish an AI-generated artifact.
     
     Args:
         artifact_id (str): The artifact ID to approve
         doc (str): JSON string of the document (fallback for incorrect API calls)
+        update_existing (bool, optional): Update the DocType this artifact revises
+            instead of creating a new one. Defaults to updating when an earlier
+            artifact from the same conversation with the same name was approved.
     
     Returns:
         dict: Approval confirmation
     """
+    created_doctype = None
+    existing_doctype = None
     try:
         # Handle case where doc is passed instead of artifact_id
         if doc and not artifact_id:
@@ -103,12 +130,18 @@ def approve_artifact(artifact_id=None, doc=None):
         
         spec = json.loads(artifact.content)
         
-        # Create the DocType
-        created_doctype = create_doctype_from_spec(spec, artifact_id)
+        # Create the DocType, or update the one this artifact revises
+        existing_doctype = get_revision_target(artifact, update_existing)
+        created_doctype = create_doctype_from_spec(spec, artifact_id, existing_doctype=existing_doctype)
         
         # Automatically create Web Form for public access
+        web_form_route = None
         try:
-            web_form_route = create_web_form_for_approved_artifact(created_doctype.name, spec, artifact_id)
+            if existing_doctype:
+                web_form_route = sync_web_form_fields(created_doctype, spec)
+            else:
+                web_form_route = create_web_form_for_approved_artifact(
+                    created_doctype.name, spec, artifact_id, doctype_doc=created_doctype)
         except Exception as web_form_error:
             frappe.log_error(frappe.get_traceback(), "AI Form Builder - Web Form Creation Error")
             # Continue with approval even if Web Form creation fails
@@ -118,25 +151,30 @@ def approve_artifact(artifact_id=None, doc=None):
         artifact.frappe_doctype = created_doctype.name
         artifact.approved_by = frappe.session.user
         artifact.save()
-        frappe.db.commit()
         
         # Log audit trail
         doctype_name = spec.get("doctype_name") or spec.get("name")
         log_audit_action("approved", artifact_id, doctype_name)
         
+        frappe.db.commit()
+        
         # Return success message with Web Form info if created
         response = {
-            "message": _("Artifact approved and DocType created successfully"),
+            "message": _("Artifact approved and DocType updated successfully") if existing_doctype
+                else _("Artifact approved and DocType created successfully"),
             "doctype_name": created_doctype.name
         }
         
-        if 'web_form_route' in locals():
+        if web_form_route:
             response["web_form_url"] = f"/{web_form_route}"
-            response["message"] += _(" Web Form created for public access.")
+            response["message"] += _(" Web Form fields synced.") if existing_doctype else _(" Web Form created for public access.")
         
         return response
         
     except Exception as e:
+        frappe.db.rollback()
+        if created_doctype and not existing_doctype:
+            drop_created_doctype(created_doctype.name)
         frappe.log_error(frappe.get_traceback(), "AI Form Builder - Approve Artifact Error")
         frappe.throw(_("Failed to approve artifact: {0}").format(str(e)))
 
@@ -171,11 +209,12 @@ def reject_artifact(artifact_id=None, reason=None, doc=None):
         artifact.status = "rejected"
         artifact.rejection_reason = reason
         artifact.save()
-        frappe.db.commit()
         
         # Log audit trail
         log_audit_action("rejected", artifact_id, artifact.artifact_name, reason)
         
+        frappe.db.commit()
+        
         return {
             "message": _("Artifact rejected"),
             "artifact_id": artifact_id
@@ -186,17 +225,24 @@ def reject_artifact(artifact_id=None, reason=None, doc=None):
         frappe.throw(_("Failed to reject artifact: {0}").format(str(e)))
 
 
-def create_doctype_from_spec(spec, artifact_id):
+def create_doctype_from_spec(spec, artifact_id, existing_doctype=None):
     """
     Create a Frappe DocType from specification.
     
     Args:
         spec (dict): DocType specification
         artifact_id (str): Reference to AI Generated Artifact
+        existing_doctype (str, optional): Live DocType this spec revises. When
+            given, the DocType is updated in place instead of creating a copy.
     
     Returns:
-        Document: Created DocType document
+        Document: Created DocType document. The caller commits; if it fails
+            afterwards it removes the DocType with drop_created_doctype, since
+            creating the table commits implicitly on MariaDB.
     """
+    if existing_doctype:
+        return update_doctype_from_spec(existing_doctype, spec, artifact_id)
+    
     try:
         # Build DocType dictionary
         doctype_name = spec.get("doctype_name") or spec.get("name")
@@ -274,32 +320,8 @@ def create_doctype_from_spec(spec, artifact_id):
             "description": spec.get("description", f"Generated by AI Form Builder (Artifact: {artifact_id})")
         }
         
-        # Fieldtype mapping: Convert AI-suggested types to valid Frappe types
-        fieldtype_mapping = {
-            "Email": "Data",  # Email is not a valid Frappe fieldtype, use Data instead
-            "Text Area": "Small Text",
-            "Textarea": "Small Text",
-        }
-        
         # Add fields
-        for idx, field_spec in enumerate(spec.get("fields", [])):
-            original_fieldtype = field_spec.get("fieldtype")
-            # Map fieldtype if needed
-            mapped_fieldtype = fieldtype_mapping.get(original_fieldtype, original_fieldtype)
-            
-            field = {
-                "fieldname": field_spec.get("fieldname"),
-                "label": field_spec.get("label"),
-                "fieldtype": mapped_fieldtype,
-                "mandatory": field_spec.get("mandatory", 0),
-                "in_list_view": field_spec.get("in_list_view", 0),
-                "in_standard_filter": field_spec.get("in_standard_filter", 0),
-                "options": field_spec.get("options"),
-                "default": field_spec.get("default"),
-                "description": field_spec.get("description"),
-                "idx": idx + 1
-            }
-            doctype_dict["fields"].append(field)
+        doctype_dict["fields"].extend(build_doctype_fields(spec))
         
         # Add route field for web views (required for has_web_view=1)
         if add_route_field:
@@ -320,7 +342,6 @@ def create_doctype_from_spec(spec, artifact_id):
         # Create the DocType
         doctype_doc = frappe.get_doc(doctype_dict)
         doctype_doc.insert(ignore_permissions=True)
-        frappe.db.commit()
         
         return doctype_doc
         
@@ -329,19 +350,252 @@ def create_doctype_from_spec(spec, artifact_id):
         raise e
 
 
-def log_audit_action(action, artifact_id, artifact_name, reason=None):
-    """Log an action in the audit trail."""
+def drop_created_doctype(doctype_name):
+    """
+    Remove a DocType created for a generation or approval that then failed.
+    
+    Creating the DocType's table commits implicitly on MariaDB, so rolling
+    back the request would otherwise leave the DocType behind.
+    """
     try:
-        audit_log = frappe.get_doc({
-            "doctype": "AI Audit Log",
-            "action": action,
-            "artifact_id": artifact_id,
-            "artifact_name": artifact_name,
-            "actor": frappe.session.user,
-            "reason": reason
-        })
-        audit_log.insert()
+        frappe.delete_doc("DocType", doctype_name, force=True, ignore_permissions=True)
         frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Drop DocType Error")
+
+
+def build_doctype_fields(spec):
+    """
+    Build DocField dictionaries from the fields of a specification.
+    
+    Args:
+        spec (dict): DocType specification
+    
+    Returns:
+        list: DocField dictionaries in spec order
+    """
+    fields = []
+    for idx, field_spec in enumerate(spec.get("fields", [])):
+        original_fieldtype = field_spec.get("fieldtype")
+        # Map fieldtype if needed
+        mapped_fieldtype = FIELDTYPE_MAPPING.get(original_fieldtype, original_fieldtype)
+        
+        fields.append({
+            "fieldname": field_spec.get("fieldname"),
+            "label": field_spec.get("label"),
+            "fieldtype": mapped_fieldtype,
+            "reqd": frappe.utils.cint(field_spec.get("mandatory", field_spec.get("reqd", 0))),
+            "in_list_view": field_spec.get("in_list_view", 0),
+            "in_standard_filter": field_spec.get("in_standard_filter", 0),
+            "options": field_spec.get("options"),
+            "default": field_spec.get("default"),
+            "description": field_spec.get("description"),
+            "idx": idx + 1
+        })
+    return fields
+
+
+def diff_doctype_fields(doctype_doc, spec):
+    """
+    Diff a specification against the live fields of a DocType.
+    
+    Layout fields without a fieldname are matched by position among fields of
+    the same type. Fields missing from the spec are reported but never dropped,
+    so existing submission data is kept.
+    
+    Args:
+        doctype_doc (Document): Live DocType document
+        spec (dict): Revised DocType specification
+    
+    Returns:
+        dict: {"added": [...], "changed": [(docfield, {prop: value})], "removed": [...]}
+    """
+    live_fields = {}
+    layout_counters = {}
+    for docfield in doctype_doc.fields:
+        live_fields[_field_key(docfield.fieldname, docfield.fieldtype, layout_counters)] = docfield
+    
+    added, changed, seen = [], [], set()
+    layout_counters = {}
+    for field in build_doctype_fields(spec):
+        key = _field_key(field.get("fieldname"), field.get("fieldtype"), layout_counters)
+        seen.add(key)
+        docfield = live_fields.get(key)
+        
+        if not docfield:
+            added.append(field)
+            continue
+        
+        updates = {}
+        for prop in SYNCED_FIELD_PROPERTIES:
+            new_value = field.get(prop)
+            if (new_value or None) != (docfield.get(prop) or None):
+                updates[prop] = new_value
+        if updates:
+            changed.append((docfield, updates))
+    
+    removed = [docfield for key, docfield in live_fields.items()
+        if key not in seen and docfield.fieldname != "route"]
+    
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def _field_key(fieldname, fieldtype, layout_counters):
+    """Key a field by fieldname, or by type and position for unnamed layout fields."""
+    if fieldname:
+        return fieldname
+    layout_counters[fieldtype] = layout_counters.get(fieldtype, 0) + 1
+    return f"{fieldtype}:{layout_counters[fieldtype]}"
+
+
+def update_doctype_from_spec(doctype_name, spec, artifact_id):
+    """
+    Apply a revised specification to an existing DocType in place.
+    
+    Only added and changed fields are written, as a single DocType save, so the
+    table keeps its name, its Web Form and its submission data. The caller
+    commits, together with the artifact's approval.
+    
+    Args:
+        doctype_name (str): Name of the live DocType to update
+        spec (dict): Revised DocType specification
+        artifact_id (str): Reference to AI Generated Artifact
+    
+    Returns:
+        Document: Updated DocType document
+    """
+    try:
+        doctype_doc = frappe.get_doc("DocType", doctype_name)
+        diff = diff_doctype_fields(doctype_doc, spec)
+        
+        if not diff["added"] and not diff["changed"]:
+            return doctype_doc
+        
+        for docfield, updates in diff["changed"]:
+            docfield.update(updates)
+        
+        for field in diff["added"]:
+            field.pop("idx", None)
+            doctype_doc.append("fields", field)
+        
+        # Keep the field order of the revised spec; fields dropped from the
+        # spec stay at the end so their columns and data are preserved
+        spec_order = {}
+        layout_counters = {}
+        for idx, field in enumerate(build_doctype_fields(spec)):
+            spec_order[_field_key(field.get("fieldname"), field.get("fieldtype"), layout_counters)] = idx
+        
+        layout_counters = {}
+        positions = [
+            spec_order.get(_field_key(df.fieldname, df.fieldtype, layout_counters), len(spec_order))
+            for df in doctype_doc.fields
+        ]
+        doctype_doc.fields = [df for _pos, df in sorted(
+            zip(positions, doctype_doc.fields), key=lambda item: item[0])]
+        for idx, docfield in enumerate(doctype_doc.fields):
+            docfield.idx = idx + 1
+        
+        if spec.get("description"):
+            doctype_doc.description = spec.get("description")
+        
+        doctype_doc.save(ignore_permissions=True)
+        
+        frappe.logger().info(
+            f"AI Form Builder - Updated DocType {doctype_name} from artifact {artifact_id}: "
+            f"{len(diff['added'])} added, {len(diff['changed'])} changed"
+        )
+        
+        return doctype_doc
+        
+    except Exception as e:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Update DocType Error")
+        raise e
+
+
+def sync_web_form_fields(doctype_doc, spec):
+    """
+    Sync the fields of an existing Web Form with a revised DocType in place.
+    
+    Args:
+        doctype_doc (Document): Updated DocType document
+        spec (dict): Revised DocType specification
+    
+    Returns:
+        str: The Web Form route, or None if the DocType has no Web Form. The
+            caller commits.
+    """
+    web_form_name = frappe.db.get_value("Web Form", {"doc_type": doctype_doc.name}, "name")
+    if not web_form_name:
+        return None
+    
+    web_form = frappe.get_doc("Web Form", web_form_name)
+    existing_rows = {row.fieldname: row for row in web_form.web_form_fields if row.fieldname}
+    spec_fieldnames = {f.get("fieldname") for f in spec.get("fields", []) if f.get("fieldname")}
+    
+    rows = []
+    for values in build_web_form_fields(doctype_doc, spec_fieldnames):
+        row = existing_rows.get(values["fieldname"])
+        if row:
+            row.update(values)
+        else:
+            row = web_form.append("web_form_fields", values)
+        rows.append(row)
+    web_form.web_form_fields = rows
+    
+    web_form.save(ignore_permissions=True)
+    
+    return web_form.route
+
+
+def get_revision_target(artifact, update_existing=None):
+    """
+    Find the live DocType an artifact revises.
+    
+    By default an artifact only revises the DocType approved earlier in the
+    same conversation for the same doctype_name; a conversation that moves on
+    to a differently named form gets a new DocType. Passing update_existing
+    revises the conversation's latest approved DocType whatever its name, or
+    a custom DocType with the artifact's name.
+    
+    Args:
+        artifact (Document): AI Generated Artifact being approved
+        update_existing (bool, optional): True to revise explicitly, False to force a new DocType
+    
+    Returns:
+        str: DocType name, or None when a new DocType should be created
+    """
+    if update_existing is not None and not frappe.utils.cint(update_existing):
+        return None
+    
+    explicit = bool(frappe.utils.cint(update_existing))
+    
+    target = None
+    if artifact.session_id:
+        filters = {
+            "session_id": artifact.session_id,
+            "status": "approved",
+            "name": ["!=", artifact.name],
+            "frappe_doctype": ["is", "set"]
+        }
+        if not explicit:
+            filters["artifact_name"] = artifact.artifact_name
+        target = frappe.db.get_value("AI Generated Artifact", filters, "frappe_doctype", order_by="modified desc")
+    
+    if not target and explicit:
+        target = artifact.artifact_name
+    
+    if target and frappe.db.exists("DocType", {"name": target, "custom": 1}):
+        return target
+    
+    return None
+
+
+def log_audit_action(action, artifact_id, artifact_name, reason=None):
+    """Log an action in the audit trail; written with the transaction's next commit."""
+    try:
+        from frappe_ai_form_builder.api.audit_log import record_audit_event
+        record_audit_event(action, artifact_id, artifact_name, reason)
     except Exception as e:
         frappe.log_error(frappe.get_traceback(), "AI Form Builder - Audit Log Error")
 
@@ -385,33 +639,37 @@ def check_web_form(doctype_name="Employee Onboarding"):
 
 
 @frappe.whitelist()
-def create_web_form_for_approved_artifact(doctype_name, spec, artifact_id):
+def create_web_form_for_approved_artifact(doctype_name, spec, artifact_id, doctype_doc=None):
     """
     Create a Web Form for an approved artifact with automatic setup.
     
+    The Web Form fields come from the DocType document built from the spec,
+    and the Web Form, Public Forms record and DocType guest setup are written
+    together under a savepoint. On failure only they are rolled back, so the
+    caller can still approve the DocType; the caller commits.
+    
     Args:
         doctype_name (str): Name of the created DocType
         spec (dict): The DocType specification
         artifact_id (str): The artifact ID
+        doctype_doc (Document, optional): The DocType just created from the
+            spec. When omitted the DocType is loaded and an existing Web Form
+            is reused.
     
     Returns:
         str: The Web Form route
     """
+    frappe.db.savepoint(WEB_FORM_SAVEPOINT)
     try:
-        # Check if Web Form already exists
-        if frappe.db.exists("Web Form", {"doc_type": doctype_name}):
-            web_form = frappe.get_doc("Web Form", {"doc_type": doctype_name})
-            return web_form.route
-        
-        # Generate a unique route based on doctype name
-        base_route = doctype_name.lower().replace(' ', '-').replace('_', '-')
-        route = base_route
-        counter = 1
+        if doctype_doc is None:
+            # Check if Web Form already exists
+            existing_route = frappe.db.get_value("Web Form", {"doc_type": doctype_name}, "route")
+            if existing_route:
+                return existing_route
+            
+            doctype_doc = frappe.get_doc("DocType", doctype_name)
         
-        # Ensure route is unique
-        while frappe.db.exists("Web Form", {"route": route}):
-            route = f"{base_route}-{counter}"
-            counter += 1
+        route = get_unique_web_form_route(doctype_name)
         
         # Create Web Form
         web_form = frappe.get_doc({
@@ -425,27 +683,9 @@ def create_web_form_for_approved_artifact(doctype_name, spec, artifact_id):
             "allow_multiple": 1,
             "show_sidebar": 0,
             "published": 1,  # Auto-publish
-            "web_form_fields": []
+            "web_form_fields": build_web_form_fields(doctype_doc)
         })
-        
-        # Get DocType to add fields
-        doctype = frappe.get_doc("DocType", doctype_name)
-        
-        # Add fields to Web Form (exclude system fields)
-        for field in doctype.fields:
-            if field.fieldtype not in ['Column Break', 'Section Break', 'Tab Break'] and not field.hidden:
-                web_form.append("web_form_fields", {
-                    "fieldname": field.fieldname,
-                    "label": field.label,
-                    "fieldtype": field.fieldtype,
-                    "reqd": field.reqd,
-                    "options": field.options,
-                    "description": field.description,
-                    "idx": field.idx
-                })
-        
         web_form.insert(ignore_permissions=True)
-        frappe.db.commit()
         
         # Create Public Forms record for listing
         public_form = frappe.get_doc({
@@ -456,17 +696,13 @@ def create_web_form_for_approved_artifact(doctype_name, spec, artifact_id):
             "visit_link": f"/{route}"
         })
         public_form.insert(ignore_permissions=True)
-        frappe.db.commit()
         
-        # Set up DocType for Web Form compatibility
-        # Remove route conflict and disable web view
-        doctype.route = None
-        doctype.has_web_view = 0
-        doctype.allow_guest_to_view = 0
-        doctype.save()
-        
-        # Add guest permissions
-        doctype.append("permissions", {
+        # Set up DocType for Web Form compatibility:
+        # remove route conflict, disable web view and add guest permissions
+        doctype_doc.route = None
+        doctype_doc.has_web_view = 0
+        doctype_doc.allow_guest_to_view = 0
+        doctype_doc.append("permissions", {
             "role": "Guest",
             "read": 1,
             "write": 1,
@@ -475,12 +711,12 @@ def create_web_form_for_approved_artifact(doctype_name, spec, artifact_id):
             "cancel": 0,
             "amend": 0
         })
-        doctype.save()
-        frappe.db.commit()
+        doctype_doc.save(ignore_permissions=True)
         
         return route
         
     except Exception as e:
+        frappe.db.rollback(save_point=WEB_FORM_SAVEPOINT)
         frappe.log_error(frappe.get_traceback(), "AI Form Builder - Auto Web Form Creation Error")
         raise e
     """Check Web Form configuration details"""
@@ -502,6 +738,53 @@ def create_web_form_for_approved_artifact(doctype_name, spec, artifact_id):
         return {"error": str(e)}
 
 
+def build_web_form_fields(doctype_doc, fieldnames=None):
+    """
+    Build Web Form field rows from an in-memory DocType document.
+    
+    Args:
+        doctype_doc (Document): DocType built from the specification
+        fieldnames (set, optional): Restrict rows to these fieldnames
+    
+    Returns:
+        list: Web Form field dictionaries (layout and hidden fields excluded)
+    """
+    rows = []
+    for field in doctype_doc.fields:
+        if field.fieldtype in LAYOUT_FIELDTYPES or field.hidden:
+            continue
+        if fieldnames is not None and field.fieldname not in fieldnames:
+            continue
+        
+        rows.append({
+            "fieldname": field.fieldname,
+            "label": field.label,
+            "fieldtype": field.fieldtype,
+            "reqd": field.reqd,
+            "options": field.options,
+            "description": field.description,
+            "idx": len(rows) + 1
+        })
+    return rows
+
+
+def get_unique_web_form_route(doctype_name):
+    """Pick the first free Web Form route for a DocType with a single query."""
+    base_route = doctype_name.lower().replace(' ', '-').replace('_', '-')
+    taken_routes = set(frappe.get_all("Web Form",
+        filters={"route": ["like", f"{base_route}%"]},
+        pluck="route"
+    ))
+    
+    route = base_route
+    counter = 1
+    while route in taken_routes:
+        route = f"{base_route}-{counter}"
+        counter += 1
+    
+    return route
+
+
 @frappe.whitelist()
 def publish_web_form(web_form_name="employee-onboarding"):
     """Publish the Web Form"""
@@ -4,71 +4,96 @@ import frappe
 from frappe import _
 import json
 import os
+import time
 
+# Output token limit for OpenAI and Anthropic when AI Config does not set one
+DEFAULT_MAX_TOKENS = 2000
 
-def get_llm_response(conversation_history, user_message):
+
+def get_llm_response(conversation_history, user_message, has_draft=False):
     """
     Get response from LLM provider (OpenAI, Anthropic, or Gemini).
     
+    The turn is routed by conversation phase: the model tier, prompt and
+    few-shot examples all follow from it, and the decision is logged with
+    the model's latency. Specs for large forms are generated by section.
+    
     Args:
         conversation_history (list): Previous conversation messages
         user_message (str): Latest user message
+        has_draft (bool): Whether the conversation already has a draft spec
     
     Returns:
-        dict: LLM response with message, draft_spec, suggestions
+        dict: LLM response with message, draft_spec, suggestions, prompt_version and route
     """
-    provider = frappe.db.get_single_value("AI Config", "llm_provider") or "gemini"
+    from frappe_ai_form_builder.api.model_router import log_route, route_turn
+    from frappe_ai_form_builder.api.prompt_registry import compile_prompt
+
+    route = route_turn(conversation_history, user_message, has_draft)
     
-    if provider == "openai":
-        return get_openai_response(conversation_history, user_message)
-    elif provider == "anthropic":
-        return get_anthropic_response(conversation_history, user_message)
-    elif provider == "gemini":
-        return get_gemini_response(conversation_history, user_message)
+    if route.provider == "openai":
+        get_response = get_openai_response
+    elif route.provider == "anthropic":
+        get_response = get_anthropic_response
+    elif route.provider == "gemini":
+        get_response = get_gemini_response
     else:
-        frappe.throw(_("Unsupported LLM provider: {0}").format(provider))
+        frappe.throw(_("Unsupported LLM provider: {0}").format(route.provider))
+    
+    examples = None
+    if route.prompt_phase == "generating":
+        from frappe_ai_form_builder.api.example_store import get_examples
+        examples = get_examples(get_request_text(conversation_history, user_message))
+    
+    prompt = compile_prompt(route.provider, route.prompt_phase, examples=examples)
+    
+    from frappe_ai_form_builder.api.sectioned_generation import (
+        generate_in_sections, get_section_config, should_generate_in_sections
+    )
+    
+    max_tokens = route.max_tokens or DEFAULT_MAX_TOKENS
+    # Only turns expected to output the spec; a confirming turn stays a summary
+    section_config = get_section_config() if route.phase in ("generating", "editing") else None
+    
+    start = time.monotonic()
+    error = None
+    try:
+        if section_config and should_generate_in_sections(conversation_history, user_message, section_config):
+            route.mode = "sectioned"
+            response = generate_in_sections(route, conversation_history, user_message, prompt.text, max_tokens)
+        else:
+            response = get_response(conversation_history, user_message, prompt.text, route.model, max_tokens)
+            
+            # A spec too large for one completion is planned and generated by section instead
+            if response.get("truncated") and section_config and section_config["enabled"]:
+                route.mode = "sectioned"
+                response = generate_in_sections(route, conversation_history, user_message, prompt.text, max_tokens)
+    except Exception as e:
+        error = str(e)
+        raise
+    finally:
+        log_route(route, prompt.version, time.monotonic() - start, error)
+    
+    response["prompt_version"] = prompt.version
+    response["route"] = route
+    return response
 
 
-def get_openai_response(conversation_history, user_message):
+def get_openai_response(conversation_history, user_message, system_prompt, model_name, max_tokens=DEFAULT_MAX_TOKENS):
     """Get response from OpenAI GPT-4."""
     try:
-        import openai
-        
         # Get API key from AI Config
         api_key = get_api_key("openai")
         
-        client = openai.OpenAI(api_key=api_key)
-        
-        # Build messages for OpenAI
-        messages = [
-            {"role": "system", "content": get_system_prompt()}
-        ]
-        
-        # Add conversation history
-        for msg in conversation_history:
-            messages.append({
-                "role": msg["role"],
-                "content": msg["content"]
-            })
-        
-        # Add current user message
+        # Build messages: conversation history, then the current user message
+        messages = [{"role": msg["role"], "content": msg["content"]} for msg in conversation_history]
         messages.append({"role": "user", "content": user_message})
         
-        # Get selected model from AI Config
-        model_name = frappe.db.get_single_value("AI Config", "openai_model") or "gpt-4"
-        
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model=model_name,
-            messages=messages,
-            temperature=0.7,
-            max_tokens=2000
-        )
-        
-        assistant_message = response.choices[0].message.content
+        assistant_message, truncated = complete_chat("openai", api_key, model_name, system_prompt, messages, max_tokens)
         
         # Parse response for structured data
         parsed_response = parse_llm_response(assistant_message)
+        parsed_response["truncated"] = truncated
         
         return parsed_response
         
@@ -77,45 +102,24 @@ def get_openai_response(conversation_history, user_message):
         frappe.throw(_("Failed to get OpenAI response: {0}").format(str(e)))
 
 
-def get_anthropic_response(conversation_history, user_message):
+def get_anthropic_response(conversation_history, user_message, system_prompt, model_name, max_tokens=DEFAULT_MAX_TOKENS):
     """Get response from Anthropic Claude."""
     try:
-        import anthropic
-        
         # Get API key from AI Config
         api_key = get_api_key("anthropic")
         
-        client = anthropic.Anthropic(api_key=api_key)
-        
-        # Build messages for Claude
-        messages = []
-        
-        # Add conversation history
-        for msg in conversation_history:
-            if msg["role"] != "system":
-                messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-        
-        # Add current user message
+        # Build messages for Claude (the system prompt is passed separately)
+        messages = [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in conversation_history if msg["role"] != "system"
+        ]
         messages.append({"role": "user", "content": user_message})
         
-        # Get selected model from AI Config
-        model_name = frappe.db.get_single_value("AI Config", "anthropic_model") or "claude-3-sonnet-20240229"
-        
-        # Call Anthropic API
-        response = client.messages.create(
-            model=model_name,
-            max_tokens=2000,
-            system=get_system_prompt(),
-            messages=messages
-        )
-        
-        assistant_message = response.content[0].text
+        assistant_message, truncated = complete_chat("anthropic", api_key, model_name, system_prompt, messages, max_tokens)
         
         # Parse response for structured data
         parsed_response = parse_llm_response(assistant_message)
+        parsed_response["truncated"] = truncated
         
         return parsed_response
         
@@ -124,7 +128,7 @@ def get_anthropic_response(conversation_history, user_message):
         frappe.throw(_("Failed to get Anthropic response: {0}").format(str(e)))
 
 
-def get_gemini_response(conversation_history, user_message):
+def get_gemini_response(conversation_history, user_message, system_prompt, model_name, max_tokens=None):
     """Get response from Google Gemini."""
     try:
         import google.generativeai as genai
@@ -134,15 +138,8 @@ def get_gemini_response(conversation_history, user_message):
         
         genai.configure(api_key=api_key)
         
-        # Get selected model from AI Config (force fresh read from DB, not cache)
-        frappe.cache().hdel("singles", "AI Config")
-        model_name = frappe.db.get_single_value("AI Config", "gemini_model", cache=False) or "gemini-2.5-flash"
-        
-        # Log which model is being used
-        frappe.logger().info(f"Using Gemini model: {model_name}")
-        
-        # Initialize the model
-        model = genai.GenerativeModel(model_name)
+        # Initialize the model; the system instruction applies to every turn
+        model = genai.GenerativeModel(model_name, system_instruction=system_prompt)
         
         # Build conversation for Gemini
         chat_history = []
@@ -157,14 +154,8 @@ def get_gemini_response(conversation_history, user_message):
         # Start chat with history
         chat = model.start_chat(history=chat_history)
         
-        # Send message with system prompt included in first message if it's the first interaction
-        if not conversation_history:
-            full_message = f"{get_system_prompt()}\n\n{user_message}"
-        else:
-            full_message = user_message
-        
         # Get response
-        response = chat.send_message(full_message)
+        response = chat.send_message(user_message)
         assistant_message = response.text
         
         # Check if AI is writing tutorials instead of JSON
@@ -186,13 +177,14 @@ def get_gemini_response(conversation_history, user_message):
             # AI is being stupid and writing a tutorial. Force a simple response.
             frappe.logger().warning(f"AI wrote tutorial ({len(assistant_message)} chars). Regenerating with stricter prompt.")
             
-            retry_message = f"{get_system_prompt()}\n\nSTOP WRITING TUTORIALS! Just output ONE JSON spec in this EXACT format:\n\n```json\n{{\n  \"doctype_name\": \"Form Name\",\n  \"fields\": [...]\n}}\n```\n\nUser request: {user_message}"
+            retry_message = f"STOP WRITING TUTORIALS! Just output ONE JSON spec in this EXACT format:\n\n```json\n{{\n  \"doctype_name\": \"Form Name\",\n  \"fields\": [...]\n}}\n```\n\nUser request: {user_message}"
             
             response = chat.send_message(retry_message)
             assistant_message = response.text
         
         # Parse response for structured data
         parsed_response = parse_llm_response(assistant_message)
+        parsed_response["truncated"] = gemini_truncated(response)
         
         return parsed_response
         
@@ -201,6 +193,69 @@ def get_gemini_response(conversation_history, user_message):
         frappe.throw(_("Failed to get Gemini response: {0}").format(str(e)))
 
 
+def complete_chat(provider, api_key, model_name, system_prompt, messages, max_tokens=DEFAULT_MAX_TOKENS):
+    """
+    Run one chat completion without touching Frappe state, so it can run in worker threads.
+    
+    Gemini is not capped by max_tokens: its thinking models count reasoning
+    against the same limit.
+    
+    Args:
+        provider (str): openai, anthropic or gemini
+        api_key (str): Provider API key
+        model_name (str): Model to call
+        system_prompt (str): System prompt
+        messages (list): {"role", "content"} messages ending with the user's
+        max_tokens (int): Output token limit
+    
+    Returns:
+        tuple: (response text, whether the output hit the token limit)
+    """
+    if provider == "openai":
+        import openai
+        client = openai.OpenAI(api_key=api_key)
+        response = client.chat.completions.create(
+            model=model_name,
+            messages=[{"role": "system", "content": system_prompt}] + messages,
+            temperature=0.7,
+            max_tokens=max_tokens
+        )
+        choice = response.choices[0]
+        return choice.message.content, choice.finish_reason == "length"
+    
+    if provider == "anthropic":
+        import anthropic
+        client = anthropic.Anthropic(api_key=api_key)
+        response = client.messages.create(
+            model=model_name,
+            max_tokens=max_tokens,
+            system=system_prompt,
+            messages=messages
+        )
+        return response.content[0].text, response.stop_reason == "max_tokens"
+    
+    if provider == "gemini":
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        model = genai.GenerativeModel(model_name, system_instruction=system_prompt)
+        history = [
+            {"role": "model" if msg["role"] == "assistant" else "user", "parts": [msg["content"]]}
+            for msg in messages[:-1]
+        ]
+        response = model.start_chat(history=history).send_message(messages[-1]["content"])
+        return response.text, gemini_truncated(response)
+    
+    raise ValueError(f"Unsupported LLM provider: {provider}")
+
+
+def gemini_truncated(response):
+    """Whether a Gemini response stopped at its output token limit."""
+    try:
+        return response.candidates[0].finish_reason.name == "MAX_TOKENS"
+    except (AttributeError, IndexError):
+        return False
+
+
 def get_api_key(provider):
     """
     Get API key for the specified provider from AI Config.
@@ -218,227 +273,26 @@ def get_api_key(provider):
     return api_key.strip()
 
 
-def get_system_prompt():
+def get_system_prompt(provider=None, phase="generating"):
     """
-    Get system prompt from AI Config or use default.
-    """
-    default_prompt = """You are an expert AI assistant helping users create forms (DocTypes) in Frappe Framework.
-
-YOUR CONVERSATION STRATEGY:
-1. **First Messages**: Ask clarifying questions to understand their needs
-   - What is the form for?
-   - What fields do they need?
-   - Which fields should be mandatory?
-   - What field types (text, email, rating, date, etc.)?
-   - Any validation rules or special requirements?
-
-2. **Confirm Before Generating**: Once you understand their needs, summarize what you'll create and ask for confirmation
-
-3. **Generate Only When Ready**: ONLY after the user confirms or provides complete details, include the JSON spec
-
-CRITICAL RULES:
-- You are building FRAPPE DOCTYPES, not HTML forms or generic templates
-- NEVER write HTML, CSS, or web form code
-- ONLY output conversational text + JSON specification
-- The JSON will be used to create a Frappe DocType automatically
-- Do NOT include JSON in your first few responses - only when ready to generate
-
-Your role:
-1. Have a natural conversation to understand what form the user needs
-2. Ask about fields, field types, mandatory requirements, validations
-3. Summarize and confirm before generating
-4. Generate ONLY a Frappe DocType JSON specification (not HTML/templates)
-
-Frappe DocType Field Types:
-- Data: Short text (max 140 chars)
-- Email: Email address with validation
-- Small Text: Multi-line text area
-- Text: Long text field
-- Rating: Star rating (set options to max stars, e.g., "5" for 5 stars)
-- Select: Dropdown with predefined options
-- Link: Reference to another DocType
-- Date: Date picker
-- Datetime: Date and time picker
-- Check: Boolean checkbox
-- Int: Integer number
-- Float: Decimal number
-- Currency: Money amount
-- Attach: File attachment
-- Section Break: Visual separator
-- Column Break: Column separator
-
-JSON Format (ALWAYS include this):
-```json
-{
-  "doctype_name": "Form Name",
-  "module": "Website",
-  "is_single": false,
-  "is_submittable": false,
-  "autoname": "autoincrement",
-  "title_field": "primary_field_name",
-  "is_web_accessible": true,
-  "fields": [
-    {
-      "fieldname": "field_name",
-      "label": "Field Label",
-      "fieldtype": "Data",
-      "mandatory": true,
-      "description": "Help text"
-    }
-  ]
-}
-```
-
-Important Rules:
-- Use lowercase fieldnames with underscores (e.g., customer_name)
-- Set mandatory: true for required fields
-- For Rating fields, set options to the number of stars (e.g., "5")
-- For Section Break, use fieldtype: "Section Break"
-- Set is_web_accessible: true for public forms
-- Be conversational and ask questions to clarify requirements
-- ONLY include JSON when you have all information and are ready to generate
-
-Example Conversation Flow:
-
-User: "I need a customer feedback form"
-You: "Great! I can help you create a customer feedback form. Let me understand your requirements:
-- What information do you want to collect from customers? (name, email, etc.)
-- Do you want rating scales? If yes, for what aspects and how many stars?
-- Which fields should be mandatory?
-- Any specific validations needed?"
-
-User: "I need name, email (both mandatory), and 5-star ratings for overall experience, product quality, and support"
-You: "Perfect! Let me confirm:
-- Customer Name (mandatory)
-- Customer Email (mandatory)  
-- Overall Experience (5-star rating)
-- Product Quality (5-star rating)
-- Support (5-star rating)
+    Get the compiled system prompt for a provider and turn phase.
 
-Should I also add a comments/feedback text field? And should this be accessible to the public?"
-
-User: "Yes, add a comments field and make it public"
-You: "Perfect! I'll create your customer feedback form as a Frappe DocType. Here's the specification:
-
-```json
-{
-  "doctype_name": "Customer Feedback",
-  "module": "Website",
-  "is_web_accessible": true,
-  "autoname": "autoincrement",
-  "title_field": "customer_name",
-  "fields": [
-    {
-      "fieldname": "customer_name",
-      "label": "Customer Name",
-      "fieldtype": "Data",
-      "mandatory": true
-    },
-    {
-      "fieldname": "customer_email",
-      "label": "Customer Email",
-      "fieldtype": "Email",
-      "mandatory": true
-    },
-    {
-      "fieldname": "overall_experience",
-      "label": "Overall Experience",
-      "fieldtype": "Rating",
-      "options": "5"
-    },
-    {
-      "fieldname": "comments",
-      "label": "Comments",
-      "fieldtype": "Small Text"
-    }
-  ]
-}
-```
-
-Click the 'Create Form' button to generate this DocType in Frappe!"
-
-REMEMBER: Never write HTML templates or code. Always output Frappe DocType JSON specifications only.
-"""
-    
-    try:
-        system_prompt = frappe.db.get_single_value("AI Config", "system_prompt")
-        # If custom prompt exists, use it; otherwise use default
-        return system_prompt if system_prompt else default_prompt
-    except Exception:
-        # Fallback to default prompt if AI Config is not available
-        return default_prompt
-        return system_prompt or """You are an expert AI assistant helping users create forms (DocTypes) in Frappe Framework.
-
-Your role:
-1. Ask clarifying questions to understand what form the user needs
-2. Gather information about fields, field types, validations, and relationships
-3. Once you have ALL the information needed to generate the form, ask about web accessibility
-4. Generate a valid Frappe DocType JSON specification
-5. Explain your suggestions in simple terms
-
-Frappe DocType Field Types:
-- Data: Short text (max 140 chars)
-- Text: Long text
-- Select: Dropdown with predefined options
-- Link: Reference to another DocType
-- Date: Date picker
-- Datetime: Date and time picker
-- Check: Boolean checkbox
-- Int: Integer number
-- Float: Decimal number
-- Currency: Money amount
-- Attach: File upload
-- Table: Child table (requires child DocType)
-
-Field Naming Rules:
-- Use lowercase with underscores (snake_case)
-- No spaces or special characters
-- Max 140 characters
-- NEVER use 'name' as a fieldname (it's reserved for the record ID)
-- Cannot use reserved names: owner, creation, modified, modified_by, docstatus
-
-Web Accessibility Question:
-ONLY ask about web accessibility AFTER you have gathered ALL the information needed to generate the form (all fields, types, validations, etc.). Ask: "Should this form be accessible on the web for public submissions, or is it for internal/admin use only?"
-If the user doesn't specify, assume public access (is_web_accessible: true).
+    Args:
+        provider (str, optional): LLM provider; the one in AI Config by default
+        phase (str): clarifying or generating
 
-When you have enough information, generate a JSON specification like this:
-```json
-{
-  "doctype_name": "Employee Onboarding",
-  "module": "HR",
-  "is_web_accessible": false,
-  "fields": [
-    {
-      "fieldname": "employee_name",
-      "label": "Employee Name",
-      "fieldtype": "Data",
-      "mandatory": 1,
-      "in_list_view": 1
-    },
-    {
-      "fieldname": "start_date",
-      "label": "Start Date",
-      "fieldtype": "Date",
-      "mandatory": 1
-    }
-  ],
-  "naming_rule": "autoincrement",
-  "is_submittable": 0
-}
-```
+    Returns:
+        str: Prompt text assembled from the prompt registry
+    """
+    from frappe_ai_form_builder.api.prompt_registry import compile_prompt
+    provider = provider or frappe.db.get_single_value("AI Config", "llm_provider") or "gemini"
+    return compile_prompt(provider, phase).text
 
-Important:
-- Always ask clarifying questions before generating
-- Gather ALL form requirements first (fields, types, validations, etc.)
-- ONLY after you have complete form specifications, ask about web accessibility
-- Validate field names follow naming rules
-- For Link fields, ask which DocType to link to
-- For Select fields, ask for the list of options
-- Be conversational and helpful
-- If unsure, ask rather than assume
-- Set "is_web_accessible": true for public forms, false for internal forms (default is true for public access)
 
-When ready to generate, include the JSON spec in your response wrapped in ```json markers."""
+def get_request_text(conversation_history, user_message):
+    """Everything the user has asked for so far, used to pick relevant examples."""
+    messages = [msg["content"] for msg in conversation_history if msg["role"] == "user"]
+    return "\n".join(messages + [user_message])
 
 
 def parse_llm_response(response_text):
@@ -449,13 +303,14 @@ def parse_llm_response(response_text):
         response_text (str): Raw LLM response
     
     Returns:
-        dict: Parsed response with message, draft_spec, suggestions
+        dict: Parsed response with message, draft_spec, suggestions, awaiting_confirmation
     """
     result = {
         "message": response_text,
         "draft_spec": None,
         "suggestions": [],
-        "ready_to_generate": False
+        "ready_to_generate": False,
+        "awaiting_confirmation": False
     }
     
     # Try to extract JSON spec from response
@@ -525,6 +380,12 @@ def parse_llm_response(response_text):
     if any(signal in response_text.lower() for signal in ready_signals):
         result["ready_to_generate"] = True
     
+    # A question the user will most likely just confirm; send_message may
+    # start generating the spec before the answer arrives
+    if not result["draft_spec"]:
+        from frappe_ai_form_builder.api.model_router import is_confirmation_request
+        result["awaiting_confirmation"] = is_confirmation_request(response_text)
+    
     return result
 
 
@@ -532,66 +393,14 @@ def validate_doctype_spec(spec):
     """
     Validate DocType specification against Frappe schema rules.
     
+    Uses the validator compiled from AI Config (allowed field types and
+    blacklisted fieldnames), cached until the config changes.
+    
     Args:
         spec (dict): DocType specification
     
     Returns:
         list: List of validation error messages (empty if valid)
     """
-    errors = []
-    
-    # Check required fields
-    doctype_name = spec.get("doctype_name") or spec.get("name")
-    if not doctype_name:
-        errors.append("DocType name is required")
-    
-    if not spec.get("fields") or not isinstance(spec["fields"], list):
-        errors.append("Fields array is required")
-    
-    # Validate field names
-    # reserved_names = ["name", "owner", "creation", "modified", "modified_by", "docstatus"]  # Skip for MVP
-    reserved_names = ["owner", "creation", "modified", "modified_by", "docstatus"]  # Allow 'name' for custom fields
-    allowed_fieldtypes = [
-        "Data", "Text", "Long Text", "Small Text", "Text Area", "Select", "Link", "Date", "Datetime", "Time",
-        "Check", "Int", "Float", "Currency", "Attach", "Attach Image", "Table",
-        "Section Break", "Column Break", "HTML", "Button", "Code", "Text Editor",
-        "Markdown Editor", "HTML Editor", "Read Only", "Password",
-        "Phone", "Email", "Autocomplete", "Barcode", "Color", "Duration", "Rating",
-        "Geolocation", "Dynamic Link", "Table MultiSelect", "Signature", "Icon"
-    ]
-    
-    # Field types that don't require fieldname
-    non_fieldname_types = ["Section Break", "Column Break", "HTML", "Button"]
-    
-    for field in spec.get("fields", []):
-        fieldtype = field.get("fieldtype")
-        fieldname = field.get("fieldname", "")
-        
-        # Check fieldtype is valid
-        if fieldtype not in allowed_fieldtypes:
-            errors.append(f"Field has invalid fieldtype: {fieldtype}")
-            continue
-        
-        # Skip fieldname validation for Section Break, Column Break, etc.
-        if fieldtype in non_fieldname_types:
-            continue
-        
-        # Check fieldname format for regular fields
-        if not fieldname:
-            errors.append(f"Field with type '{fieldtype}' is missing fieldname")
-            continue
-            
-        if fieldname in reserved_names:
-            errors.append(f"Field '{fieldname}' uses a reserved name")
-        
-        if not fieldname.islower() or not fieldname.replace("_", "").isalnum():
-            errors.append(f"Field '{fieldname}' must be lowercase with underscores only")
-        
-        if len(fieldname) > 140:
-            errors.append(f"Field '{fieldname}' exceeds 140 character limit")
-        
-        # Check Link fields have options
-        if fieldtype == "Link" and not field.get("options"):
-            errors.append(f"Link field '{fieldname}' must specify options (target DocType)")
-    
-    return errors
+    from frappe_ai_form_builder.api.spec_validator import get_spec_validator
+    return get_spec_validator().validate(spec)
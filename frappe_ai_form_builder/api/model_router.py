@@ -0,0 +1,143 @@
+"""Model Router - Sends each conversation turn to the model tier its phase needs"""
+
+import re
+
+import frappe
+from frappe.utils import cint
+
+# The phase of the assistant turn about to be generated
+PHASES = ("clarifying", "confirming", "generating", "editing")
+
+# Prompt compiled for each phase; turns that may produce a spec need the JSON format
+PROMPT_PHASES = {
+    "clarifying": "clarifying",
+    "confirming": "generating",
+    "generating": "generating",
+    "editing": "generating"
+}
+
+# Used when AI Config leaves a phase's tier empty
+DEFAULT_TIERS = {
+    "clarifying": "fast",
+    "confirming": "fast",
+    "generating": "strong",
+    "editing": "strong"
+}
+
+# Used when AI Config leaves the provider's model empty
+DEFAULT_MODELS = {
+    "openai": "gpt-4",
+    "anthropic": "claude-3-sonnet-20240229",
+    "gemini": "gemini-2.5-flash"
+}
+
+SPEC_MARKER = "```json"
+
+# Assistant turns that ask the user to confirm the summarized form before it is created
+CONFIRMATION_REQUEST = re.compile(
+    r"((should|shall|can) i|do you want me to|would you like me to)\s+(go ahead|proceed|create|generate|build)[^?]*\?"
+    r"|(can you|please) confirm[^?]*\?"
+    r"|(does|do) (this|these|that|everything) look (good|right|correct|ok)[^?]*\?"
+    r"|is (this|that|everything) (correct|right|ok)[^?]*\?",
+    re.IGNORECASE
+)
+
+# User turns that simply accept what the assistant proposed
+AFFIRMATION = re.compile(
+    r"^\W*(yes|yep|yeah|yup|sure|ok|okay|correct|confirm(ed)?|go ahead|sounds good|looks good|"
+    r"perfect|great|please do|do it|that's (it|right|fine))\b",
+    re.IGNORECASE
+)
+
+# User turns that ask for the spec outright
+GENERATE_REQUEST = re.compile(r"\b(generate|create|build|make) (it|the form|the spec|this)\b", re.IGNORECASE)
+
+ROUTING_LOGGER = "frappe_ai_form_builder.model_router"
+
+
+def classify_phase(conversation_history, user_message, has_draft=False):
+    """
+    Classify the assistant turn that will answer user_message.
+
+    Args:
+        conversation_history (list): Previous conversation messages
+        user_message (str): Latest user message
+        has_draft (bool): Whether the conversation already has a draft spec
+
+    Returns:
+        str: clarifying, confirming, generating or editing
+    """
+    assistant_messages = [msg["content"] for msg in conversation_history if msg["role"] == "assistant"]
+
+    if has_draft or any(SPEC_MARKER in message for message in assistant_messages):
+        return "editing"
+    if not assistant_messages:
+        return "clarifying"
+    if is_confirmation_request(assistant_messages[-1]) and is_affirmation(user_message):
+        return "generating"
+    if GENERATE_REQUEST.search(user_message or ""):
+        return "generating"
+    return "confirming"
+
+
+def is_confirmation_request(message):
+    """Whether an assistant message ends by asking the user to confirm."""
+    return bool(message) and SPEC_MARKER not in message and bool(CONFIRMATION_REQUEST.search(message))
+
+
+def is_affirmation(message):
+    """Whether a user message accepts the assistant's proposal."""
+    return bool(AFFIRMATION.match(message or ""))
+
+
+def route_turn(conversation_history, user_message, has_draft=False):
+    """
+    Choose the provider, prompt and model for the next assistant turn.
+
+    With routing enabled in AI Config, each phase uses its configured tier:
+    the provider's fast model (e.g. a flash or mini model) or its main one.
+
+    Args:
+        conversation_history (list): Previous conversation messages
+        user_message (str): Latest user message
+        has_draft (bool): Whether the conversation already has a draft spec
+
+    Returns:
+        frappe._dict: provider, phase, prompt_phase, tier, model, max_tokens and
+            mode (single, or sectioned once the spec is generated by section)
+    """
+    # Read fresh from the database so a model switch applies on the next turn
+    config = frappe.db.get_singles_dict("AI Config")
+    provider = config.get("llm_provider") or "gemini"
+    phase = classify_phase(conversation_history, user_message, has_draft)
+
+    strong_model = config.get(f"{provider}_model") or DEFAULT_MODELS.get(provider)
+    fast_model = config.get(f"{provider}_fast_model")
+
+    tier = "strong"
+    if cint(config.get("enable_model_routing")) and fast_model:
+        tier = config.get(f"{phase}_model_tier") or DEFAULT_TIERS[phase]
+
+    return frappe._dict(
+        provider=provider,
+        phase=phase,
+        prompt_phase=PROMPT_PHASES[phase],
+        tier=tier,
+        model=fast_model if tier == "fast" else strong_model,
+        max_tokens=cint(config.get("max_output_tokens")),
+        mode="single"
+    )
+
+
+def log_route(route, prompt_version, latency, error=None):
+    """Log one turn's routing decision and how long the model took."""
+    frappe.logger(ROUTING_LOGGER).info({
+        "provider": route.provider,
+        "phase": route.phase,
+        "tier": route.tier,
+        "model": route.model,
+        "mode": route.mode,
+        "prompt_version": prompt_version,
+        "latency_ms": round(latency * 1000),
+        "error": error
+    })
@@ -0,0 +1,292 @@
+"""Prompt Registry - Versioned system prompt sections compiled per provider and turn phase"""
+
+import hashlib
+import math
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+# Turn phases the compiler assembles prompts for
+PHASES = ("clarifying", "generating")
+
+# Providers the prompt is compiled for
+PROVIDERS = ("openai", "anthropic", "gemini")
+
+# Used when AI Config does not set a budget
+DEFAULT_TOKEN_BUDGET = 2000
+
+# Field types listed in the field_types section, only those the spec validator allows
+FIELD_TYPE_DESCRIPTIONS = [
+    (("Data",), "Short text (max 140 chars)"),
+    (("Email", "Phone"), "Contact details with validation"),
+    (("Small Text", "Text"), "Multi-line text"),
+    (("Rating",), "Star rating"),
+    (("Select",), "Dropdown with predefined options"),
+    (("Link",), "Reference to another DocType"),
+    (("Date", "Datetime"), "Date (and time) picker"),
+    (("Check",), "Boolean checkbox"),
+    (("Int", "Float", "Currency"), "Numbers and money amounts"),
+    (("Attach",), "File attachment"),
+    (("Section Break", "Column Break"), "Layout separators")
+]
+
+# Sections are concatenated in this order. Bump a section's version whenever
+# its text changes; the version hash of every prompt that uses it changes too.
+#   phases / providers: only included for these (all when omitted)
+#   optional: dropped, lowest priority first, when the prompt exceeds the budget
+#   render: text built from AI Config at compile time; its hash is appended to the version
+PROMPT_SECTIONS = [
+    {
+        "name": "role",
+        "version": 1,
+        "text": (
+            "You are an expert AI assistant helping users create forms (DocTypes) in Frappe Framework. "
+            "Have a natural conversation to understand what form the user needs, then produce a "
+            "Frappe DocType JSON specification that is used to create the DocType automatically."
+        )
+    },
+    {
+        "name": "rules",
+        "version": 1,
+        "text": """CRITICAL RULES:
+- You are building FRAPPE DOCTYPES, not HTML forms or generic templates
+- NEVER write HTML, CSS, JavaScript, client scripts or web form code
+- ONLY output short conversational text, plus the JSON specification when ready"""
+    },
+    {
+        "name": "output_discipline",
+        "version": 1,
+        "providers": ("gemini",),
+        "text": """NEVER WRITE tutorials, step-by-step guides, installation instructions, markdown documentation, \
+multi-part solutions or "How to" text. Keep every response under 500 words."""
+    },
+    {
+        "name": "clarifying_strategy",
+        "version": 1,
+        "phases": ("clarifying",),
+        "text": """THIS TURN: ask clarifying questions in 1-3 short sentences or a brief list.
+- What is the form for and who fills it in?
+- What fields are needed, and which are mandatory?
+- What field types (text, email, rating, date, etc.) and validations?
+Do NOT include any JSON yet. Once you understand the needs, summarize the fields and ask the user to confirm."""
+    },
+    {
+        "name": "generating_strategy",
+        "version": 1,
+        "phases": ("generating",),
+        "text": """YOUR CONVERSATION STRATEGY:
+1. If anything essential is still unclear, ask about it briefly
+2. Summarize what you'll create and ask for confirmation before generating
+3. ONLY after the user confirms or provides complete details, include the JSON spec wrapped in ```json markers \
+and tell them to click the 'Create Form' button"""
+    },
+    {
+        "name": "field_types",
+        "version": 2,
+        "render": True
+    },
+    {
+        "name": "json_format",
+        "version": 2,
+        "phases": ("generating",),
+        "text": """JSON Format:
+```json
+{
+  "doctype_name": "Form Name",
+  "module": "Website",
+  "is_single": false,
+  "is_submittable": false,
+  "title_field": "primary_field_name",
+  "is_web_accessible": true,
+  "fields": [
+    {"fieldname": "field_name", "label": "Field Label", "fieldtype": "Data", "mandatory": true, "description": "Help text"}
+  ]
+}
+```"""
+    },
+    {
+        "name": "spec_rules",
+        "version": 1,
+        "phases": ("generating",),
+        "text": """Specification Rules:
+- Use lowercase fieldnames with underscores (e.g., customer_name), at most 140 characters
+- Never use reserved fieldnames: name, owner, creation, modified, modified_by, docstatus
+- Set mandatory: true for required fields
+- For Rating fields, set options to the number of stars (e.g., "5")
+- For Select fields, put the options one per line in options; for Link fields, the target DocType
+- Set is_web_accessible: true for public forms, false for internal forms (default true)"""
+    }
+]
+
+# Identifies the registry contents as a whole, e.g. for telemetry dashboards
+REGISTRY_VERSION = hashlib.sha1(
+    ",".join(f"{s['name']}@{s['version']}" for s in PROMPT_SECTIONS).encode()
+).hexdigest()[:12]
+
+# Token counts of section texts, keyed by section name and version
+_section_tokens = {}
+_encoder = None
+
+
+def compile_prompt(provider, phase="generating", budget=None, examples=None):
+    """
+    Assemble the system prompt for a provider and turn phase.
+
+    Sections that do not apply are left out, the additional instructions from
+    AI Config and the given examples are appended, and optional sections are
+    dropped (least relevant example first) until the prompt fits the token budget.
+    A prompt whose required sections alone exceed the budget is still returned,
+    with a warning logged; AI Config refuses such a budget when it is saved.
+
+    Args:
+        provider (str): openai, anthropic or gemini
+        phase (str): clarifying or generating
+        budget (int, optional): Token budget; AI Config's prompt_token_budget by default
+        examples (list, optional): {"id", "text"} few-shot examples, most relevant first
+
+    Returns:
+        frappe._dict: text, tokens, version (stable hash of the included
+            sections), sections (name@version list), provider and phase
+    """
+    config = _get_prompt_config()
+    if budget:
+        config.budget = cint(budget)
+
+    prompt = _compile(provider, phase, config, examples)
+    if prompt.tokens > config.budget:
+        frappe.logger().warning(
+            f"The {phase} system prompt for {provider} needs about {prompt.tokens} tokens, "
+            f"over the budget of {config.budget} set in AI Config"
+        )
+    return prompt
+
+
+def validate_prompt_budget(config):
+    """
+    Throw if any prompt's required sections and additional instructions exceed the budget.
+
+    Called when AI Config is saved, so a long system_prompt is rejected once
+    instead of overflowing the budget on every turn.
+
+    Args:
+        config: AI Config document (or singles dict) being saved
+    """
+    from frappe_ai_form_builder.api.spec_validator import SpecValidator
+
+    config = frappe._dict(
+        instructions=(config.get("system_prompt") or "").strip(),
+        budget=cint(config.get("prompt_token_budget")) or DEFAULT_TOKEN_BUDGET,
+        validator=SpecValidator.from_config(config)
+    )
+    for phase in PHASES:
+        for provider in PROVIDERS:
+            prompt = _compile(provider, phase, config)
+            if prompt.tokens > config.budget:
+                frappe.throw(
+                    _("The {0} system prompt needs about {1} tokens with the Additional Prompt Instructions, "
+                      "over the Prompt Token Budget of {2}. Shorten the instructions or raise the budget.").format(
+                        phase, prompt.tokens, config.budget
+                    )
+                )
+
+
+def _compile(provider, phase, config, examples=None):
+    if phase not in PHASES:
+        frappe.throw(_("Unknown prompt phase: {0}").format(phase))
+
+    sections = [
+        _render_section(s, config) for s in PROMPT_SECTIONS
+        if phase in s.get("phases", PHASES) and provider in s.get("providers", (provider,))
+    ]
+    if config.instructions:
+        sections.append({"name": "instructions", "version": _hash(config.instructions), "text": config.instructions})
+    for rank, example in enumerate(examples or ()):
+        sections.append({
+            "name": f"example:{example['id']}",
+            "version": _hash(example["text"]),
+            "text": example["text"],
+            "optional": True,
+            "priority": -rank
+        })
+
+    tokens = sum(_get_section_tokens(s) for s in sections)
+    for section in sorted((s for s in sections if s.get("optional")), key=lambda s: s.get("priority", 0)):
+        if tokens <= config.budget:
+            break
+        sections.remove(section)
+        tokens -= _get_section_tokens(section)
+
+    ids = [f"{s['name']}@{s['version']}" for s in sections]
+    return frappe._dict(
+        text="\n\n".join(s["text"] for s in sections),
+        tokens=tokens,
+        version=_hash("|".join([provider, phase] + ids)),
+        sections=ids,
+        provider=provider,
+        phase=phase
+    )
+
+
+def _render_section(section, config):
+    if not section.get("render"):
+        return section
+
+    text = _render_field_types(config.validator)
+    return dict(section, version=f"{section['version']}.{_hash(text)}", text=text)
+
+
+def _render_field_types(validator):
+    """List the field types the spec validator accepts, so the model isn't invited to use others."""
+    lines = ["Frappe DocType Field Types:"]
+    for fieldtypes, description in FIELD_TYPE_DESCRIPTIONS:
+        allowed = [fieldtype for fieldtype in fieldtypes if validator.allows_fieldtype(fieldtype)]
+        if allowed:
+            lines.append(f"- {' / '.join(allowed)}: {description}")
+    return "\n".join(lines)
+
+
+def count_tokens(text):
+    """
+    Count prompt tokens with tiktoken when it is installed.
+
+    Otherwise estimate them at four characters per token, which is close
+    for English prose across the supported providers.
+    """
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoder = False
+
+    if _encoder:
+        return len(_encoder.encode(text))
+    return math.ceil(len(text) / 4)
+
+
+def _get_section_tokens(section):
+    key = (section["name"], section["version"])
+    if key not in _section_tokens:
+        _section_tokens[key] = count_tokens(section["text"])
+    return _section_tokens[key]
+
+
+def _get_prompt_config():
+    """Additional instructions, token budget and compiled spec validator from AI Config."""
+    from frappe_ai_form_builder.api.spec_validator import get_spec_validator
+
+    try:
+        config = frappe.db.get_singles_dict("AI Config")
+    except Exception:
+        config = {}
+    return frappe._dict(
+        instructions=(config.get("system_prompt") or "").strip(),
+        budget=cint(config.get("prompt_token_budget")) or DEFAULT_TOKEN_BUDGET,
+        validator=get_spec_validator()
+    )
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import gzip
+import hashlib
+import json
+
+import frappe
+from werkzeug.wrappers import Response
+
+PUBLIC_DIRECTORY_KEY = "ai_form_builder:public_forms_directory"
+
+# Browsers and CDNs may reuse the payload this long before revalidating with the ETag
+DIRECTORY_MAX_AGE = 60
+
+
+@frappe.whitelist(allow_guest=True)
+def get_public_forms_directory():
+	"""
+	List published public forms with their route, title and submission count.
+
+	The JSON payload is built once, gzip-compressed and cached in Redis
+	together with a strong ETag per encoding, so a request costs one cache
+	read and no database queries; clients revalidating with If-None-Match
+	get a 304.
+	The cache is rebuilt after a form changes or submission counts are flushed.
+
+	Returns:
+		Response: gzip-compressed JSON {"forms": [...]}
+	"""
+	payload = frappe.cache().get_value(PUBLIC_DIRECTORY_KEY, generator=build_directory_payload)
+	headers = {
+		"Cache-Control": f"public, max-age={DIRECTORY_MAX_AGE}",
+		"Vary": "Accept-Encoding"
+	}
+
+	# Each representation gets its own strong ETag, so a cache never serves
+	# gzip bytes in answer to a revalidation made for the identity encoding
+	compressed = "gzip" in (frappe.request.headers.get("Accept-Encoding") or "")
+	etag = f"{payload['etag']}-gz" if compressed else payload["etag"]
+
+	if frappe.request.if_none_match.contains(etag):
+		response = Response(status=304, headers=headers)
+	elif compressed:
+		headers["Content-Encoding"] = "gzip"
+		response = Response(payload["body"], mimetype="application/json", headers=headers)
+	else:
+		response = Response(gzip.decompress(payload["body"]), mimetype="application/json", headers=headers)
+
+	response.set_etag(etag)
+	return response
+
+
+def build_directory_payload():
+	"""Build the compressed directory payload and its ETag."""
+	forms = frappe.db.sql("""
+		SELECT public_form.title, web_form.route, public_form.web_form,
+			coalesce(public_form.submission_count, 0) AS submission_count
+		FROM `tabPublic Forms` public_form
+		INNER JOIN `tabWeb Form` web_form ON web_form.name = public_form.web_form
+		WHERE web_form.published = 1
+		ORDER BY public_form.title
+	""", as_dict=True)
+
+	for form in forms:
+		form["route"] = f"/{form.route}"
+
+	body = json.dumps({"forms": forms}, separators=(",", ":"), ensure_ascii=False).encode()
+	return {
+		# Strong validator: the hash of the exact uncompressed JSON
+		"etag": hashlib.sha256(body).hexdigest()[:32],
+		"body": gzip.compress(body, mtime=0)
+	}
+
+
+def invalidate_public_forms_directory(doc=None, method=None):
+	"""Drop the cached directory after a form is published, changed or its counts move."""
+	frappe.cache().delete_value(PUBLIC_DIRECTORY_KEY)
+	# Again once committed, in case a request re-cached the old rows meanwhile
+	frappe.db.after_commit.add(lambda: frappe.cache().delete_value(PUBLIC_DIRECTORY_KEY))
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import frappe
+import redis
+
+
+def get_redis():
+	"""
+	Plain Redis client on the site's cache connection pool.
+
+	Unlike frappe.cache() it neither prefixes keys (use make_key) nor pickles
+	values, and every read goes to Redis instead of a per-request copy.
+	"""
+	return redis.Redis(connection_pool=frappe.cache().connection_pool)
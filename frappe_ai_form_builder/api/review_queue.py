@@ -0,0 +1,111 @@
+"""Review Queue - Paginated, cached listing of AI Generated Artifacts for admins"""
+
+import frappe
+from frappe import _
+from frappe.utils import cint, get_datetime
+
+REVIEW_QUEUE_VERSION_KEY = "ai_form_builder:review_queue_version"
+REVIEW_QUEUE_CACHE_KEY = "ai_form_builder:review_queue"
+
+# Cached pages expire on their own; a status change makes them unreachable sooner
+REVIEW_QUEUE_CACHE_TTL = 300
+
+DEFAULT_PAGE_LENGTH = 50
+MAX_PAGE_LENGTH = 200
+
+STATUSES = ("draft", "approved", "rejected")
+
+# Everything the dashboard shows; the spec in `content` is loaded per artifact on demand
+QUEUE_FIELDS = (
+    "name", "artifact_name", "artifact_type", "status", "session_id", "frappe_doctype",
+    "created_by", "approved_by", "creation", "modified"
+)
+
+
+@frappe.whitelist()
+def get_review_queue(status="draft", artifact_type=None, cursor=None, page_length=DEFAULT_PAGE_LENGTH):
+    """
+    Get one page of artifacts to review, newest first, with counts by status.
+
+    Args:
+        status (str): draft, approved or rejected
+        artifact_type (str, optional): Only list this artifact type
+        cursor (str, optional): next_cursor from the previous page
+        page_length (int): Artifacts per page (at most 200)
+
+    Returns:
+        dict: {"artifacts": [...], "next_cursor": str or None, "counts": {status: count}}
+    """
+    frappe.has_permission("AI Generated Artifact", "read", throw=True)
+
+    if status not in STATUSES:
+        frappe.throw(_("Unknown artifact status: {0}").format(status))
+    page_length = min(cint(page_length) or DEFAULT_PAGE_LENGTH, MAX_PAGE_LENGTH)
+
+    version = _get_version()
+    key = f"{REVIEW_QUEUE_CACHE_KEY}:{version}:{status}:{artifact_type or ''}:{cursor or ''}:{page_length}"
+    page = frappe.cache().get_value(key)
+    if page is None:
+        page = _load_page(status, artifact_type, cursor, page_length)
+        page["counts"] = get_review_counts(version)
+        frappe.cache().set_value(key, page, expires_in_sec=REVIEW_QUEUE_CACHE_TTL)
+
+    return page
+
+
+def get_review_counts(version=None):
+    """Artifacts per status from a single grouped query, cached with the queue."""
+    key = f"{REVIEW_QUEUE_CACHE_KEY}:{version or _get_version()}:counts"
+    counts = frappe.cache().get_value(key)
+    if counts is None:
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(frappe.db.sql("""
+            SELECT status, count(*) FROM `tabAI Generated Artifact`
+            GROUP BY status
+        """))
+        frappe.cache().set_value(key, counts, expires_in_sec=REVIEW_QUEUE_CACHE_TTL)
+    return counts
+
+
+def _load_page(status, artifact_type, cursor, page_length):
+    """Keyset pagination on (modified, name), newest first."""
+    conditions = ["status = %(status)s"]
+    values = {"status": status, "limit": page_length + 1}
+
+    if artifact_type:
+        conditions.append("artifact_type = %(artifact_type)s")
+        values["artifact_type"] = artifact_type
+
+    if cursor:
+        modified, _sep, name = cursor.partition("|")
+        conditions.append("(modified < %(modified)s OR (modified = %(modified)s AND name < %(name)s))")
+        values.update(modified=get_datetime(modified), name=name)
+
+    rows = frappe.db.sql(f"""
+        SELECT {", ".join(QUEUE_FIELDS)}
+        FROM `tabAI Generated Artifact`
+        WHERE {" AND ".join(conditions)}
+        ORDER BY modified DESC, name DESC
+        LIMIT %(limit)s
+    """, values, as_dict=True)
+
+    next_cursor = None
+    if len(rows) > page_length:
+        rows = rows[:page_length]
+        next_cursor = f"{rows[-1].modified.isoformat()}|{rows[-1].name}"
+
+    return {"artifacts": rows, "next_cursor": next_cursor}
+
+
+def _get_version():
+    version = frappe.cache().get_value(REVIEW_QUEUE_VERSION_KEY)
+    if version is None:
+        version = invalidate_review_queue()
+    return version
+
+
+def invalidate_review_queue():
+    """Make every cached queue page and count stale; called when an artifact's status changes."""
+    version = frappe.generate_hash(length=10)
+    frappe.cache().set_value(REVIEW_QUEUE_VERSION_KEY, version)
+    return version
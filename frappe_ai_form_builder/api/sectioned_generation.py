@@ -0,0 +1,236 @@
+"""Sectioned Generation - Large specs planned by section and generated concurrently"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+# Used when AI Config leaves these empty
+DEFAULT_FIELD_THRESHOLD = 40
+DEFAULT_SECTION_WORKERS = 4
+
+# Sections generated per form; a plan with more has its smallest neighbours merged
+MAX_SECTIONS = 20
+
+# Lines that list a field, e.g. "- Customer Name (mandatory)" or "12. Start date"
+LISTED_FIELD_PATTERN = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+\S", re.MULTILINE)
+
+# Explicit sizes, e.g. "150 fields" or "a 150-field checklist"
+STATED_SIZE_PATTERN = re.compile(r"\b(\d{2,4})[\s-]*(?:fields?|questions?|items?|checks?)\b", re.IGNORECASE)
+
+JSON_BLOCK_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+PLAN_INSTRUCTIONS = """This form is large, so it is generated in sections. Do NOT write the field specifications yet.
+Reply with ONLY this JSON plan, grouping every field the user asked for into sections of related fields:
+```json
+{
+  "doctype_name": "Form Name",
+  "module": "Website",
+  "is_web_accessible": true,
+  "title_field": "primary_field_name",
+  "sections": [
+    {"title": "Section Title", "fields": ["Field Label", "Another Field Label"]}
+  ]
+}
+```"""
+
+SECTION_INSTRUCTIONS = """Write the fields for ONE section of the form "{doctype_name}".
+The user's request:
+{request}
+
+Section: {title}
+Fields to write, in this order:
+{labels}
+
+Reply with ONLY a JSON array of field objects in the specification format, without Section Breaks:
+```json
+[{{"fieldname": "field_name", "label": "Field Label", "fieldtype": "Data", "mandatory": true}}]
+```"""
+
+
+def get_section_config():
+    """Sectioned generation settings from AI Config."""
+    try:
+        config = frappe.db.get_singles_dict("AI Config")
+    except Exception:
+        config = {}
+    return {
+        "enabled": cint(config.get("enable_sectioned_generation")),
+        "threshold": cint(config.get("sectioned_generation_threshold")) or DEFAULT_FIELD_THRESHOLD,
+        "workers": cint(config.get("section_generation_workers")) or DEFAULT_SECTION_WORKERS
+    }
+
+
+def estimate_field_count(conversation_history, user_message):
+    """
+    Estimate how many fields the requested form has.
+
+    Counts the fields listed in the user's messages and in the assistant's
+    latest summary, or takes a size the user stated outright.
+    """
+    user_text = "\n".join([msg["content"] for msg in conversation_history if msg["role"] == "user"] + [user_message])
+    assistant_messages = [msg["content"] for msg in conversation_history if msg["role"] == "assistant"]
+
+    listed = len(LISTED_FIELD_PATTERN.findall(user_text))
+    if assistant_messages:
+        listed = max(listed, len(LISTED_FIELD_PATTERN.findall(assistant_messages[-1])))
+
+    stated = [int(size) for size in STATED_SIZE_PATTERN.findall(user_text)]
+    return max([listed] + stated)
+
+
+def should_generate_in_sections(conversation_history, user_message, config=None):
+    """Whether a spec-producing turn should be planned and generated by section."""
+    config = config or get_section_config()
+    return bool(config["enabled"]) and estimate_field_count(conversation_history, user_message) >= config["threshold"]
+
+
+def generate_in_sections(route, conversation_history, user_message, system_prompt, max_tokens):
+    """
+    Generate a large spec as a plan plus one completion per section.
+
+    The plan call groups the requested fields into sections. Sections are
+    then generated concurrently on a bounded thread pool, so wall-clock time
+    follows the largest section rather than the whole form, and no single
+    completion has to fit the entire spec in its output limit. The merged
+    spec has colliding fieldnames renamed and is validated as a whole.
+
+    Args:
+        route (frappe._dict): Routing decision for the turn (provider, model)
+        conversation_history (list): Previous conversation messages
+        user_message (str): Latest user message
+        system_prompt (str): Compiled system prompt for the turn
+        max_tokens (int): Output token limit per completion
+
+    Returns:
+        dict: LLM response with message, draft_spec, suggestions, as from parse_llm_response
+    """
+    from frappe_ai_form_builder.api.llm_adapter import (
+        complete_chat, get_api_key, get_request_text, parse_llm_response
+    )
+
+    config = get_section_config()
+    api_key = get_api_key(route.provider)
+
+    messages = [{"role": m["role"], "content": m["content"]} for m in conversation_history if m["role"] != "system"]
+    messages.append({"role": "user", "content": user_message})
+    plan_text, _truncated = complete_chat(
+        route.provider, api_key, route.model, f"{system_prompt}\n\n{PLAN_INSTRUCTIONS}", messages, max_tokens
+    )
+    plan = _parse_plan(plan_text)
+
+    request = get_request_text(conversation_history, user_message)
+
+    def generate_section(section):
+        prompt = SECTION_INSTRUCTIONS.format(
+            doctype_name=plan["doctype_name"],
+            request=request,
+            title=section["title"],
+            labels="\n".join(f"- {label}" for label in section["fields"])
+        )
+        text, truncated = complete_chat(
+            route.provider, api_key, route.model, system_prompt, [{"role": "user", "content": prompt}], max_tokens
+        )
+        return _parse_fields(text), truncated
+
+    with ThreadPoolExecutor(max_workers=min(config["workers"], len(plan["sections"]))) as pool:
+        results = list(pool.map(generate_section, plan["sections"]))
+
+    incomplete = [s["title"] for s, (fields, truncated) in zip(plan["sections"], results) if fields is None or truncated]
+    if incomplete:
+        frappe.throw(_("Could not generate these form sections: {0}").format(", ".join(incomplete)))
+
+    spec = {key: value for key, value in plan.items() if key != "sections"}
+    spec["fields"] = []
+    for section, (fields, _truncated) in zip(plan["sections"], results):
+        spec["fields"].append({"fieldtype": "Section Break", "label": section["title"]})
+        spec["fields"].extend(fields)
+    resolve_fieldname_collisions(spec["fields"])
+
+    field_count = len([f for f in spec["fields"] if f.get("fieldname")])
+    message = (
+        f"I've generated the {spec['doctype_name']} form with {field_count} fields in "
+        f"{len(plan['sections'])} sections. Here's the specification:\n\n"
+        f"```json\n{json.dumps(spec, indent=2)}\n```\n\n"
+        "Click the 'Create Form' button to generate this DocType!"
+    )
+    # Validates the merged spec and marks it ready, like any single-shot response
+    return parse_llm_response(message)
+
+
+def resolve_fieldname_collisions(fields):
+    """
+    Give every field a unique fieldname across sections.
+
+    Missing fieldnames are derived from the label; repeats get a numeric
+    suffix (contact_email, contact_email_2, ...).
+    """
+    seen = set()
+    for field in fields:
+        if field.get("fieldtype") in ("Section Break", "Column Break") and not field.get("fieldname"):
+            continue
+
+        base = field.get("fieldname") or frappe.scrub(field.get("label") or "field")
+        fieldname, suffix = base, 2
+        while fieldname in seen:
+            fieldname = f"{base}_{suffix}"
+            suffix += 1
+
+        field["fieldname"] = fieldname
+        seen.add(fieldname)
+
+
+def _parse_plan(text):
+    plan = _extract_json(text)
+    if not isinstance(plan, dict) or not plan.get("doctype_name"):
+        frappe.throw(_("The form plan could not be read from the LLM response"))
+
+    sections = [
+        {"title": section.get("title") or f"Section {i}", "fields": [str(label) for label in section.get("fields") or []]}
+        for i, section in enumerate(plan.get("sections") or [], 1)
+        if isinstance(section, dict)
+    ]
+    plan["sections"] = merge_sections([s for s in sections if s["fields"]], MAX_SECTIONS)
+    if not plan["sections"]:
+        frappe.throw(_("The form plan has no sections"))
+    return plan
+
+
+def merge_sections(sections, limit):
+    """
+    Merge neighbouring sections until there are at most limit of them.
+
+    The adjacent pair with the fewest fields between them is merged first, so
+    no requested field is dropped and the sections stay roughly balanced.
+    """
+    sections = list(sections)
+    while len(sections) > limit:
+        i = min(range(len(sections) - 1), key=lambda i: len(sections[i]["fields"]) + len(sections[i + 1]["fields"]))
+        first, second = sections[i], sections.pop(i + 1)
+        sections[i] = {"title": f"{first['title']} / {second['title']}", "fields": first["fields"] + second["fields"]}
+    return sections
+
+
+def _parse_fields(text):
+    """Field list from a section response, or None when it is not a JSON array of objects."""
+    fields = _extract_json(text)
+    if isinstance(fields, dict):
+        fields = fields.get("fields")
+    if not isinstance(fields, list):
+        return None
+    return [
+        field for field in fields
+        if isinstance(field, dict) and field.get("fieldtype") not in ("Section Break", "Column Break")
+    ]
+
+
+def _extract_json(text):
+    """Parse the first ```json block, or the whole text when there is none."""
+    match = JSON_BLOCK_PATTERN.search(text or "")
+    try:
+        return json.loads(match.group(1) if match else text)
+    except (TypeError, ValueError):
+        return None
@@ -3,35 +3,123 @@ import frappe
 from frappe import _
 import json
 from datetime import datetime
+from frappe_ai_form_builder.api.form_templates import apply_template_to_conversation
+from frappe_ai_form_builder.api.similarity_index import find_similar_artifact
+from frappe_ai_form_builder.api.spec_diff import build_preview_update
+from frappe_ai_form_builder.api.speculation import speculate, take_speculation
+
+@frappe.whitelist(allow_guest=True, methods=["GET"])
+def get_session_bootstrap():
+    """Per-visitor data the cached ai_form_builder page needs before its first POST"""
+    return {
+        "csrf_token": frappe.sessions.get_csrf_token(),
+        "user": frappe.session.user
+    }
 
 @frappe.whitelist(allow_guest=True)
-def start_session(template=None):
-    """Start conversation"""
+def start_session(template=None, parameters=None):
+    """Start conversation, optionally from a prebuilt form template"""
     conv = frappe.get_doc({
         "doctype": "AI Conversation",
         "user": frappe.session.user,
-        "template": template or "custom",
+        "template": "custom",
         "state": "active",
         "conversation_history": "[]",
         "created_at": datetime.now()
     })
+    
+    # Templates produce the draft spec instantly, without any LLM call;
+    # an unknown template name throws instead of starting a blank session
+    spec = None
+    if template and template != "custom":
+        spec = apply_template_to_conversation(conv, template, parameters)
+    
     conv.insert()
     frappe.db.commit()
     
+    if spec:
+        return {
+            "session_id": conv.name,
+            "message": template_ready_message(spec),
+            "ready_to_generate": True,
+            **build_preview_update(conv.name, spec)
+        }
+    
     msg = "Hi! What form do you want to create? Tell me what fields you need."
     return {"session_id": conv.name, "message": msg}
 
 @frappe.whitelist(allow_guest=True)
-def send_message(session_id, message):
-    """Send message and get AI response"""
+def apply_template(session_id, template, parameters=None, known_version=None):
+    """Replace the session's draft with a prebuilt form template"""
+    conversation = frappe.get_doc("AI Conversation", session_id)
+    spec = apply_template_to_conversation(conversation, template, parameters)
+    
+    message = template_ready_message(spec)
+    history = json.loads(conversation.conversation_history or "[]")
+    history.append({"role": "assistant", "content": message})
+    conversation.conversation_history = json.dumps(history)
+    
+    conversation.save(ignore_permissions=True)
+    frappe.db.commit()
+    
+    return {
+        "message": message,
+        "ready_to_generate": True,
+        **build_preview_update(session_id, spec, known_version)
+    }
+
+def similar_form_response(match):
+    """Assistant response offering an existing approved form as the starting point"""
+    spec = match["spec"]
+    message = (
+        f"This looks very close to the existing form \"{match['artifact_name']}\". "
+        "I've loaded its fields as a starting point. Tell me what to change, "
+        "or click 'Create Form' to use it as is.\n\n"
+        f"```json\n{json.dumps(spec, indent=2)}\n```"
+    )
+    return {
+        "message": message,
+        "draft_spec": spec,
+        "ready_to_generate": True,
+        "similar_artifact": match["artifact_id"]
+    }
+
+def template_ready_message(spec):
+    """Assistant message shown when a template fills the draft"""
+    return (
+        f"I've prepared the {spec.get('doctype_name')} form from a template with "
+        f"{len([f for f in spec['fields'] if f.get('fieldname')])} fields. "
+        "Tell me what to change, or click 'Create Form' to use it as is."
+    )
+
+@frappe.whitelist(allow_guest=True)
+def send_message(session_id, message, known_version=None):
+    """
+    Send message and get AI response.
+
+    A new draft spec comes back as a field-level diff against the preview at
+    known_version, or in full when the client does not have that version.
+    """
     try:
         # Get conversation
         conversation = frappe.get_doc("AI Conversation", session_id)
         history = json.loads(conversation.conversation_history or "[]")
         
+        # Offer a closely matching approved form before spending LLM turns
+        ai_response = None
+        if not history and not conversation.draft_specification:
+            match = find_similar_artifact(message)
+            if match:
+                ai_response = similar_form_response(match)
+        
+        # A plain "yes" to a confirmation question may already have its spec
+        if ai_response is None and history:
+            ai_response = take_speculation(session_id, history, message)
+        
         # Get AI response using real LLM
-        from frappe_ai_form_builder.api.llm_adapter import get_llm_response
-        ai_response = get_llm_response(history, message)
+        if ai_response is None:
+            from frappe_ai_form_builder.api.llm_adapter import get_llm_response
+            ai_response = get_llm_response(history, message, has_draft=bool(conversation.draft_specification))
         
         # Add user message to history
         history.append({"role": "user", "content": message})
@@ -46,13 +134,21 @@ def send_message(session_id, message):
         # Update conversation
         conversation.conversation_history = json.dumps(history)
         conversation.save(ignore_permissions=True)
+        
+        # Generate the likely final spec while the user reads the question
+        if ai_response.get("awaiting_confirmation"):
+            speculate(session_id, history)
+        
         frappe.db.commit()
         
-        return {
+        response = {
             "message": ai_response["message"],
             "ready_to_generate": ai_response.get("ready_to_generate", False),
-            "draft_spec": ai_response.get("draft_spec")
+            "similar_artifact": ai_response.get("similar_artifact")
         }
+        if ai_response.get("draft_spec"):
+            response.update(build_preview_update(session_id, ai_response["draft_spec"], known_version))
+        return response
     except Exception as e:
         frappe.log_error(frappe.get_traceback(), "Send Message Error")
         frappe.throw(_("Failed to send message: {0}").format(str(e)))
@@ -0,0 +1,263 @@
+"""Similarity Index - Finds approved artifacts that match a new form request"""
+
+import frappe
+import json
+import re
+
+import numpy as np
+
+INDEX_VERSION_KEY = "ai_form_builder:similarity_index_version"
+
+# Minimum cosine similarity for offering an existing form instead of asking the LLM
+MATCH_THRESHOLD = 0.55
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "create", "do", "for", "form", "forms",
+    "from", "have", "i", "in", "is", "it", "make", "me", "my", "need", "of", "on", "or", "our",
+    "please", "should", "some", "that", "the", "this", "to", "want", "we", "with", "would", "you"
+])
+
+# Per-site indexes held by this worker
+_indexes = {}
+
+
+def tokenize(text):
+    """Lowercase word tokens without stop words."""
+    return [t for t in TOKEN_PATTERN.findall((text or "").lower()) if t not in STOP_WORDS]
+
+
+def spec_text(artifact_name, spec):
+    """Text indexed for an artifact: its name, field labels and field types."""
+    parts = [artifact_name or "", spec.get("doctype_name") or "", spec.get("description") or ""]
+    for field in spec.get("fields", []):
+        parts.append(field.get("label") or field.get("fieldname") or "")
+        parts.append(field.get("fieldtype") or "")
+    return " ".join(parts)
+
+
+class SimilarityIndex:
+    """
+    TF-IDF index over approved artifacts with vectorized cosine scoring.
+
+    Documents are stored as flat term-id / term-frequency arrays so new
+    artifacts are appended without touching existing rows. Postings, IDF
+    weights and document norms are derived lazily after each change.
+    """
+
+    def __init__(self):
+        self.vocab = {}
+        self.artifact_ids = []
+        self.alive = []
+        self.last_synced = None
+        self.version = None
+
+        self._term_chunks = []
+        self._tf_chunks = []
+        self._doc_chunks = []
+        self._row_by_artifact = {}
+        self._live_count = 0
+        self._compiled = None
+
+    def __len__(self):
+        return self._live_count
+
+    def add(self, artifact_id, text):
+        """Add or replace one artifact's document."""
+        old_row = self._row_by_artifact.get(artifact_id)
+        if old_row is not None:
+            self.alive[old_row] = False
+            self._live_count -= 1
+
+        counts = {}
+        for token in tokenize(text):
+            term_id = self.vocab.setdefault(token, len(self.vocab))
+            counts[term_id] = counts.get(term_id, 0) + 1
+
+        row = len(self.artifact_ids)
+        self.artifact_ids.append(artifact_id)
+        self.alive.append(True)
+        self._live_count += 1
+        self._row_by_artifact[artifact_id] = row
+
+        if counts:
+            self._term_chunks.append(np.fromiter(counts.keys(), dtype=np.int32, count=len(counts)))
+            self._tf_chunks.append(1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts))))
+            self._doc_chunks.append(np.full(len(counts), row, dtype=np.int32))
+
+        self._compiled = None
+
+    def _compile(self):
+        """Build postings sorted by term, IDF weights and document norms."""
+        doc_count = len(self.artifact_ids)
+        if self._term_chunks:
+            terms = np.concatenate(self._term_chunks)
+            tfs = np.concatenate(self._tf_chunks)
+            docs = np.concatenate(self._doc_chunks)
+            self._term_chunks, self._tf_chunks, self._doc_chunks = [terms], [tfs], [docs]
+        else:
+            terms = np.zeros(0, dtype=np.int32)
+            tfs = np.zeros(0, dtype=np.float32)
+            docs = np.zeros(0, dtype=np.int32)
+
+        live = np.array(self.alive, dtype=bool)[docs]
+        terms, tfs, docs = terms[live], tfs[live], docs[live]
+
+        vocab_size = len(self.vocab)
+        df = np.bincount(terms, minlength=vocab_size).astype(np.float32)
+        idf = np.log((len(self) + 1.0) / (df + 1.0)) + 1.0
+
+        weights = tfs * idf[terms]
+        norms = np.sqrt(np.bincount(docs, weights=weights * weights, minlength=doc_count))
+        norms[norms == 0] = 1.0
+
+        order = np.argsort(terms, kind="stable")
+        offsets = np.zeros(vocab_size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=vocab_size), out=offsets[1:])
+
+        self._compiled = {
+            "idf": idf,
+            "norms": norms.astype(np.float32),
+            "post_docs": docs[order],
+            "post_weights": weights[order],
+            "offsets": offsets
+        }
+
+    def query(self, text, limit=3):
+        """
+        Score every artifact against a free-text request.
+
+        Args:
+            text (str): The user's request
+            limit (int): Number of matches to return
+
+        Returns:
+            list: (artifact_id, score) tuples, best first
+        """
+        if not len(self):
+            return []
+        if self._compiled is None:
+            self._compile()
+        index = self._compiled
+
+        counts = {}
+        for token in tokenize(text):
+            term_id = self.vocab.get(token)
+            if term_id is not None:
+                counts[term_id] = counts.get(term_id, 0) + 1
+        if not counts:
+            return []
+
+        term_ids = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        query_weights = (1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))) * index["idf"][term_ids]
+        query_norm = float(np.sqrt((query_weights * query_weights).sum())) or 1.0
+
+        starts, ends = index["offsets"][term_ids], index["offsets"][term_ids + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return []
+        positions = np.repeat(ends - lengths.cumsum(), lengths) + np.arange(lengths.sum())
+        contributions = index["post_weights"][positions] * np.repeat(query_weights, lengths)
+
+        scores = np.bincount(index["post_docs"][positions], weights=contributions, minlength=len(self.artifact_ids))
+        scores = scores / (index["norms"] * query_norm)
+
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(self.artifact_ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+
+def get_index():
+    """Get this worker's index for the current site, synced with approvals made elsewhere."""
+    site = frappe.local.site
+    index = _indexes.get(site)
+    if index is None:
+        index = _indexes[site] = SimilarityIndex()
+
+    version = frappe.cache().get_value(INDEX_VERSION_KEY)
+    if index.last_synced is None or version != index.version:
+        _sync(index)
+        index.version = version
+
+    return index
+
+
+def _sync(index):
+    """Load approved artifacts modified since the last sync."""
+    filters = {"status": "approved", "artifact_type": "DocType"}
+    if index.last_synced:
+        filters["modified"] = [">=", index.last_synced]
+
+    artifacts = frappe.get_all("AI Generated Artifact",
+        filters=filters,
+        fields=["name", "artifact_name", "content", "modified"],
+        order_by="modified asc"
+    )
+
+    for artifact in artifacts:
+        _add_artifact(index, artifact.name, artifact.artifact_name, artifact.content)
+        index.last_synced = artifact.modified
+
+    if index.last_synced is None:
+        index.last_synced = frappe.utils.now_datetime()
+
+
+def _add_artifact(index, artifact_id, artifact_name, content):
+    try:
+        spec = json.loads(content) if isinstance(content, str) else (content or {})
+    except ValueError:
+        spec = {}
+    index.add(artifact_id, spec_text(artifact_name, spec))
+
+
+def index_artifact(artifact_id, artifact_name, spec):
+    """
+    Add a newly approved artifact to the index.
+
+    Updates this worker's index in place and bumps the Redis version so other
+    workers pull the new artifact on their next query.
+    """
+    try:
+        index = get_index()
+        _add_artifact(index, artifact_id, artifact_name, spec)
+        frappe.cache().set_value(INDEX_VERSION_KEY, frappe.generate_hash(length=10))
+        index.version = frappe.cache().get_value(INDEX_VERSION_KEY)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Similarity Index Error")
+
+
+def find_similar_artifact(text, threshold=MATCH_THRESHOLD):
+    """
+    Find the approved artifact that best matches a form request.
+
+    Args:
+        text (str): The user's request
+        threshold (float): Minimum cosine similarity
+
+    Returns:
+        dict: {"artifact_id", "artifact_name", "score", "spec"} or None
+    """
+    try:
+        matches = get_index().query(text, limit=1)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Similarity Index Error")
+        return None
+
+    if not matches or matches[0][1] < threshold:
+        return None
+
+    artifact_id, score = matches[0]
+    artifact = frappe.db.get_value("AI Generated Artifact", artifact_id,
+        ["artifact_name", "content", "status"], as_dict=True)
+    if not artifact or artifact.status != "approved" or not artifact.content:
+        return None
+
+    return {
+        "artifact_id": artifact_id,
+        "artifact_name": artifact.artifact_name,
+        "score": round(score, 3),
+        "spec": json.loads(artifact.content)
+    }
+
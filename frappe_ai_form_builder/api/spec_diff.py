@@ -0,0 +1,110 @@
+"""Spec Diff - Field-level diffs of draft specs for the live form preview"""
+
+import json
+
+import frappe
+from frappe.utils import cint
+
+PREVIEW_STATE_KEY = "ai_form_builder:preview_spec"
+
+# A client coming back after this long just receives the full spec again
+PREVIEW_STATE_TTL = 6 * 60 * 60
+
+
+def build_preview_update(session_id, spec, known_version=None):
+    """
+    Record the spec sent to a session's preview and describe it relative to
+    the version the client says it already has.
+
+    The server remembers the last spec it sent per session. When the client's
+    known_version matches it, only the field-level diff is returned; when the
+    client is behind, rolled back or has no preview yet, the full spec is.
+
+    Args:
+        session_id (str): AI Conversation name
+        spec (dict): New draft spec
+        known_version (int, optional): spec_version the client last applied
+
+    Returns:
+        dict: {"spec_version": int} plus either "spec_diff" or "draft_spec"
+    """
+    key = f"{PREVIEW_STATE_KEY}:{session_id}"
+    state = frappe.cache().get_value(key)
+    version = (state["version"] if state else 0) + 1
+
+    update = {"spec_version": version}
+    diff = None
+    if state and known_version is not None and cint(known_version) == state["version"]:
+        diff = diff_specs(state["spec"], spec)
+
+    # A diff that touches most of the form is no smaller than the form itself
+    if diff is not None and len(json.dumps(diff)) < len(json.dumps(spec)):
+        update["base_version"] = state["version"]
+        update["spec_diff"] = diff
+    else:
+        update["draft_spec"] = spec
+
+    frappe.cache().set_value(key, {"version": version, "spec": spec}, expires_in_sec=PREVIEW_STATE_TTL)
+    return update
+
+
+def diff_specs(old_spec, new_spec):
+    """
+    Field-level diff between two draft specs.
+
+    Fields are keyed by fieldname (by position for fields without one).
+    Top-level properties such as doctype_name travel in "props".
+
+    Args:
+        old_spec (dict): Spec the client already has
+        new_spec (dict): Spec to bring it to
+
+    Returns:
+        dict: Any of "added", "changed" ({key: field}), "removed" ([key]),
+            "order" ([key], when the field sequence changed), "props" and
+            "removed_props"; None when fields cannot be keyed uniquely
+    """
+    old_fields = keyed_fields(old_spec)
+    new_fields = keyed_fields(new_spec)
+    if old_fields is None or new_fields is None:
+        return None
+
+    diff = {}
+    added = {key: field for key, field in new_fields.items() if key not in old_fields}
+    changed = {
+        key: field for key, field in new_fields.items()
+        if key in old_fields and old_fields[key] != field
+    }
+    removed = [key for key in old_fields if key not in new_fields]
+
+    if added:
+        diff["added"] = added
+    if changed:
+        diff["changed"] = changed
+    if removed:
+        diff["removed"] = removed
+    if list(old_fields) != list(new_fields):
+        diff["order"] = list(new_fields)
+
+    old_props = {k: v for k, v in (old_spec or {}).items() if k != "fields"}
+    new_props = {k: v for k, v in (new_spec or {}).items() if k != "fields"}
+    props = {k: v for k, v in new_props.items() if old_props.get(k) != v}
+    removed_props = [k for k in old_props if k not in new_props]
+
+    if props:
+        diff["props"] = props
+    if removed_props:
+        diff["removed_props"] = removed_props
+
+    return diff
+
+
+def keyed_fields(spec):
+    """Fields of a spec in order, keyed like the preview keys them; None on duplicate fieldnames."""
+    fields = {}
+    for index, field in enumerate((spec or {}).get("fields") or []):
+        key = field.get("fieldname") or f"#{index}"
+        if key in fields:
+            return None
+        fields[key] = field
+    return fields
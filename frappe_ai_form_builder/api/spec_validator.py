@@ -0,0 +1,205 @@
+"""Spec Validator - Compiled, config-driven validation of DocType specifications"""
+
+import re
+from typing import Any, List, Optional
+
+import frappe
+from frappe.model import default_fields
+from pydantic import BaseModel, ConfigDict, ValidationError, ValidationInfo, model_validator
+from pydantic_core import PydanticCustomError
+
+from frappe_ai_form_builder.api.generator import FIELDTYPE_MAPPING
+
+VALIDATOR_VERSION_KEY = "ai_form_builder:spec_validator_version"
+
+# Fieldnames managed by Frappe itself ('name' is allowed for custom fields)
+RESERVED_FIELDNAMES = frozenset(default_fields) - {"name"}
+
+# Used when AI Config does not restrict the allowed field types
+DEFAULT_ALLOWED_FIELDTYPES = frozenset([
+    "Data", "Text", "Long Text", "Small Text", "Text Area", "Select", "Link", "Date", "Datetime", "Time",
+    "Check", "Int", "Float", "Currency", "Attach", "Attach Image", "Table",
+    "Section Break", "Column Break", "HTML", "Button", "Code", "Text Editor",
+    "Markdown Editor", "HTML Editor", "Read Only", "Password",
+    "Phone", "Email", "Autocomplete", "Barcode", "Color", "Duration", "Rating",
+    "Geolocation", "Dynamic Link", "Table MultiSelect", "Signature", "Icon"
+])
+
+# Field types that don't require fieldname; they must still be allowed
+NON_FIELDNAME_TYPES = frozenset(["Section Break", "Column Break", "HTML", "Button"])
+
+FIELDNAME_PATTERN = re.compile(r"^(?=.*[a-z])[a-z0-9_]+$")
+
+# Validators compiled per site, keyed by the config version they were built from
+_validators = {}
+
+
+class FieldSpec(BaseModel):
+    """A single field of a DocType specification."""
+
+    model_config = ConfigDict(extra="allow")
+
+    fieldname: Optional[str] = ""
+    fieldtype: Optional[str] = None
+    options: Any = None
+
+    @model_validator(mode="after")
+    def check_rules(self, info: ValidationInfo):
+        validator = (info.context or {}).get("validator")
+        errors = validator.check_field(self) if validator else []
+        if errors:
+            raise PydanticCustomError("field_rules", "{rules}", {"rules": errors})
+        return self
+
+
+class DocTypeSpec(BaseModel):
+    """Top-level DocType specification as produced by the LLM."""
+
+    model_config = ConfigDict(extra="allow")
+
+    doctype_name: Optional[str] = None
+    name: Optional[str] = None
+    fields: List[FieldSpec]
+
+
+class SpecValidator:
+    """
+    DocType specification validator compiled from AI Config.
+
+    Rule sets are frozen once at build time; validation is a single pydantic
+    pass that collects every error instead of stopping at the first one.
+    """
+
+    def __init__(self, allowed_fieldtypes=None, blacklisted_fields=None):
+        self.allowed_fieldtypes = frozenset(allowed_fieldtypes or DEFAULT_ALLOWED_FIELDTYPES)
+        self.blacklisted_fields = frozenset(blacklisted_fields or ())
+        self.reserved_fieldnames = RESERVED_FIELDNAMES
+
+    @classmethod
+    def from_config(cls, config=None):
+        """Build a validator from the allowed field types and blacklist in AI Config."""
+        if config is None:
+            try:
+                config = frappe.db.get_singles_dict("AI Config")
+            except Exception:
+                config = {}
+
+        return cls(
+            allowed_fieldtypes=_split_lines(config.get("allowed_fieldtypes")),
+            blacklisted_fields=_split_lines(config.get("blacklisted_fields"))
+        )
+
+    def validate(self, spec):
+        """
+        Validate DocType specification against Frappe schema rules.
+
+        Args:
+            spec (dict): DocType specification
+
+        Returns:
+            list: List of validation error messages (empty if valid)
+        """
+        if not isinstance(spec, dict):
+            return ["Specification must be a JSON object"]
+
+        errors = []
+
+        if not (spec.get("doctype_name") or spec.get("name")):
+            errors.append("DocType name is required")
+
+        if not spec.get("fields") or not isinstance(spec["fields"], list):
+            errors.append("Fields array is required")
+            return errors
+
+        try:
+            DocTypeSpec.model_validate(spec, context={"validator": self})
+        except ValidationError as e:
+            for error in e.errors():
+                errors.extend(_format_error(error))
+
+        seen = set()
+        for field in spec["fields"]:
+            fieldname = field.get("fieldname") if isinstance(field, dict) else None
+            if not fieldname:
+                continue
+            if fieldname in seen:
+                errors.append(f"Field '{fieldname}' is defined more than once")
+            seen.add(fieldname)
+
+        return errors
+
+    def allows_fieldtype(self, fieldtype):
+        """Whether a field type is allowed (AI aliases such as Email map to Frappe types)."""
+        return fieldtype in self.allowed_fieldtypes or FIELDTYPE_MAPPING.get(fieldtype) in self.allowed_fieldtypes
+
+    def check_field(self, field):
+        """Return rule violations for a single parsed field."""
+        fieldtype = field.fieldtype
+        fieldname = field.fieldname or ""
+
+        if not self.allows_fieldtype(fieldtype):
+            return [f"Field has invalid fieldtype: {fieldtype}"]
+
+        # Skip fieldname validation for Section Break, Column Break, etc.
+        if fieldtype in NON_FIELDNAME_TYPES:
+            return []
+
+        if not fieldname:
+            return [f"Field with type '{fieldtype}' is missing fieldname"]
+
+        errors = []
+        if fieldname in self.reserved_fieldnames:
+            errors.append(f"Field '{fieldname}' uses a reserved name")
+
+        if fieldname in self.blacklisted_fields:
+            errors.append(f"Field '{fieldname}' is blacklisted in AI Config")
+
+        if not FIELDNAME_PATTERN.match(fieldname):
+            errors.append(f"Field '{fieldname}' must be lowercase with underscores only")
+
+        if len(fieldname) > 140:
+            errors.append(f"Field '{fieldname}' exceeds 140 character limit")
+
+        # Check Link fields have options
+        if fieldtype == "Link" and not field.options:
+            errors.append(f"Link field '{fieldname}' must specify options (target DocType)")
+
+        return errors
+
+
+def get_spec_validator():
+    """
+    Get the compiled validator for the current site.
+
+    The validator is rebuilt only when AI Config changes, which bumps the
+    version key in Redis.
+    """
+    version = frappe.cache().get_value(VALIDATOR_VERSION_KEY) or 0
+    key = (frappe.local.site, version)
+
+    validator = _validators.get(key)
+    if validator is None:
+        for stale_key in [k for k in _validators if k[0] == frappe.local.site]:
+            del _validators[stale_key]
+        validator = _validators[key] = SpecValidator.from_config()
+
+    return validator
+
+
+def clear_spec_validator_cache():
+    """Invalidate compiled validators on every worker after an AI Config change."""
+    frappe.cache().set_value(VALIDATOR_VERSION_KEY, frappe.generate_hash(length=10))
+
+
+def _split_lines(value):
+    """Split a one-per-line config Text field into a list of entries."""
+    return [line.strip() for line in (value or "").splitlines() if line.strip()]
+
+
+def _format_error(error):
+    """Convert a pydantic error into the flat messages returned to the user."""
+    if error["type"] == "field_rules":
+        return list(error["ctx"]["rules"])
+
+    location = ".".join(str(part) for part in error["loc"])
+    return [f"{location}: {error['msg']}"]
@@ -0,0 +1,204 @@
+"""Speculation - Pre-generates the spec while the user reads a confirmation question"""
+
+import hashlib
+import json
+import re
+import time
+
+import frappe
+from frappe.utils import cint
+from frappe_ai_form_builder.api.redis_utils import get_redis
+
+SPECULATION_KEY = "ai_form_builder:speculation"
+SPECULATION_STATS_KEY = "ai_form_builder:speculation_stats"
+SPECULATION_BUDGET_KEY = "ai_form_builder:speculation_budget"
+
+# The reply a speculative turn assumes the user will send
+SPECULATIVE_REPLY = "Yes, please go ahead."
+
+# An unused speculative spec is discarded after this long
+SPECULATION_TTL = 30 * 60
+
+STAT_NAMES = ("started", "hits", "misses", "cancelled", "failed", "over_budget")
+
+# Replies that accept the proposal and add nothing the speculative turn could have missed
+PLAIN_AFFIRMATION = re.compile(
+    r"^\W*((yes|yep|yeah|yup|sure|ok|okay|correct|confirmed?|go ahead|sounds good|looks good|perfect|great|"
+    r"please|please do|do it|thanks|thank you)\W*)+$",
+    re.IGNORECASE
+)
+
+
+def speculate(session_id, history):
+    """
+    Start generating the likely final spec in the background.
+
+    Called when the assistant's last turn asks the user to confirm. Skipped
+    when speculation is disabled or the hourly budget in AI Config is spent.
+    The job is enqueued after the current transaction commits.
+
+    Args:
+        session_id (str): AI Conversation name
+        history (list): Conversation history ending with the confirmation question
+    """
+    config = _get_config()
+    if not config["enabled"]:
+        return
+
+    if config["budget"] and not _take_budget(config["budget"]):
+        _count("over_budget")
+        return
+
+    token = frappe.generate_hash(length=10)
+    _set_entry(session_id, {
+        "token": token,
+        "history_hash": history_hash(history),
+        "status": "pending"
+    })
+
+    frappe.enqueue(
+        "frappe_ai_form_builder.api.speculation.run_speculation",
+        queue="short",
+        timeout=config["timeout"],
+        session_id=session_id,
+        token=token,
+        enqueue_after_commit=True
+    )
+    _count("started")
+
+
+def run_speculation(session_id, token):
+    """Background job: answer the confirmation question as if the user said yes."""
+    from frappe_ai_form_builder.api.llm_adapter import get_llm_response
+
+    entry = _get_entry(session_id)
+    if not entry or entry["token"] != token:
+        return
+
+    conversation = frappe.get_doc("AI Conversation", session_id)
+    history = json.loads(conversation.conversation_history or "[]")
+    if history_hash(history) != entry["history_hash"]:
+        return
+
+    try:
+        response = get_llm_response(history, SPECULATIVE_REPLY, has_draft=bool(conversation.draft_specification))
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Speculation Error")
+        response = None
+
+    # Cancelled or superseded while the model was running
+    entry = _get_entry(session_id)
+    if not entry or entry["token"] != token:
+        return
+
+    if not response or not response.get("draft_spec"):
+        _delete_entry(session_id)
+        _count("failed")
+        return
+
+    response.pop("route", None)
+    entry.update(status="ready", response=response)
+    _set_entry(session_id, entry)
+
+
+def take_speculation(session_id, history, message):
+    """
+    Serve the speculative response when the user simply confirms.
+
+    Any other reply cancels the speculation. A confirmation that arrives
+    while the job is still running does not wait for it: the speculation is
+    dropped and the LLM is called as usual.
+
+    Args:
+        session_id (str): AI Conversation name
+        history (list): Conversation history before the user's message
+        message (str): The user's message
+
+    Returns:
+        dict: The assistant response, or None to call the LLM as usual
+    """
+    entry = _get_entry(session_id)
+    if not entry:
+        return None
+
+    if not PLAIN_AFFIRMATION.match(message or "") or entry["history_hash"] != history_hash(history):
+        _delete_entry(session_id)
+        _count("cancelled")
+        return None
+
+    _delete_entry(session_id)
+    if entry["status"] == "ready":
+        _count("hits")
+        return entry["response"]
+
+    _count("misses")
+    return None
+
+
+@frappe.whitelist()
+def get_speculation_stats():
+    """
+    Report how often speculative specs were used.
+
+    Returns:
+        dict: Counts per outcome and hit_rate (hits per speculation started)
+    """
+    cache = frappe.cache()
+    counts = cache.mget([cache.make_key(f"{SPECULATION_STATS_KEY}:{name}") for name in STAT_NAMES])
+
+    stats = {name: int(count or 0) for name, count in zip(STAT_NAMES, counts)}
+    stats["hit_rate"] = round(stats["hits"] / stats["started"], 3) if stats["started"] else None
+    return stats
+
+
+def history_hash(history):
+    return hashlib.sha1(json.dumps(history, sort_keys=True).encode()).hexdigest()
+
+
+def _take_budget(budget):
+    """Count one speculation against this hour's budget; False once it is spent."""
+    cache = frappe.cache()
+    key = cache.make_key(f"{SPECULATION_BUDGET_KEY}:{int(time.time() // 3600)}")
+    used = cache.incrby(key, 1)
+    if used == 1:
+        cache.expire(key, 3600)
+    return used <= budget
+
+
+def _count(name):
+    try:
+        cache = frappe.cache()
+        cache.incrby(cache.make_key(f"{SPECULATION_STATS_KEY}:{name}"), 1)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "AI Form Builder - Speculation Counter Error")
+
+
+def _get_config():
+    try:
+        config = frappe.db.get_singles_dict("AI Config")
+    except Exception:
+        config = {}
+    return {
+        "enabled": cint(config.get("enable_speculation")),
+        "budget": cint(config.get("speculation_budget_per_hour")),
+        "timeout": cint(config.get("speculation_timeout")) or 120
+    }
+
+
+# Entries are written by both the web request and the background job, so they
+# are kept as JSON straight in Redis rather than behind frappe.cache()'s local copy
+def _get_entry(session_id):
+    value = get_redis().get(_key(session_id))
+    return json.loads(value) if value else None
+
+
+def _set_entry(session_id, entry):
+    get_redis().set(_key(session_id), json.dumps(entry, default=str), ex=SPECULATION_TTL)
+
+
+def _delete_entry(session_id):
+    get_redis().delete(_key(session_id))
+
+
+def _key(session_id):
+    return frappe.cache().make_key(f"{SPECULATION_KEY}:{session_id}")
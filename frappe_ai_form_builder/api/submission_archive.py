@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import add_months, cint, get_datetime, get_first_day, getdate, nowdate
+from frappe_ai_form_builder.api.redis_utils import get_redis
+from frappe_ai_form_builder.api.submission_tracker import SUBMISSION_FIELDS
+
+# Archive tables deliberately avoid the "tab" prefix so `bench trim-tables`
+# does not treat them as leftovers of a deleted DocType
+ARCHIVE_TABLE_PREFIX = "form_submissions_archive_"
+ARCHIVE_VIEW = "form_submissions_all"
+HOT_TABLE = "tabForm Submissions"
+
+ARCHIVE_TABLES_KEY = "ai_form_builder:submission_archive_tables"
+ARCHIVE_LOCK_KEY = "ai_form_builder:submission_archive_lock"
+# Seconds the lock outlives the last completed batch; it is extended after
+# every batch, so a long run keeps it and a crashed one releases it soon
+ARCHIVE_LOCK_TIMEOUT = 600
+ARCHIVE_BATCH_SIZE = 5000
+DEFAULT_HOT_MONTHS = 6
+
+
+def archive_table_name(date):
+	"""Archive table holding the submissions of date's month."""
+	date = getdate(date)
+	return f"{ARCHIVE_TABLE_PREFIX}{date.year:04d}_{date.month:02d}"
+
+
+def get_archive_tables():
+	"""
+	Existing monthly archive tables, oldest first.
+
+	Cached until the archive job creates a table, so readers do not list
+	the database's tables on every query.
+	"""
+	return frappe.cache().get_value(ARCHIVE_TABLES_KEY, generator=_load_archive_tables)
+
+
+def _load_archive_tables():
+	tables = frappe.db.multisql({
+		"mariadb": "SHOW TABLES LIKE 'form\\_submissions\\_archive\\_%'",
+		"postgres": """
+			SELECT tablename FROM pg_tables
+			WHERE schemaname = current_schema() AND tablename LIKE 'form\\_submissions\\_archive\\_%'
+		"""
+	})
+	return sorted(row[0] for row in tables)
+
+
+def get_submission_tables(from_date=None, to_date=None):
+	"""
+	Tables holding submissions in a date range, in chronological order.
+
+	Archives cover whole months older than the hot window, so reading these
+	tables in order yields submissions in submission_date order.
+
+	Args:
+		from_date (str, optional): Earliest submission date
+		to_date (str, optional): Latest submission date
+
+	Returns:
+		list: Table names, archives first and the live table last
+	"""
+	first_month = archive_table_name(from_date) if from_date else None
+	last_month = archive_table_name(to_date) if to_date else None
+
+	tables = [
+		table for table in get_archive_tables()
+		if (not first_month or table >= first_month) and (not last_month or table <= last_month)
+	]
+	tables.append(HOT_TABLE)
+	return tables
+
+
+def archive_cold_submissions():
+	"""
+	Move Form Submissions older than the hot window into monthly archives.
+
+	Runs daily. Rows are copied and deleted in batches, one commit per batch,
+	so the live table stays available and an interrupted run simply resumes;
+	rows already copied are skipped as duplicates.
+	"""
+	cache = get_redis()
+	lock_key = frappe.cache().make_key(ARCHIVE_LOCK_KEY)
+	if not cache.set(lock_key, 1, nx=True, ex=ARCHIVE_LOCK_TIMEOUT):
+		return
+
+	try:
+		hot_months = cint(frappe.db.get_single_value("AI Config", "submission_hot_months")) or DEFAULT_HOT_MONTHS
+		cutoff = get_datetime(get_first_day(add_months(nowdate(), -hot_months)))
+
+		archive_tables = set(_load_archive_tables())
+
+		while True:
+			batch = frappe.db.sql("""
+				SELECT name, submission_date FROM `tabForm Submissions`
+				WHERE submission_date < %s
+				ORDER BY submission_date, name
+				LIMIT %s
+			""", (cutoff, ARCHIVE_BATCH_SIZE))
+			if not batch:
+				break
+
+			by_table = {}
+			for name, submission_date in batch:
+				by_table.setdefault(archive_table_name(submission_date), []).append(name)
+
+			for table in by_table:
+				if table not in archive_tables:
+					_create_archive_table(table)
+					archive_tables.add(table)
+					frappe.cache().delete_value(ARCHIVE_TABLES_KEY)
+
+			for table, names in by_table.items():
+				_move_submissions(table, names)
+			frappe.db.commit()
+			cache.expire(lock_key, ARCHIVE_LOCK_TIMEOUT)
+
+			if len(batch) < ARCHIVE_BATCH_SIZE:
+				break
+
+		# Rebuilt on every run so a run interrupted after creating a table still
+		# ends up in the view
+		if archive_tables:
+			_rebuild_archive_view(sorted(archive_tables))
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(frappe.get_traceback(), "Form Submission Archive - Archive Error")
+	finally:
+		cache.delete(lock_key)
+
+
+def _create_archive_table(table):
+	"""Create a compressed archive table with the submission columns and keys."""
+	columns = ", ".join(SUBMISSION_FIELDS)
+	if frappe.db.db_type == "postgres":
+		# Postgres compresses large values through TOAST by default
+		frappe.db.sql_ddl(f'CREATE TABLE IF NOT EXISTS "{table}" AS SELECT {columns} FROM "{HOT_TABLE}" WITH NO DATA')
+		frappe.db.sql_ddl(f'ALTER TABLE "{table}" ADD PRIMARY KEY (name)')
+		frappe.db.sql_ddl(f'CREATE INDEX IF NOT EXISTS "{table}_form_type_date" ON "{table}" (form_type, submission_date)')
+	else:
+		frappe.db.sql_ddl(f"""
+			CREATE TABLE IF NOT EXISTS `{table}` (
+				PRIMARY KEY (name),
+				KEY form_type_submission_date (form_type, submission_date)
+			) ENGINE=InnoDB ROW_FORMAT=COMPRESSED
+			AS SELECT {columns} FROM `{HOT_TABLE}` LIMIT 0
+		""")
+
+
+def _move_submissions(table, names):
+	columns = ", ".join(SUBMISSION_FIELDS)
+	frappe.db.multisql({
+		"mariadb": f"""
+			INSERT IGNORE INTO `{table}` ({columns})
+			SELECT {columns} FROM `{HOT_TABLE}` WHERE name IN %(names)s
+		""",
+		"postgres": f"""
+			INSERT INTO "{table}" ({columns})
+			SELECT {columns} FROM "{HOT_TABLE}" WHERE name IN %(names)s
+			ON CONFLICT (name) DO NOTHING
+		"""
+	}, {"names": tuple(names)})
+	frappe.db.sql(f"DELETE FROM `{HOT_TABLE}` WHERE name IN %(names)s", {"names": tuple(names)})
+
+
+def _rebuild_archive_view(archive_tables):
+	"""Point the form_submissions_all view at the live table and every archive."""
+	columns = ", ".join(SUBMISSION_FIELDS)
+	selects = [f"SELECT {columns} FROM `{table}`" for table in [*archive_tables, HOT_TABLE]]
+	frappe.db.sql_ddl(f"CREATE OR REPLACE VIEW `{ARCHIVE_VIEW}` AS {' UNION ALL '.join(selects)}")
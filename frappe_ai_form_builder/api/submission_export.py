@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import csv
+import io
+import json
+import zlib
+
+import frappe
+from frappe import _
+from frappe.utils import get_datetime
+from werkzeug.wrappers import Response
+
+from frappe_ai_form_builder.api.submission_archive import HOT_TABLE, get_submission_tables
+from frappe_ai_form_builder.api.submission_tracker import compile_field_extractor
+
+EXPORT_BATCH_SIZE = 1000
+
+BASE_COLUMNS = ("submission_id", "form_name", "form_type", "submitted_by", "submission_date", "status")
+
+
+@frappe.whitelist()
+def export_submissions(form_type=None, from_date=None, to_date=None, format="csv", include_archived=0):
+	"""
+	Stream Form Submissions as a gzip-compressed CSV or JSONL download.
+
+	Rows are read in keyset-paginated batches on (submission_date, name) and
+	compressed as they are produced, so memory stays flat however many rows
+	match. submission_data is decoded into one column per form field.
+
+	Args:
+		form_type (str, optional): Only export submissions of this DocType
+		from_date (str, optional): Earliest submission date/time
+		to_date (str, optional): Latest submission date/time
+		format (str): "csv" or "jsonl"
+		include_archived (int): Also read the monthly archive tables
+
+	Returns:
+		Response: Streaming gzip download
+	"""
+	frappe.has_permission("Form Submissions", "read", throw=True)
+
+	if format not in ("csv", "jsonl"):
+		frappe.throw(_("Unsupported export format: {0}").format(format))
+
+	filters = _build_filters(form_type, from_date, to_date)
+	tables = get_submission_tables(from_date, to_date) if frappe.utils.cint(include_archived) else [HOT_TABLE]
+	columns = _field_columns(tables, filters) if format == "csv" else None
+
+	site, user = frappe.local.site, frappe.session.user
+	filename = f"form-submissions-{frappe.utils.nowdate()}.{format}.gz"
+
+	return Response(
+		_stream(site, user, tables, filters, format, columns),
+		mimetype="application/gzip",
+		headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+		direct_passthrough=True
+	)
+
+
+def _build_filters(form_type, from_date, to_date):
+	conditions, values = [], {}
+	if form_type:
+		conditions.append("form_type = %(form_type)s")
+		values["form_type"] = form_type
+	if from_date:
+		conditions.append("submission_date >= %(from_date)s")
+		values["from_date"] = get_datetime(from_date)
+	if to_date:
+		conditions.append("submission_date <= %(to_date)s")
+		values["to_date"] = get_datetime(to_date)
+	return conditions, values
+
+
+def _field_columns(tables, filters):
+	"""Union of data fieldnames for every form type in the export, in meta order."""
+	conditions, values = filters
+	where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+	form_types = set()
+	for table in tables:
+		form_types.update(frappe.db.sql_list(f"SELECT DISTINCT form_type FROM `{table}` {where}", values))
+
+	columns = []
+	for form_type in sorted(form_types):
+		if not frappe.db.exists("DocType", form_type):
+			continue
+		for fieldname, _encode in compile_field_extractor(frappe.get_meta(form_type).fields):
+			if fieldname not in columns:
+				columns.append(fieldname)
+	return columns
+
+
+def _stream(site, user, tables, filters, format, columns):
+	"""
+	Yield gzip chunks of the export.
+
+	Runs after the request has returned, so it opens its own site connection.
+	Tables are read one after another; archives hold older months than the
+	live table, so the output stays in submission_date order.
+	"""
+	frappe.init(site=site)
+	frappe.connect()
+	frappe.set_user(user)
+
+	compressor = zlib.compressobj(wbits=31)  # gzip container
+	try:
+		if format == "csv":
+			header = list(BASE_COLUMNS) + [_column_name(c) for c in columns]
+			yield compressor.compress(_csv_line(header).encode())
+
+		for table in tables:
+			for batch in _iter_batches(table, filters):
+				buffer = io.StringIO()
+				for row in batch:
+					data = _decode(row.submission_data)
+					base = (row.name, row.form_name, row.form_type, row.submitted_by, str(row.submission_date), row.status)
+					if format == "csv":
+						writer = csv.writer(buffer)
+						writer.writerow(list(base) + [_cell(data.get(c)) for c in columns])
+					else:
+						record = dict(zip(BASE_COLUMNS, base))
+						record["data"] = data
+						buffer.write(json.dumps(record, ensure_ascii=False, default=str))
+						buffer.write("\n")
+
+				chunk = compressor.compress(buffer.getvalue().encode())
+				if chunk:
+					yield chunk
+
+		yield compressor.flush()
+	finally:
+		frappe.destroy()
+
+
+def _iter_batches(table, filters):
+	"""Keyset pagination over (submission_date, name)."""
+	conditions, values = filters
+	last_date = last_name = None
+
+	while True:
+		page_conditions = list(conditions)
+		page_values = dict(values, limit=EXPORT_BATCH_SIZE)
+		if last_name is not None:
+			page_conditions.append(
+				"(submission_date > %(last_date)s OR (submission_date = %(last_date)s AND name > %(last_name)s))"
+			)
+			page_values.update(last_date=last_date, last_name=last_name)
+
+		where = f"WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+		batch = frappe.db.sql(f"""
+			SELECT name, form_name, form_type, submitted_by, submission_date, status, submission_data
+			FROM `{table}`
+			{where}
+			ORDER BY submission_date ASC, name ASC
+			LIMIT %(limit)s
+		""", page_values, as_dict=True)
+
+		if not batch:
+			return
+
+		yield batch
+
+		last_date, last_name = batch[-1].submission_date, batch[-1].name
+		if len(batch) < EXPORT_BATCH_SIZE:
+			return
+
+
+def _decode(submission_data):
+	if isinstance(submission_data, dict):
+		return submission_data
+	try:
+		data = json.loads(submission_data or "{}")
+	except ValueError:
+		return {}
+	return data if isinstance(data, dict) else {}
+
+
+def _column_name(fieldname):
+	# Keep form fields from shadowing the submission's own columns
+	return f"field_{fieldname}" if fieldname in BASE_COLUMNS else fieldname
+
+
+def _cell(value):
+	if value is None:
+		return ""
+	if isinstance(value, (dict, list)):
+		return json.dumps(value, ensure_ascii=False, default=str)
+	return value
+
+
+def _csv_line(values):
+	buffer = io.StringIO()
+	csv.writer(buffer).writerow(values)
+	return buffer.getvalue()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import hashlib
+import json
+import time
+
+import frappe
+import redis
+from frappe import _
+from frappe.utils import cint
+from frappe_ai_form_builder.api.redis_utils import get_redis
+from frappe_ai_form_builder.api.submission_tracker import get_field_extractor, get_web_form_registry
+
+SUBMISSION_THROTTLE_KEY = "ai_form_builder:submission_throttle"
+SUBMISSION_HASH_KEY = "ai_form_builder:submission_hash"
+
+# Sliding window for the per-IP limit, and how long an identical payload is refused
+THROTTLE_WINDOW = 600
+DUPLICATE_WINDOW = 3600
+
+DEFAULT_SUBMISSIONS_PER_IP = 20
+
+
+def guard_submission(doc, method):
+	"""
+	Refuse throttled or duplicate web form submissions before they are written.
+
+	Runs before_insert for every DocType; like track_submission it returns
+	immediately unless the insert comes from a Web Form. Each request costs one
+	Redis round trip. When Redis is unavailable submissions are let through.
+	"""
+	if not frappe.flags.in_web_form:
+		return
+
+	web_form_name = get_web_form_registry().get(doc.doctype)
+	if not web_form_name:
+		return
+
+	limit = get_submission_limit()
+	ip_address = getattr(frappe.local, 'request_ip', None)
+	content_hash = submission_hash(doc)
+
+	try:
+		cache = get_redis()
+		pipe = cache.pipeline()
+		if limit and ip_address:
+			now = time.time()
+			throttle_key = frappe.cache().make_key(f"{SUBMISSION_THROTTLE_KEY}:{web_form_name}:{ip_address}")
+			pipe.zremrangebyscore(throttle_key, 0, now - THROTTLE_WINDOW)
+			pipe.zadd(throttle_key, {f"{now}:{frappe.generate_hash(length=6)}": now})
+			pipe.zcard(throttle_key)
+			pipe.expire(throttle_key, THROTTLE_WINDOW)
+		pipe.exists(frappe.cache().make_key(f"{SUBMISSION_HASH_KEY}:{web_form_name}:{content_hash}"))
+		results = pipe.execute()
+	except redis.exceptions.RedisError:
+		frappe.log_error(frappe.get_traceback(), "Form Submission Guard - Redis Error")
+		return
+
+	if limit and ip_address and results[2] > limit:
+		frappe.throw(_("Too many submissions from your network. Please try again later."),
+			frappe.RateLimitExceededError)
+
+	if results[-1]:
+		frappe.throw(_("This form has already been submitted with the same details."),
+			frappe.DuplicateEntryError)
+
+	doc.flags.submission_hash = content_hash
+
+
+def remember_submission(doc, web_form_name):
+	"""Refuse the same payload for this Web Form during the duplicate window."""
+	if not doc.flags.submission_hash:
+		return
+
+	try:
+		get_redis().set(
+			frappe.cache().make_key(f"{SUBMISSION_HASH_KEY}:{web_form_name}:{doc.flags.submission_hash}"),
+			1, ex=DUPLICATE_WINDOW
+		)
+	except redis.exceptions.RedisError:
+		frappe.log_error(frappe.get_traceback(), "Form Submission Guard - Redis Error")
+
+
+def submission_hash(doc):
+	"""
+	Hash of the submitted values, ignoring case and whitespace differences.
+
+	Args:
+		doc (Document): Submitted document
+
+	Returns:
+		str: Hex digest identifying the payload
+	"""
+	data = {}
+	for fieldname, _encode in get_field_extractor(doc.doctype):
+		value = doc.get(fieldname)
+		if value in (None, ""):
+			continue
+		data[fieldname] = " ".join(value.lower().split()) if isinstance(value, str) else str(value)
+
+	payload = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+	return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def get_submission_limit():
+	"""Submissions allowed per IP address per form in the throttle window (0 disables)."""
+	limit = frappe.db.get_single_value("AI Config", "submission_limit_per_ip")
+	return DEFAULT_SUBMISSIONS_PER_IP if limit is None else cint(limit)
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) 2024, Frappe AI Form Builder and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe.utils import getdate, now_datetime, nowdate
+from frappe_ai_form_builder.api.redis_utils import get_redis
+
+PENDING_COUNTS_KEY = "ai_form_builder:submission_counts_pending"
+PROCESSING_COUNTS_KEY = "ai_form_builder:submission_counts_processing"
+DEAD_COUNTS_KEY = "ai_form_builder:submission_counts_dead"
+COUNTS_FLUSH_LOCK_KEY = "ai_form_builder:submission_counts_flush_lock"
+
+KEY_SEPARATOR = "\t"
+
+# Hash field naming the batch in the processing key, and the global default
+# recording the last batch applied to the database
+BATCH_FIELD = "__batch__"
+APPLIED_BATCH_GLOBAL = "ai_form_builder_applied_counts_batch"
+
+
+def increment_submission_count(web_form, form_type):
+	"""
+	Count one submission for today in Redis once the submission is committed.
+
+	Counters are flushed to the database every minute.
+	"""
+	field = KEY_SEPARATOR.join((web_form, form_type, nowdate()))
+	frappe.db.after_commit.add(
+		lambda: get_redis().hincrby(frappe.cache().make_key(PENDING_COUNTS_KEY), field, 1)
+	)
+
+
+def flush_submission_counts():
+	"""
+	Apply pending Redis counters to the daily rollup and Public Forms totals.
+
+	Pending counters are atomically renamed to a processing key and tagged
+	with a batch id. The batch id is saved in the same transaction as the
+	counts, so a flush that committed but died before deleting the key is
+	recognised by the next run and not applied twice; one that died before
+	the commit is applied again. Entries that cannot be parsed are moved to
+	a dead-letter key instead of blocking every later flush.
+	"""
+	cache = get_redis()
+	lock_key = frappe.cache().make_key(COUNTS_FLUSH_LOCK_KEY)
+	if not cache.set(lock_key, 1, nx=True, ex=300):
+		return
+
+	pending_key = frappe.cache().make_key(PENDING_COUNTS_KEY)
+	processing_key = frappe.cache().make_key(PROCESSING_COUNTS_KEY)
+
+	try:
+		if not cache.exists(processing_key):
+			if not cache.exists(pending_key):
+				return
+			cache.rename(pending_key, processing_key)
+
+		cache.hsetnx(processing_key, BATCH_FIELD, frappe.generate_hash(length=12))
+		batch = frappe.safe_decode(cache.hget(processing_key, BATCH_FIELD))
+
+		applied = frappe.db.get_global(APPLIED_BATCH_GLOBAL) == batch
+		if not applied:
+			counts, invalid = _read_counts(cache, processing_key)
+			if invalid:
+				_dead_letter(cache, invalid)
+
+			_apply_counts(counts)
+			frappe.db.set_global(APPLIED_BATCH_GLOBAL, batch)
+			frappe.db.commit()
+		cache.delete(processing_key)
+
+		if not applied:
+			from frappe_ai_form_builder.api.public_directory import invalidate_public_forms_directory
+			invalidate_public_forms_directory()
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(frappe.get_traceback(), "Form Submission Stats - Flush Error")
+	finally:
+		cache.delete(lock_key)
+
+
+def _read_counts(cache, key):
+	"""
+	Parse a counters hash.
+
+	Returns:
+		tuple: ({(web_form, form_type, stat_date): count}, {field: value} that could not be parsed)
+	"""
+	counts, invalid = {}, {}
+	for field, value in (cache.hgetall(key) or {}).items():
+		if frappe.safe_decode(field) == BATCH_FIELD:
+			continue
+		try:
+			web_form, form_type, stat_date = frappe.safe_decode(field).split(KEY_SEPARATOR)
+			counts[(web_form, form_type, str(getdate(stat_date)))] = int(value)
+		except Exception:
+			invalid[field] = value
+	return counts, invalid
+
+
+def _dead_letter(cache, invalid):
+	"""Keep unparseable counters aside for inspection and log them."""
+	cache.hset(frappe.cache().make_key(DEAD_COUNTS_KEY), mapping=invalid)
+	frappe.log_error(
+		"\n".join(f"{frappe.safe_decode(field)!r}: {frappe.safe_decode(value)!r}" for field, value in invalid.items()),
+		"Form Submission Stats - Invalid Counters"
+	)
+
+
+def _apply_counts(counts):
+	now = now_datetime()
+	user = frappe.session.user
+	totals = {}
+
+	for (web_form, form_type, stat_date), count in counts.items():
+		frappe.db.multisql({
+			"mariadb": """
+				INSERT INTO `tabForm Submission Daily Stats`
+					(name, creation, modified, owner, modified_by, docstatus, idx,
+					web_form, form_type, stat_date, submission_count)
+				VALUES (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+					%(web_form)s, %(form_type)s, %(stat_date)s, %(count)s)
+				ON DUPLICATE KEY UPDATE
+					submission_count = submission_count + VALUES(submission_count),
+					modified = VALUES(modified)
+			""",
+			"postgres": """
+				INSERT INTO "tabForm Submission Daily Stats"
+					(name, creation, modified, owner, modified_by, docstatus, idx,
+					web_form, form_type, stat_date, submission_count)
+				VALUES (%(name)s, %(now)s, %(now)s, %(user)s, %(user)s, 0, 0,
+					%(web_form)s, %(form_type)s, %(stat_date)s, %(count)s)
+				ON CONFLICT (name) DO UPDATE SET
+					submission_count = "tabForm Submission Daily Stats".submission_count + EXCLUDED.submission_count,
+					modified = EXCLUDED.modified
+			"""
+		}, {
+			"name": rollup_name(web_form, form_type, stat_date),
+			"now": now,
+			"user": user,
+			"web_form": web_form,
+			"form_type": form_type,
+			"stat_date": stat_date,
+			"count": count
+		})
+		totals[web_form] = totals.get(web_form, 0) + count
+
+	for web_form, count in totals.items():
+		frappe.db.sql("""
+			UPDATE `tabPublic Forms`
+			SET submission_count = coalesce(submission_count, 0) + %s
+			WHERE web_form = %s
+		""", (count, web_form))
+
+
+def rollup_name(web_form, form_type, stat_date):
+	"""Name of the Form Submission Daily Stats row for one Web Form, DocType and day."""
+	return f"{web_form}-{form_type}-{stat_date}"
+
+
+def get_pending_counts():
+	"""Counts recorded in Redis but not flushed yet, per Web Form."""
+	cache = get_redis()
+	pending = {}
+	for key in (PROCESSING_COUNTS_KEY, PENDING_COUNTS_KEY):
+		counts, _invalid = _read_counts(cache, frappe.cache().make_key(key))
+		for (web_form, _form_type, _stat_date), count in counts.items():
+			pending[web_form] = pending.get(web_form, 0) + count
+	return pending
+
+
+def get_total_submission_count(web_form):
+	"""Submission total for one Web Form, summed from the daily rollup."""
+	total = frappe.db.sql("""
+		SELECT coalesce(sum(submission_count), 0)
+		FROM `tabForm Submission Daily Stats`
+		WHERE web_form = %s
+	""", web_form)
+	return int(total[0][0]) if total else 0
+
+
+@frappe.whitelist()
+def get_live_submission_counts():
+	"""
+	Current submission totals for every public form.
+
+	Reads the maintained totals on Public Forms plus counters not flushed
+	yet, so the cost does not depend on the size of any submissions table.
+
+	Returns:
+		dict: {web_form: submission count}
+	"""
+	counts = {
+		row.web_form: row.submission_count or 0
+		for row in frappe.get_all("Public Forms", fields=["web_form", "submission_count"])
+	}
+	for web_form, count in get_pending_counts().items():
+		counts[web_form] = counts.get(web_form, 0) + count
+	return counts
+
+
+@frappe.whitelist()
+def get_daily_stats(web_form=None, from_date=None, to_date=None):
+	"""
+	Daily submission counts from the rollup table.
+
+	Args:
+		web_form (str, optional): Limit to one Web Form
+		from_date (str, optional): First day to include
+		to_date (str, optional): Last day to include
+
+	Returns:
+		list: Rows with web_form, form_type, stat_date and submission_count
+	"""
+	filters = {}
+	if web_form:
+		filters["web_form"] = web_form
+	if from_date and to_date:
+		filters["stat_date"] = ["between", [getdate(from_date), getdate(to_date)]]
+	elif from_date:
+		filters["stat_date"] = [">=", getdate(from_date)]
+	elif to_date:
+		filters["stat_date"] = ["<=", getdate(to_date)]
+
+	return frappe.get_all("Form Submission Daily Stats",
+		filters=filters,
+		fields=["web_form", "form_type", "stat_date", "submission_count"],
+		order_by="stat_date desc"
+	)
@@ -4,53 +4,504 @@
 
 import frappe
 import json
-from frappe.utils import get_datetime
+import re
+from frappe import _
+from frappe.model import no_value_fields
+from frappe.utils import cint, flt, get_datetime
+from frappe_ai_form_builder.api.submission_stats import increment_submission_count
+
+WEB_FORM_REGISTRY_KEY = "ai_form_builder:web_form_registry"
+WEB_FORM_REGISTRY_VERSION_KEY = "ai_form_builder:web_form_registry_version"
+
+SUBMISSION_BUFFER_KEY = "ai_form_builder:submission_buffer"
+SUBMISSION_FLUSH_LOCK_KEY = "ai_form_builder:submission_flush_lock"
+
+# Rows written per bulk insert, and buffered rows that trigger an early flush
+SUBMISSION_BATCH_SIZE = 500
+
+# Backpressure: beyond this many buffered rows submissions are written inline
+MAX_BUFFERED_SUBMISSIONS = 50000
+
+SUBMISSION_FIELDS = (
+	"name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+	"form_name", "form_type", "submitted_by", "submission_date", "submission_data",
+	"status", "ip_address", "user_agent"
+)
+
+# Numeric field types are stored as numbers; everything else as text
+FIELD_ENCODERS = {
+	"Int": cint,
+	"Check": cint,
+	"Float": flt,
+	"Currency": flt,
+	"Percent": flt,
+	"Rating": flt,
+	"JSON": lambda value: value
+}
+
+SUBMISSION_FILTER_COLUMNS_KEY = "ai_form_builder:submission_filter_columns"
+
+# Generated columns over submission_data are named sf_n_<fieldname> (numeric)
+# or sf_t_<fieldname> (text) and indexed together with form_type
+FILTER_COLUMN_PREFIX = "sf_"
+MAX_FILTER_FIELDNAME_LENGTH = 55
+FILTER_TEXT_LENGTH = 140
+SAFE_FIELDNAME_PATTERN = re.compile(r"^[a-z0-9_]+$")
+
+QUERY_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "like", "not like", "in", "not in")
+QUERY_ORDER_BY = ("submission_date desc", "submission_date asc")
+MAX_QUERY_PAGE_LENGTH = 1000
+
+# Per-site state held by this worker:
+# site -> (version, {doctype: web form name}, {doctype: compiled field extractor})
+_web_form_registries = {}
+
+
+def _get_registry_state():
+	site = frappe.local.site
+	version = frappe.cache().get_value(WEB_FORM_REGISTRY_VERSION_KEY)
+	if version is None:
+		version = _bump_registry_version()
+
+	cached = _web_form_registries.get(site)
+	if cached and cached[0] == version:
+		return cached
+
+	registry = frappe.cache().get_value(WEB_FORM_REGISTRY_KEY, generator=_build_web_form_registry)
+	state = _web_form_registries[site] = (version, registry, {})
+	return state
+
+
+def get_web_form_registry():
+	"""
+	Get the DocType -> Web Form mapping for the current site.
+
+	The mapping is kept in process and revalidated against a Redis version key
+	(one cache hit, memoised per request); it is rebuilt from the database only
+	after a Web Form or DocType changes.
+	"""
+	return _get_registry_state()[1]
+
+
+def get_field_extractor(doctype):
+	"""
+	Get the compiled field extractor for a DocType.
+
+	Compiled once per worker from the DocType meta and dropped together with
+	the Web Form registry whenever a DocType changes.
+	"""
+	extractors = _get_registry_state()[2]
+	extractor = extractors.get(doctype)
+	if extractor is None:
+		extractor = extractors[doctype] = compile_field_extractor(frappe.get_meta(doctype).fields)
+	return extractor
+
+
+def compile_field_extractor(fields):
+	"""
+	Build the (fieldname, encoder) pairs captured in a submission snapshot.
+
+	Args:
+		fields (list): DocField rows from the DocType meta
+
+	Returns:
+		tuple: (fieldname, encoder) pairs for fields that hold data
+	"""
+	return tuple(
+		(field.fieldname, FIELD_ENCODERS.get(field.fieldtype, str))
+		for field in fields
+		if field.fieldname and field.fieldname != 'name' and field.fieldtype not in no_value_fields
+	)
+
+
+def extract_submission_data(doc, extractor):
+	"""Serialize a submitted document's data fields as compact JSON."""
+	data = {}
+	for fieldname, encode in extractor:
+		value = doc.get(fieldname)
+		if value is not None:
+			data[fieldname] = encode(value)
+	return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _build_web_form_registry():
+	registry = {}
+	for web_form in frappe.get_all("Web Form", fields=["name", "doc_type"], order_by="creation asc"):
+		if web_form.doc_type:
+			registry.setdefault(web_form.doc_type, web_form.name)
+	return registry
+
+
+def _bump_registry_version():
+	version = frappe.generate_hash(length=10)
+	frappe.cache().set_value(WEB_FORM_REGISTRY_VERSION_KEY, version)
+	return version
+
+
+def invalidate_web_form_registry(doc=None, method=None):
+	"""Drop the cached registry and field extractors on every worker after a Web Form or DocType changes."""
+	frappe.cache().delete_value(WEB_FORM_REGISTRY_KEY)
+	_bump_registry_version()
+
 
 def track_submission(doc, method):
 	"""Track form submissions in the unified Form Submissions DocType"""
 
-	# Only track if this was submitted via a web form
-	if not hasattr(frappe.flags, 'in_web_form') or not frappe.flags.in_web_form:
+	# Only track if this was submitted via a web form; every other insert on
+	# the site stops here
+	if not frappe.flags.in_web_form:
 		return
 
 	# Check if this doctype has a web form
-	web_form_exists = frappe.db.exists("Web Form", {"doc_type": doc.doctype})
-	if not web_form_exists:
+	web_form_name = get_web_form_registry().get(doc.doctype)
+	if not web_form_name:
 		return
 
 	try:
-		# Get the web form name
-		web_form_name = frappe.db.get_value("Web Form", {"doc_type": doc.doctype}, "name")
-		if not web_form_name:
-			return
-
 		# Prepare submission data
-		submission_data = {}
-		meta = frappe.get_meta(doc.doctype)
-
-		# Get all field values
-		for field in meta.fields:
-			if field.fieldname and field.fieldname != 'name':
-				value = doc.get(field.fieldname)
-				if value is not None:
-					submission_data[field.fieldname] = str(value)
-
-		# Create Form Submissions record
-		submission = frappe.get_doc({
-			"doctype": "Form Submissions",
+		submission_data = extract_submission_data(doc, get_field_extractor(doc.doctype))
+
+		# Buffer the Form Submissions record; it is written in batches later
+		buffer_submission({
 			"form_name": web_form_name,
 			"form_type": doc.doctype,
 			"submitted_by": frappe.session.user if frappe.session.user != "Guest" else "Anonymous",
-			"submission_date": get_datetime(),
-			"submission_data": json.dumps(submission_data, indent=2),
+			"submission_date": str(get_datetime()),
+			"submission_data": submission_data,
 			"status": "New",
 			"ip_address": getattr(frappe.local, 'request_ip', None),
 			"user_agent": getattr(frappe.local, 'user_agent', None)
 		})
+		increment_submission_count(web_form_name, doc.doctype)
 
-		submission.insert(ignore_permissions=True)
-		frappe.db.commit()
+		# Only refuse repeats of a payload that was actually saved
+		from frappe_ai_form_builder.api.submission_guard import remember_submission
+		frappe.db.after_commit.add(lambda: remember_submission(doc, web_form_name))
 
 	except Exception as e:
 		# Log error but don't break the submission
-		frappe.log_error(f"Form submission tracking failed: {str(e)}", "Form Submission Tracker")
\ No newline at end of file
+		frappe.log_error(f"Form submission tracking failed: {str(e)}", "Form Submission Tracker")
+
+
+def buffer_submission(record):
+	"""
+	Queue a Form Submissions record in Redis for a batched write.
+
+	The record is pushed only once the submitted document is committed, so a
+	rolled back submission leaves nothing behind. The name is assigned here so
+	a batch replayed after a failed flush is skipped as a duplicate instead of
+	inserted twice. When the buffer is full the record is inserted inline, in
+	the submission's own transaction, so nothing is dropped.
+	"""
+	record["name"] = frappe.generate_hash(length=10)
+	record["owner"] = frappe.session.user
+
+	if frappe.cache().llen(SUBMISSION_BUFFER_KEY) >= MAX_BUFFERED_SUBMISSIONS:
+		frappe.get_doc(dict(record, doctype="Form Submissions")).insert(ignore_permissions=True)
+		return
+
+	frappe.db.after_commit.add(lambda: _push_submission(record))
+
+
+def _push_submission(record):
+	cache = frappe.cache()
+	cache.rpush(SUBMISSION_BUFFER_KEY, json.dumps(record))
+
+	if cache.llen(SUBMISSION_BUFFER_KEY) >= SUBMISSION_BATCH_SIZE:
+		# Already committed, so the job can be enqueued right away
+		frappe.enqueue(
+			"frappe_ai_form_builder.api.submission_tracker.flush_submission_buffer",
+			queue="short",
+			job_id="ai_form_builder_flush_submissions",
+			deduplicate=True
+		)
+
+
+def flush_submission_buffer(max_batches=20):
+	"""
+	Write buffered submissions to Form Submissions with bulk inserts.
+
+	Runs every minute from the scheduler and early when the buffer fills.
+	Each batch is read from the head of the list, committed, and only then
+	trimmed, so a crash mid-flush replays the batch (at-least-once); replayed
+	rows keep their names and are ignored as duplicates.
+	"""
+	cache = frappe.cache()
+	lock_key = cache.make_key(SUBMISSION_FLUSH_LOCK_KEY)
+	if not cache.set(lock_key, 1, nx=True, ex=600):
+		return
+
+	try:
+		for _i in range(max_batches):
+			batch = cache.lrange(SUBMISSION_BUFFER_KEY, 0, SUBMISSION_BATCH_SIZE - 1)
+			if not batch:
+				break
+
+			_write_submissions([json.loads(item) for item in batch])
+			frappe.db.commit()
+
+			cache.ltrim(SUBMISSION_BUFFER_KEY, len(batch), -1)
+
+			if len(batch) < SUBMISSION_BATCH_SIZE:
+				break
+	except Exception:
+		frappe.db.rollback()
+		frappe.log_error(frappe.get_traceback(), "Form Submission Tracker - Flush Error")
+	finally:
+		cache.delete(lock_key)
+
+
+def _write_submissions(records):
+	values = []
+	for record in records:
+		submission_date = get_datetime(record.get("submission_date"))
+		owner = record.get("owner") or "Guest"
+		row = dict(record, creation=submission_date, modified=submission_date,
+			modified_by=owner, owner=owner, docstatus=0, idx=0)
+		values.append(tuple(row.get(field) for field in SUBMISSION_FIELDS))
+
+	frappe.db.bulk_insert("Form Submissions", SUBMISSION_FIELDS, values, ignore_duplicates=True)
+
+
+def is_numeric_encoder(encode):
+	return encode is cint or encode is flt
+
+
+def filter_column_name(fieldname, numeric):
+	"""Name of the generated column that exposes one submission_data field."""
+	return f"{FILTER_COLUMN_PREFIX}{'n' if numeric else 't'}_{fieldname}"
+
+
+def _json_value_sql(fieldname, numeric):
+	"""
+	SQL expression reading one field from submission_data.
+
+	Numeric columns only take JSON numbers, so a text value stored under the
+	same fieldname by another form reads as NULL instead of failing a cast.
+	"""
+	if frappe.db.db_type == "postgres":
+		if numeric:
+			return (f"(CASE WHEN json_typeof(submission_data -> '{fieldname}') = 'number' "
+				f"THEN (submission_data ->> '{fieldname}')::numeric END)")
+		return f"left(submission_data ->> '{fieldname}', {FILTER_TEXT_LENGTH})"
+
+	path = f"'$.\"{fieldname}\"'"
+	if numeric:
+		return (f"IF(JSON_TYPE(JSON_EXTRACT(submission_data, {path})) IN ('INTEGER', 'DOUBLE'), "
+			f"JSON_VALUE(submission_data, {path}), NULL)")
+	return f"LEFT(JSON_VALUE(submission_data, {path}), {FILTER_TEXT_LENGTH})"
+
+
+def get_filterable_fields():
+	"""
+	Collect the submission fields admins marked as filterable on Public Forms.
+
+	Returns:
+		dict: {column name: (fieldname, numeric)}
+	"""
+	columns = {}
+	for public_form in frappe.get_all("Public Forms",
+		filters={"filterable_fields": ["is", "set"]},
+		fields=["web_form", "filterable_fields"]
+	):
+		doctype = frappe.db.get_value("Web Form", public_form.web_form, "doc_type")
+		if not doctype or not frappe.db.exists("DocType", doctype):
+			continue
+
+		encoders = dict(compile_field_extractor(frappe.get_meta(doctype).fields))
+		for fieldname in (public_form.filterable_fields or "").split():
+			if fieldname in encoders and SAFE_FIELDNAME_PATTERN.match(fieldname):
+				numeric = is_numeric_encoder(encoders[fieldname])
+				columns[filter_column_name(fieldname, numeric)] = (fieldname, numeric)
+	return columns
+
+
+def get_filter_columns():
+	"""Generated filter columns that currently exist on Form Submissions."""
+	return frappe.cache().get_value(SUBMISSION_FILTER_COLUMNS_KEY, generator=lambda: [
+		column for column in frappe.db.get_table_columns("Form Submissions")
+		if column.startswith(FILTER_COLUMN_PREFIX)
+	])
+
+
+def sync_filter_columns():
+	"""
+	Add and drop generated, indexed columns to match the filterable fields.
+
+	Runs in a background job after a Public Forms change, since adding an
+	index to a large submissions table takes a while.
+	"""
+	wanted = get_filterable_fields()
+	existing = set(frappe.db.get_table_columns("Form Submissions"))
+	is_postgres = frappe.db.db_type == "postgres"
+
+	for column in sorted(c for c in existing if c.startswith(FILTER_COLUMN_PREFIX) and c not in wanted):
+		if is_postgres:
+			frappe.db.sql_ddl(f'ALTER TABLE "tabForm Submissions" DROP COLUMN IF EXISTS "{column}"')
+		else:
+			frappe.db.sql_ddl(f"ALTER TABLE `tabForm Submissions` DROP COLUMN `{column}`")
+
+	for column, (fieldname, numeric) in sorted(wanted.items()):
+		if column in existing:
+			continue
+
+		expression = _json_value_sql(fieldname, numeric)
+		if is_postgres:
+			column_type = "numeric" if numeric else f"varchar({FILTER_TEXT_LENGTH})"
+			frappe.db.sql_ddl(f'ALTER TABLE "tabForm Submissions" ADD COLUMN "{column}" '
+				f"{column_type} GENERATED ALWAYS AS ({expression}) STORED")
+			frappe.db.sql_ddl(f'CREATE INDEX IF NOT EXISTS "idx_{column}" '
+				f'ON "tabForm Submissions" (form_type, "{column}")')
+		else:
+			column_type = "DECIMAL(21,9)" if numeric else f"VARCHAR({FILTER_TEXT_LENGTH})"
+			frappe.db.sql_ddl(f"ALTER TABLE `tabForm Submissions` ADD COLUMN `{column}` "
+				f"{column_type} AS ({expression}) VIRTUAL, "
+				f"ADD INDEX `idx_{column}` (form_type, `{column}`)")
+
+	frappe.cache().delete_value(SUBMISSION_FILTER_COLUMNS_KEY)
+
+
+def enqueue_filter_column_sync():
+	frappe.enqueue(
+		"frappe_ai_form_builder.api.submission_tracker.sync_filter_columns",
+		queue="long",
+		job_id="ai_form_builder_sync_filter_columns",
+		deduplicate=True,
+		enqueue_after_commit=True
+	)
+
+
+def _parse_query_filters(filters):
+	"""Accept [[fieldname, operator, value], ...] or {fieldname: value | [operator, value]}."""
+	if isinstance(filters, str):
+		filters = json.loads(filters or "[]")
+	if isinstance(filters, dict):
+		filters = [
+			[fieldname, *(value if isinstance(value, (list, tuple)) else ("=", value))]
+			for fieldname, value in filters.items()
+		]
+	return filters or []
+
+
+def _build_data_conditions(form_type, filters, use_filter_columns=True):
+	"""
+	Translate submission_data filters into SQL conditions.
+
+	Fields with a generated column are compared on that indexed column;
+	other fields, and every field on archive tables (which have no generated
+	columns), fall back to the equivalent JSON expression in SQL.
+	"""
+	encoders = dict(get_field_extractor(form_type))
+	filter_columns = set(get_filter_columns()) if use_filter_columns else set()
+
+	conditions = ["form_type = %(form_type)s"]
+	values = {"form_type": form_type}
+
+	for i, (fieldname, operator, value) in enumerate(_parse_query_filters(filters)):
+		operator = str(operator).lower()
+		if fieldname not in encoders or not SAFE_FIELDNAME_PATTERN.match(fieldname):
+			frappe.throw(_("{0} is not a data field of {1}").format(fieldname, form_type))
+		if operator not in QUERY_OPERATORS:
+			frappe.throw(_("Unsupported filter operator: {0}").format(operator))
+
+		numeric = is_numeric_encoder(encoders[fieldname])
+		column = filter_column_name(fieldname, numeric)
+		target = column if column in filter_columns else _json_value_sql(fieldname, numeric)
+
+		key = f"value_{i}"
+		if operator in ("in", "not in"):
+			value = tuple(value if isinstance(value, (list, tuple)) else str(value).split(","))
+		values[key] = value
+		conditions.append(f"{target} {operator} %({key})s")
+
+	return conditions, values
+
+
+def _get_query_tables(include_archived):
+	from frappe_ai_form_builder.api.submission_archive import HOT_TABLE, get_submission_tables
+	return get_submission_tables() if cint(include_archived) else [HOT_TABLE]
+
+
+def _table_conditions(table, form_type, filters):
+	from frappe_ai_form_builder.api.submission_archive import HOT_TABLE
+	return _build_data_conditions(form_type, filters, use_filter_columns=table == HOT_TABLE)
+
+
+@frappe.whitelist()
+def query_submissions(form_type, filters=None, order_by="submission_date desc", start=0, page_length=100,
+	include_archived=0):
+	"""
+	Query Form Submissions of one form by the values submitted in it.
+
+	Only the live table is searched unless include_archived is set, like the
+	export; archived months are then searched too, each table sorted and
+	limited on its own before the results are merged.
+
+	Args:
+		form_type (str): DocType behind the Web Form
+		filters (list|dict|str, optional): Filters on submission_data fields,
+			e.g. [["rating", "<", 3]] or {"ticket_type": "VIP"}
+		order_by (str): "submission_date desc" or "submission_date asc"
+		start (int): Offset of the first row
+		page_length (int): Rows to return (at most 1000)
+		include_archived (int): Also read the monthly archive tables
+
+	Returns:
+		list: Submissions with submission_data decoded into "data"
+	"""
+	frappe.has_permission("Form Submissions", "read", throw=True)
+
+	if order_by not in QUERY_ORDER_BY:
+		frappe.throw(_("Unsupported sort order: {0}").format(order_by))
+
+	start, page_length = cint(start), min(cint(page_length) or 100, MAX_QUERY_PAGE_LENGTH)
+	values = {"start": start, "page_length": page_length, "table_limit": start + page_length}
+
+	selects = []
+	for table in _get_query_tables(include_archived):
+		conditions, condition_values = _table_conditions(table, form_type, filters)
+		values.update(condition_values)
+		selects.append(f"""(
+			SELECT name, form_name, form_type, submitted_by, submission_date, status, submission_data
+			FROM `{table}`
+			WHERE {' AND '.join(conditions)}
+			ORDER BY {order_by}, name
+			LIMIT %(table_limit)s
+		)""")
+
+	rows = frappe.db.sql(f"""
+		{' UNION ALL '.join(selects)}
+		ORDER BY {order_by}, name
+		LIMIT %(page_length)s OFFSET %(start)s
+	""", values, as_dict=True)
+
+	for row in rows:
+		data = row.pop("submission_data")
+		row["data"] = json.loads(data) if isinstance(data, str) else (data or {})
+	return rows
+
+
+@frappe.whitelist()
+def count_submissions(form_type, filters=None, include_archived=0):
+	"""
+	Count Form Submissions of one form matching filters on submitted values.
+
+	Args:
+		form_type (str): DocType behind the Web Form
+		filters (list|dict|str, optional): See query_submissions
+		include_archived (int): Also count the monthly archive tables
+
+	Returns:
+		int: Number of matching submissions
+	"""
+	frappe.has_permission("Form Submissions", "read", throw=True)
+
+	total = 0
+	for table in _get_query_tables(include_archived):
+		conditions, values = _table_conditions(table, form_type, filters)
+		count = frappe.db.sql(f"""
+			SELECT count(*) FROM `{table}`
+			WHERE {' AND '.join(conditions)}
+		""", values)
+		total += int(count[0][0]) if count else 0
+	return total
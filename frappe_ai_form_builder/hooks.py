@@ -132,7 +132,25 @@ fixtures = [
 
 doc_events = {
 	"*": {
+		"before_insert": "frappe_ai_form_builder.api.submission_guard.guard_submission",
 		"after_insert": "frappe_ai_form_builder.api.submission_tracker.track_submission"
+	},
+	"DocType": {
+		"on_update": "frappe_ai_form_builder.api.submission_tracker.invalidate_web_form_registry"
+	},
+	"Web Form": {
+		"on_update": [
+			"frappe_ai_form_builder.api.submission_tracker.invalidate_web_form_registry",
+			"frappe_ai_form_builder.api.public_directory.invalidate_public_forms_directory"
+		],
+		"on_trash": [
+			"frappe_ai_form_builder.api.submission_tracker.invalidate_web_form_registry",
+			"frappe_ai_form_builder.api.public_directory.invalidate_public_forms_directory"
+		],
+		"after_rename": [
+			"frappe_ai_form_builder.api.submission_tracker.invalidate_web_form_registry",
+			"frappe_ai_form_builder.api.public_directory.invalidate_public_forms_directory"
+		]
 	}
 }
 
@@ -157,6 +175,19 @@ doc_events = {
 # 	],
 # }
 
+scheduler_events = {
+	"daily_long": [
+		"frappe_ai_form_builder.api.submission_archive.archive_cold_submissions",
+		"frappe_ai_form_builder.api.audit_log.roll_up_expired_audit_logs"
+	],
+	"cron": {
+		"* * * * *": [
+			"frappe_ai_form_builder.api.submission_tracker.flush_submission_buffer",
+			"frappe_ai_form_builder.api.submission_stats.flush_submission_counts"
+		]
+	}
+}
+
 # Testing
 # -------
 
@@ -177,11 +208,19 @@ doc_events = {
 # -------------------
 
 whitelisted_methods = [
+    "frappe_ai_form_builder.api.session.get_session_bootstrap",
     "frappe_ai_form_builder.api.session.start_session",
     "frappe_ai_form_builder.api.session.send_message",
+    "frappe_ai_form_builder.api.session.apply_template",
+    "frappe_ai_form_builder.api.form_templates.get_templates",
+    "frappe_ai_form_builder.api.public_directory.get_public_forms_directory",
     "frappe_ai_form_builder.api.generator.generate_doctype",
     "frappe_ai_form_builder.api.generator.approve_artifact",
-    "frappe_ai_form_builder.api.generator.reject_artifact"
+    "frappe_ai_form_builder.api.generator.reject_artifact",
+    "frappe_ai_form_builder.api.review_queue.get_review_queue",
+    "frappe_ai_form_builder.api.submission_export.export_submissions",
+    "frappe_ai_form_builder.api.submission_tracker.query_submissions",
+    "frappe_ai_form_builder.api.submission_tracker.count_submissions"
 ]
 # override_doctype_dashboards = {
 # 	"Task": "frappe_ai_form_builder.task.get_dashboard_data"
@@ -199,7 +238,7 @@ whitelisted_methods = [
 # Request Events
 # ----------------
 # before_request = ["frappe_ai_form_builder.utils.before_request"]
-# after_request = ["frappe_ai_form_builder.utils.after_request"]
+after_request = ["frappe_ai_form_builder.api.audit_log.flush_request_audit_events"]
 
 # Job Events
 # ----------
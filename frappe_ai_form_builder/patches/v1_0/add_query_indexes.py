@@ -0,0 +1,20 @@
+import frappe
+
+# Composite indexes matched to the filters and sort orders used in api/.
+# Single-column indexes come from search_index in the DocType JSON, which
+# model sync applies before this patch runs.
+QUERY_INDEXES = [
+	("AI Conversation", ["user", "state"]),
+	("AI Generated Artifact", ["status", "artifact_type", "modified"]),
+	("AI Generated Artifact", ["session_id", "status"]),
+	("Form Submissions", ["form_type", "submission_date"]),
+	("Form Submissions", ["submission_date", "name"]),
+	("AI Audit Log", ["artifact_id", "timestamp"]),
+]
+
+
+def execute():
+	"""Add the indexes behind the app's hot queries; existing indexes are left alone."""
+	for doctype, columns in QUERY_INDEXES:
+		if frappe.db.table_exists(doctype):
+			frappe.db.add_index(doctype, columns)
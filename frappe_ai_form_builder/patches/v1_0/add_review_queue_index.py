@@ -0,0 +1,6 @@
+import frappe
+
+
+def execute():
+	"""Index the review queue's status filter and newest-first order."""
+	frappe.db.add_index("AI Generated Artifact", ["status", "modified"])
@@ -0,0 +1,19 @@
+import frappe
+
+# Layout types every generated spec and template uses; the allow-list applies
+# to them too, so configs saved before they were in the default need them
+LAYOUT_FIELDTYPES = ("Section Break", "Column Break")
+
+
+def execute():
+	"""Append the layout field types to an existing Allowed Field Types list."""
+	allowed = frappe.db.get_single_value("AI Config", "allowed_fieldtypes") or ""
+	entries = [line.strip() for line in allowed.splitlines() if line.strip()]
+
+	# An empty list already allows every type
+	missing = [fieldtype for fieldtype in LAYOUT_FIELDTYPES if entries and fieldtype not in entries]
+	if missing:
+		frappe.db.set_single_value("AI Config", "allowed_fieldtypes", "\n".join(entries + missing))
+
+		from frappe_ai_form_builder.api.spec_validator import clear_spec_validator_cache
+		clear_spec_validator_cache()
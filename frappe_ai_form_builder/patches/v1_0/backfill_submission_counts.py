@@ -0,0 +1,35 @@
+import frappe
+
+
+def execute():
+	"""
+	Rebuild the daily rollup and Public Forms totals from stored submissions.
+
+	Covers submissions made before the counters existed and renames rollup
+	rows to include the form type. Buffered submissions are written first and
+	unflushed counters dropped, as every submission is counted from the tables.
+	"""
+	from frappe_ai_form_builder.api.redis_utils import get_redis
+	from frappe_ai_form_builder.api.submission_archive import get_submission_tables
+	from frappe_ai_form_builder.api.submission_stats import (
+		PENDING_COUNTS_KEY, PROCESSING_COUNTS_KEY, _apply_counts
+	)
+	from frappe_ai_form_builder.api.submission_tracker import flush_submission_buffer
+
+	flush_submission_buffer(max_batches=1000)
+	get_redis().delete(*[frappe.cache().make_key(key) for key in (PENDING_COUNTS_KEY, PROCESSING_COUNTS_KEY)])
+
+	counts = {}
+	for table in get_submission_tables():
+		for web_form, form_type, stat_date, count in frappe.db.sql(f"""
+			SELECT form_name, form_type, DATE(submission_date), count(*)
+			FROM `{table}`
+			WHERE form_name IS NOT NULL AND form_type IS NOT NULL
+			GROUP BY form_name, form_type, DATE(submission_date)
+		"""):
+			key = (web_form, form_type, str(stat_date))
+			counts[key] = counts.get(key, 0) + count
+
+	frappe.db.delete("Form Submission Daily Stats")
+	frappe.db.sql("UPDATE `tabPublic Forms` SET submission_count = 0")
+	_apply_counts(counts)
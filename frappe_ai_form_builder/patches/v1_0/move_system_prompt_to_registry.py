@@ -0,0 +1,18 @@
+import frappe
+
+# Openings of the full prompts that used to be stored in AI Config: the field's
+# old default and the prompt fix_ai_prompt.update_prompt wrote
+LEGACY_PROMPT_PREFIXES = (
+	"You are an expert form builder AI. Your task is to create comprehensive",
+	"You are an expert AI assistant helping users create forms (DocTypes) in Frappe Framework."
+)
+
+
+def execute():
+	"""Clear stored copies of the old full system prompt; it now comes from the prompt registry."""
+	system_prompt = (frappe.db.get_single_value("AI Config", "system_prompt") or "").strip()
+	if system_prompt.startswith(LEGACY_PROMPT_PREFIXES):
+		frappe.db.set_single_value("AI Config", "system_prompt", None)
+
+	if not frappe.db.get_single_value("AI Config", "prompt_token_budget"):
+		frappe.db.set_single_value("AI Config", "prompt_token_budget", 2000)
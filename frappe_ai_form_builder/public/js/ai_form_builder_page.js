@@ -0,0 +1,1003 @@
+let sessionId = null;
+let readyToGenerate = false;
+let conversationHistory = []; // Store conversation snapshots
+let currentHistoryIndex = -1;
+let currentSpec = null; // Current form specification
+let specVersion = null; // Server spec_version of currentSpec; lets the server send diffs
+
+// CSRF token for this browser session, fetched on load so the page itself can be cached
+let csrfToken = null;
+
+async function bootstrapSession() {
+    const response = await fetch('/api/method/frappe_ai_form_builder.api.session.get_session_bootstrap', {
+        credentials: 'same-origin',
+        cache: 'no-store'
+    });
+    const data = await response.json();
+    csrfToken = data.message.csrf_token;
+}
+
+// Start session on load
+window.onload = async function() {
+    try {
+        await bootstrapSession();
+        const response = await fetch('/api/method/frappe_ai_form_builder.api.session.start_session', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Frappe-CSRF-Token': csrfToken
+            }
+        });
+        const data = await response.json();
+        if (data.message) {
+            sessionId = data.message.session_id;
+            // Initialize empty preview
+            renderFormPreview(null);
+            saveConversationSnapshot(currentSpec);
+        }
+    } catch (error) {
+        console.error('Failed to start session:', error);
+        addMessage('ai', 'Sorry, failed to start session. Please refresh the page.');
+    }
+};
+
+// Predefined prompts functionality
+function usePrompt(promptText) {
+    const input = document.getElementById('userInput');
+    input.value = promptText;
+    
+    // Hide prompts section
+    document.body.classList.add('prompts-hidden');
+    
+    // Send the message
+    sendMessage();
+}
+
+// Prebuilt templates fill the draft instantly without calling the LLM
+async function useTemplate(template) {
+    if (!sessionId) return;
+    
+    document.body.classList.add('prompts-hidden');
+    
+    try {
+        const response = await fetch('/api/method/frappe_ai_form_builder.api.session.apply_template', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Frappe-CSRF-Token': csrfToken
+            },
+            body: JSON.stringify({
+                session_id: sessionId,
+                template: template,
+                known_version: specVersion
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.message) {
+            const result = data.message;
+            addMessage('ai', result.message, applySpecUpdate(result), false);
+            
+            if (result.ready_to_generate) {
+                readyToGenerate = true;
+                document.getElementById('generateBtn').style.display = 'block';
+            }
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        addMessage('ai', '❌ Sorry, failed to load the template. Please try again.');
+    }
+}
+
+function sendCustomPrompt() {
+    const customInput = document.getElementById('customPromptInput');
+    const promptText = customInput.value.trim();
+    
+    if (!promptText) {
+        customInput.focus();
+        return;
+    }
+    
+    // Use the existing usePrompt function
+    usePrompt(promptText);
+    
+    // Clear the custom input
+    customInput.value = '';
+}
+
+function showCustomPrompt() {
+    const customPrompt = prompt('Enter your custom prompt:');
+    if (customPrompt && customPrompt.trim()) {
+        usePrompt(customPrompt.trim());
+    }
+}
+
+function clearChat() {
+    if (confirm('Are you sure you want to clear the chat? This will start a new session.')) {
+        location.reload();
+    }
+}
+
+function createNewForm() {
+    location.reload();
+}
+
+function togglePrompts() {
+    const body = document.body;
+    const btn = document.getElementById('templatesBtn');
+    
+    if (body.classList.contains('prompts-hidden')) {
+        body.classList.remove('prompts-hidden');
+        btn.innerHTML = '<i class="fas fa-layer-group"></i> Templates';
+        btn.title = 'Hide Templates';
+    } else {
+        body.classList.add('prompts-hidden');
+        btn.innerHTML = '<i class="fas fa-layer-group"></i> Show Templates';
+        btn.title = 'Show Templates';
+    }
+}
+
+// Handle rating star interactions
+document.addEventListener('click', function(e) {
+    if (e.target.classList.contains('star')) {
+        const rating = parseInt(e.target.dataset.rating);
+        const stars = e.target.parentElement.querySelectorAll('.star');
+        
+        stars.forEach((star, index) => {
+            if (index < rating) {
+                star.classList.add('active');
+                star.textContent = '★';
+            } else {
+                star.classList.remove('active');
+                star.textContent = '☆';
+            }
+        });
+    }
+});
+
+// Handle rating star hover effects
+document.addEventListener('mouseover', function(e) {
+    if (e.target.classList.contains('star')) {
+        const rating = parseInt(e.target.dataset.rating);
+        const stars = e.target.parentElement.querySelectorAll('.star');
+        
+        stars.forEach((star, index) => {
+            if (index < rating) {
+                star.style.color = '#fbbf24';
+            } else {
+                star.style.color = '#d1d5db';
+            }
+        });
+    }
+});
+
+document.addEventListener('mouseout', function(e) {
+    if (e.target.classList.contains('star')) {
+        const stars = e.target.parentElement.querySelectorAll('.star');
+        stars.forEach(star => {
+            star.style.color = star.classList.contains('active') ? '#fbbf24' : '#d1d5db';
+        });
+    }
+});
+
+// Geolocation helper
+function getCurrentLocation(button) {
+    if (navigator.geolocation) {
+        button.textContent = 'Getting...';
+        button.disabled = true;
+        
+        navigator.geolocation.getCurrentPosition(
+            function(position) {
+                const inputs = button.parentElement.querySelectorAll('input');
+                inputs[0].value = position.coords.latitude.toFixed(6);
+                inputs[1].value = position.coords.longitude.toFixed(6);
+                button.textContent = '📍 Get Location';
+                button.disabled = false;
+            },
+            function(error) {
+                console.error('Geolocation error:', error);
+                button.textContent = '❌ Failed';
+                setTimeout(() => {
+                    button.textContent = '📍 Get Location';
+                    button.disabled = false;
+                }, 2000);
+            }
+        );
+    } else {
+        alert('Geolocation is not supported by this browser.');
+    }
+}
+
+// Table row management
+function addTableRow(button) {
+    const tbody = button.closest('tbody');
+    const columns = tbody.querySelector('tr').querySelectorAll('td').length - 1; // -1 for the remove button column
+    
+    const newRow = document.createElement('tr');
+    for (let i = 0; i < columns; i++) {
+        const cell = document.createElement('td');
+        cell.style.padding = '0.75rem';
+        cell.style.borderBottom = '1px solid #f3f4f6';
+        cell.innerHTML = '<input type="text" style="width: 100%; border: none; outline: none; background: transparent;">';
+        newRow.appendChild(cell);
+    }
+    
+    const actionCell = document.createElement('td');
+    actionCell.style.padding = '0.75rem';
+    actionCell.style.textAlign = 'center';
+    actionCell.innerHTML = '<button type="button" onclick="removeTableRow(this)" style="font-size: 0.75rem; color: #ef4444;">×</button>';
+    newRow.appendChild(actionCell);
+    
+    tbody.appendChild(newRow);
+}
+
+function removeTableRow(button) {
+    const row = button.closest('tr');
+    const tbody = row.closest('tbody');
+    
+    // Don't remove if it's the last row
+    if (tbody.querySelectorAll('tr').length > 1) {
+        row.remove();
+    }
+}
+
+// Signature pad functionality
+function clearSignature(button) {
+    const canvas = button.closest('.form-preview-field').querySelector('canvas');
+    if (canvas) {
+        const ctx = canvas.getContext('2d');
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+    }
+}
+
+// Handle textarea key events (Enter to send, Shift+Enter for new line)
+document.getElementById('userInput').addEventListener('keydown', function(e) {
+    if (e.key === 'Enter') {
+        if (e.shiftKey) {
+            // Shift+Enter: allow new line
+            return;
+        } else {
+            // Enter: send message
+            e.preventDefault();
+            sendMessage();
+        }
+    }
+});
+
+// Handle custom prompt input key events
+document.getElementById('customPromptInput').addEventListener('keydown', function(e) {
+    if (e.key === 'Enter') {
+        if (e.shiftKey) {
+            // Shift+Enter: allow new line
+            return;
+        } else {
+            // Enter: send message
+            e.preventDefault();
+            sendCustomPrompt();
+        }
+    }
+});
+
+function saveConversationSnapshot(spec) {
+    // Save a snapshot of the current conversation state
+    const messages = Array.from(document.querySelectorAll('.message')).map(msg => ({
+        type: msg.classList.contains('ai') ? 'ai' : 'user',
+        content: msg.querySelector('.message-content').innerHTML,
+        hasSpec: !!msg.querySelector('.spec-preview')
+    }));
+    
+    const snapshot = {
+        messages: messages,
+        spec: spec ? JSON.parse(JSON.stringify(spec)) : null, // Deep copy
+        specVersion: specVersion,
+        timestamp: new Date().toISOString()
+    };
+    
+    conversationHistory.push(snapshot);
+    currentHistoryIndex = conversationHistory.length - 1;
+    
+    // Enable rollback button if we have history
+    updateRollbackButton();
+}
+
+function rollbackConversation() {
+    if (currentHistoryIndex <= 0) return;
+    
+    // Move to previous snapshot
+    currentHistoryIndex--;
+    
+    const snapshot = conversationHistory[currentHistoryIndex];
+    
+    // Restore messages
+    const chatContainer = document.getElementById('chatContainer');
+    chatContainer.innerHTML = '';
+    
+    snapshot.messages.forEach(msgData => {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `message ${msgData.type}`;
+        
+        const avatar = document.createElement('div');
+        avatar.className = 'message-avatar';
+        avatar.textContent = msgData.type === 'ai' ? 'AI' : 'You';
+        
+        const messageContent = document.createElement('div');
+        messageContent.className = 'message-content';
+        messageContent.innerHTML = msgData.content;
+        
+        if (msgData.type === 'ai') {
+            // Add rollback button for AI messages
+            const rollbackBtn = document.createElement('button');
+            rollbackBtn.className = 'message-rollback-btn';
+            rollbackBtn.innerHTML = '↶';
+            rollbackBtn.title = 'Rollback to this point';
+            rollbackBtn.onclick = () => rollbackToMessage(messageDiv);
+            messageDiv.appendChild(rollbackBtn);
+            
+            messageDiv.appendChild(avatar);
+            messageDiv.appendChild(messageContent);
+        } else {
+            messageDiv.appendChild(messageContent);
+            messageDiv.appendChild(avatar);
+        }
+        
+        chatContainer.appendChild(messageDiv);
+    });
+    
+    // Restore form preview
+    renderFormPreview(snapshot.spec);
+    specVersion = snapshot.specVersion;
+    
+    // Update rollback button
+    updateRollbackButton();
+    
+    // Show rollback confirmation
+    addMessage('ai', `🔄 **Rolled back to previous state**<br><br>Form specification restored from ${new Date(snapshot.timestamp).toLocaleString()}`);
+}
+
+function updateRollbackButton() {
+    const rollbackBtn = document.getElementById('rollbackBtn');
+    const canRollback = currentHistoryIndex > 0;
+    
+    rollbackBtn.disabled = !canRollback;
+    rollbackBtn.textContent = canRollback ? `↶ Rollback (${currentHistoryIndex})` : '↶ Rollback';
+}
+
+function rollbackToMessage(messageElement) {
+    // Find the index of this message in the conversation history
+    const allMessages = Array.from(document.querySelectorAll('.message'));
+    const messageIndex = allMessages.indexOf(messageElement);
+    
+    if (messageIndex === -1) return;
+    
+    // Find the most recent snapshot that includes this message
+    let targetSnapshotIndex = -1;
+    for (let i = conversationHistory.length - 1; i >= 0; i--) {
+        const snapshot = conversationHistory[i];
+        // Check if this snapshot has at least as many messages as our target
+        if (snapshot.messages.length >= messageIndex + 1) {
+            targetSnapshotIndex = i;
+            break;
+        }
+    }
+    
+    if (targetSnapshotIndex === -1 || targetSnapshotIndex >= conversationHistory.length) return;
+    
+    // Rollback to the found snapshot
+    currentHistoryIndex = targetSnapshotIndex;
+    const snapshot = conversationHistory[currentHistoryIndex];
+    
+    // Restore messages up to this point
+    const chatContainer = document.getElementById('chatContainer');
+    chatContainer.innerHTML = '';
+    
+    snapshot.messages.forEach(msgData => {
+        const messageDiv = document.createElement('div');
+        messageDiv.className = `message ${msgData.type}`;
+        
+        const avatar = document.createElement('div');
+        avatar.className = 'message-avatar';
+        avatar.textContent = msgData.type === 'ai' ? 'AI' : 'You';
+        
+        const messageContent = document.createElement('div');
+        messageContent.className = 'message-content';
+        messageContent.innerHTML = msgData.content;
+        
+        if (msgData.type === 'ai') {
+            // Add rollback button for AI messages
+            const rollbackBtn = document.createElement('button');
+            rollbackBtn.className = 'message-rollback-btn';
+            rollbackBtn.innerHTML = '↶';
+            rollbackBtn.title = 'Rollback to this point';
+            rollbackBtn.onclick = () => rollbackToMessage(messageDiv);
+            messageDiv.appendChild(rollbackBtn);
+            
+            messageDiv.appendChild(avatar);
+            messageDiv.appendChild(messageContent);
+        } else {
+            messageDiv.appendChild(messageContent);
+            messageDiv.appendChild(avatar);
+        }
+        
+        chatContainer.appendChild(messageDiv);
+    });
+    
+    // Restore form preview
+    renderFormPreview(snapshot.spec);
+    specVersion = snapshot.specVersion;
+    
+    // Update rollback button
+    updateRollbackButton();
+    
+    // Show rollback confirmation
+    addMessage('ai', `🔄 **Rolled back to this message**<br><br>Form specification restored from ${new Date(snapshot.timestamp).toLocaleString()}`);
+}
+
+function addMessage(type, content, spec = null, renderPreview = true) {
+    const chatContainer = document.getElementById('chatContainer');
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${type}`;
+    
+    const avatar = document.createElement('div');
+    avatar.className = 'message-avatar';
+    avatar.textContent = type === 'ai' ? 'AI' : 'You';
+    
+    const messageContent = document.createElement('div');
+    messageContent.className = 'message-content';
+    messageContent.innerHTML = content.replace(/\n/g, '<br>');
+    
+    if (spec) {
+        const specPreview = document.createElement('div');
+        specPreview.className = 'spec-preview';
+        specPreview.textContent = JSON.stringify(spec, null, 2);
+        messageContent.appendChild(specPreview);
+        
+        // Update live preview
+        if (renderPreview) {
+            renderFormPreview(spec);
+        }
+    }
+    
+    if (type === 'ai') {
+        // Add rollback button for AI messages
+        const rollbackBtn = document.createElement('button');
+        rollbackBtn.className = 'message-rollback-btn';
+        rollbackBtn.innerHTML = '↶';
+        rollbackBtn.title = 'Rollback to this point';
+        rollbackBtn.onclick = () => rollbackToMessage(messageDiv);
+        messageDiv.appendChild(rollbackBtn);
+        
+        messageDiv.appendChild(avatar);
+        messageDiv.appendChild(messageContent);
+    } else {
+        // Add rollback button for user messages
+        const rollbackBtn = document.createElement('button');
+        rollbackBtn.className = 'message-rollback-btn';
+        rollbackBtn.innerHTML = '↶';
+        rollbackBtn.title = 'Rollback to this point';
+        rollbackBtn.onclick = () => rollbackToMessage(messageDiv);
+        messageDiv.appendChild(rollbackBtn);
+        
+        messageDiv.appendChild(messageContent);
+        messageDiv.appendChild(avatar);
+    }
+    
+    chatContainer.appendChild(messageDiv);
+    chatContainer.scrollTop = chatContainer.scrollHeight;
+    
+    // Save snapshot after each message
+    saveConversationSnapshot(currentSpec);
+}
+
+function renderFormPreview(spec) {
+    currentSpec = spec;
+    const previewContainer = document.getElementById('formPreview');
+    
+    if (!spec || !spec.fields || spec.fields.length === 0) {
+        previewContainer.innerHTML = `
+            <div class="preview-empty">
+                <div class="preview-icon">📝</div>
+                <p>Your form preview will appear here as you chat with the AI.</p>
+                <p>Start describing your form to see it take shape!</p>
+            </div>
+        `;
+        return;
+    }
+    
+    let html = `<div class="form-preview-header">${renderPreviewHeader(spec)}</div><div class="form-preview-fields">`;
+    
+    spec.fields.forEach((field, index) => {
+        html += renderFieldPreview(field, previewFieldKey(field, index));
+    });
+    
+    previewContainer.innerHTML = html + '</div>';
+}
+
+function renderPreviewHeader(spec) {
+    let formTitle = spec.doctype_name || spec.name || 'Untitled Form';
+    
+    return `
+        <div style="margin-bottom: 2rem;">
+            <h3 style="margin: 0 0 0.5rem 0; color: #111827; font-size: 1.25rem; font-weight: 600;">
+                ${formTitle}
+            </h3>
+            ${spec.description ? `<p style="margin: 0; color: #6b7280; font-size: 0.875rem;">${spec.description}</p>` : ''}
+        </div>
+    `;
+}
+
+// Same keys as spec_diff.keyed_fields on the server
+function previewFieldKey(field, index) {
+    return field.fieldname || `#${index}`;
+}
+
+// Bring the preview up to date from a response carrying spec_diff or draft_spec.
+// Returns the resulting spec, or null when the response has none.
+function applySpecUpdate(result) {
+    if (result.spec_diff && currentSpec && result.base_version === specVersion) {
+        const spec = applySpecDiff(currentSpec, result.spec_diff);
+        patchFormPreview(spec, result.spec_diff);
+        specVersion = result.spec_version;
+        return spec;
+    }
+    
+    if (result.draft_spec) {
+        renderFormPreview(result.draft_spec);
+        specVersion = result.spec_version;
+        return result.draft_spec;
+    }
+    
+    // A diff we cannot apply: the next response will carry the full spec
+    if (result.spec_diff) {
+        specVersion = null;
+    }
+    return null;
+}
+
+function applySpecDiff(spec, diff) {
+    const next = {};
+    Object.keys(spec).forEach(key => {
+        if (key !== 'fields' && !(diff.removed_props || []).includes(key)) {
+            next[key] = spec[key];
+        }
+    });
+    Object.assign(next, diff.props || {});
+    
+    const fields = {};
+    (spec.fields || []).forEach((field, index) => {
+        fields[previewFieldKey(field, index)] = field;
+    });
+    (diff.removed || []).forEach(key => delete fields[key]);
+    Object.assign(fields, diff.added || {}, diff.changed || {});
+    
+    const order = diff.order || Object.keys(fields);
+    next.fields = order.map(key => fields[key]);
+    return next;
+}
+
+// Update only the preview nodes a diff touches instead of rebuilding the form
+function patchFormPreview(spec, diff) {
+    const fieldsContainer = document.querySelector('#formPreview .form-preview-fields');
+    if (!fieldsContainer || !spec.fields || spec.fields.length === 0) {
+        renderFormPreview(spec);
+        return;
+    }
+    currentSpec = spec;
+    
+    if (diff.props || diff.removed_props) {
+        document.querySelector('#formPreview .form-preview-header').innerHTML = renderPreviewHeader(spec);
+    }
+    
+    const nodes = {};
+    fieldsContainer.querySelectorAll(':scope > [data-field-key]').forEach(node => {
+        nodes[node.dataset.fieldKey] = node;
+    });
+    
+    (diff.removed || []).forEach(key => {
+        if (nodes[key]) {
+            nodes[key].remove();
+            delete nodes[key];
+        }
+    });
+    
+    const updated = Object.assign({}, diff.added || {}, diff.changed || {});
+    Object.keys(updated).forEach(key => {
+        const template = document.createElement('template');
+        template.innerHTML = renderFieldPreview(updated[key], key).trim();
+        const node = template.content.firstElementChild;
+        if (nodes[key]) {
+            nodes[key].replaceWith(node);
+        } else {
+            fieldsContainer.appendChild(node);
+        }
+        nodes[key] = node;
+    });
+    
+    // Re-appending moves existing nodes into place without re-rendering them
+    if (diff.order) {
+        diff.order.forEach(key => {
+            if (nodes[key]) {
+                fieldsContainer.appendChild(nodes[key]);
+            }
+        });
+    }
+}
+
+function renderFieldPreview(field, key) {
+    const fieldType = field.fieldtype || 'Data';
+    const label = field.label || field.fieldname || 'Untitled Field';
+    const required = field.mandatory ? 'required' : '';
+    const placeholder = field.placeholder || `Enter ${label.toLowerCase()}`;
+    const options = field.options || '';
+    
+    let inputHtml = '';
+    
+    switch (fieldType.toLowerCase()) {
+        case 'data':
+        case 'text':
+            inputHtml = `<input type="text" class="field-input" placeholder="${placeholder}" ${required}>`;
+            break;
+            
+        case 'email':
+            inputHtml = `<input type="email" class="field-input" placeholder="${placeholder || 'Enter email address'}" ${required}>`;
+            break;
+            
+        case 'phone':
+        case 'phone number':
+            inputHtml = `<input type="tel" class="field-input" placeholder="${placeholder || 'Enter phone number'}" ${required}>`;
+            break;
+            
+        case 'url':
+            inputHtml = `<input type="url" class="field-input" placeholder="${placeholder || 'Enter URL'}" ${required}>`;
+            break;
+            
+        case 'password':
+            inputHtml = `<input type="password" class="field-input" placeholder="${placeholder || 'Enter password'}" ${required}>`;
+            break;
+            
+        case 'int':
+        case 'float':
+        case 'currency':
+            inputHtml = `<input type="number" class="field-input" placeholder="${placeholder}" ${required}>`;
+            break;
+            
+        case 'rating':
+        case 'rate':
+            const maxRating = field.options ? parseInt(field.options) : 5;
+            const stars = Array.from({length: maxRating}, (_, i) => 
+                `<span class="star" data-rating="${i + 1}" style="cursor: pointer; font-size: 1.5rem; color: #d1d5db;">☆</span>`
+            ).join('');
+            inputHtml = `<div class="rating-stars" style="display: flex; gap: 0.25rem;">${stars}</div>`;
+            break;
+            
+        case 'radio':
+            const radioOptions = options.split('\n').map((opt, index) => 
+                `<label style="display: flex; align-items: center; gap: 0.5rem; margin-bottom: 0.5rem; cursor: pointer;">
+                    <input type="radio" name="${field.fieldname || 'radio_' + index}" value="${opt.trim()}" ${required}>
+                    <span style="font-size: 0.875rem; color: #374151;">${opt.trim()}</span>
+                </label>`
+            ).join('');
+            inputHtml = `<div style="display: flex; flex-direction: column;">${radioOptions}</div>`;
+            break;
+            
+        case 'date':
+            inputHtml = `<input type="date" class="field-input" ${required}>`;
+            break;
+            
+        case 'datetime':
+            inputHtml = `<input type="datetime-local" class="field-input" ${required}>`;
+            break;
+            
+        case 'time':
+            inputHtml = `<input type="time" class="field-input" ${required}>`;
+            break;
+            
+        case 'textarea':
+        case 'long text':
+        case 'text editor':
+            inputHtml = `<textarea class="field-input field-textarea" placeholder="${placeholder}" ${required}></textarea>`;
+            break;
+            
+        case 'select':
+        case 'dropdown':
+            const optionList = options.split('\n').map(opt => 
+                `<option value="${opt.trim()}">${opt.trim()}</option>`
+            ).join('');
+            inputHtml = `<select class="field-input field-select" ${required}>
+                <option value="">Select ${label.toLowerCase()}</option>
+                ${optionList}
+            </select>`;
+            break;
+            
+        case 'multiselect':
+        case 'multiple select':
+            const multiOptions = options.split('\n').map(opt => 
+                `<option value="${opt.trim()}">${opt.trim()}</option>`
+            ).join('');
+            inputHtml = `<select class="field-input field-select" multiple style="min-height: 100px;" ${required}>
+                ${multiOptions}
+            </select>`;
+            break;
+            
+        case 'check':
+        case 'checkbox':
+            inputHtml = `<label style="display: flex; align-items: center; gap: 0.5rem; cursor: pointer;">
+                <input type="checkbox" ${required}>
+                <span style="font-size: 0.875rem; color: #374151;">${label}</span>
+            </label>`;
+            break;
+            
+        case 'link':
+            inputHtml = `<input type="text" class="field-input" placeholder="Search ${options || 'records'}..." ${required}>`;
+            break;
+            
+        case 'attach':
+        case 'attach image':
+        case 'attachment':
+            inputHtml = `<input type="file" class="field-input" ${required}>`;
+            break;
+            
+        case 'color':
+            inputHtml = `<input type="color" class="field-input" ${required}>`;
+            break;
+            
+        case 'percentage':
+        case 'percent':
+            inputHtml = `<div style="display: flex; align-items: center;">
+                <input type="number" class="field-input" placeholder="${placeholder}" min="0" max="100" ${required} style="flex: 1;">
+                <span style="margin-left: 0.5rem; color: #6b7280; font-weight: 500;">%</span>
+            </div>`;
+            break;
+            
+        case 'currency amount':
+        case 'money':
+            const currencySymbol = field.currency || '$';
+            inputHtml = `<div style="display: flex; align-items: center;">
+                <span style="margin-right: 0.5rem; color: #6b7280; font-weight: 500;">${currencySymbol}</span>
+                <input type="number" class="field-input" placeholder="${placeholder}" step="0.01" ${required} style="flex: 1;">
+            </div>`;
+            break;
+            
+        case 'duration':
+        case 'time span':
+            inputHtml = `<div style="display: flex; gap: 0.5rem; align-items: center;">
+                <input type="number" class="field-input" placeholder="Hours" min="0" style="flex: 1;" ${required}>
+                <span style="color: #6b7280; font-size: 0.875rem;">hrs</span>
+                <input type="number" class="field-input" placeholder="Minutes" min="0" max="59" style="flex: 1;" ${required}>
+                <span style="color: #6b7280; font-size: 0.875rem;">mins</span>
+            </div>`;
+            break;
+            
+        case 'date range':
+            inputHtml = `<div style="display: flex; gap: 0.5rem; align-items: center;">
+                <input type="date" class="field-input" placeholder="Start date" ${required} style="flex: 1;">
+                <span style="color: #6b7280; font-size: 0.875rem;">to</span>
+                <input type="date" class="field-input" placeholder="End date" ${required} style="flex: 1;">
+            </div>`;
+            break;
+            
+        case 'address':
+        case 'location':
+            inputHtml = `<div style="display: flex; flex-direction: column; gap: 0.5rem;">
+                <input type="text" class="field-input" placeholder="Street Address" ${required}>
+                <div style="display: flex; gap: 0.5rem;">
+                    <input type="text" class="field-input" placeholder="City" style="flex: 1;" ${required}>
+                    <input type="text" class="field-input" placeholder="State/Province" style="flex: 1;" ${required}>
+                    <input type="text" class="field-input" placeholder="ZIP/Postal Code" style="flex: 1;" ${required}>
+                </div>
+                <select class="field-input field-select" ${required}>
+                    <option value="">Select Country</option>
+                    <option value="US">United States</option>
+                    <option value="CA">Canada</option>
+                    <option value="UK">United Kingdom</option>
+                    <option value="AU">Australia</option>
+                    <option value="DE">Germany</option>
+                    <option value="FR">France</option>
+                    <option value="JP">Japan</option>
+                    <option value="IN">India</option>
+                </select>
+            </div>`;
+            break;
+            
+        case 'geolocation':
+        case 'coordinates':
+            inputHtml = `<div style="display: flex; gap: 0.5rem; align-items: center;">
+                <input type="number" class="field-input" placeholder="Latitude" step="0.000001" ${required} style="flex: 1;">
+                <input type="number" class="field-input" placeholder="Longitude" step="0.000001" ${required} style="flex: 1;">
+                <button type="button" class="btn btn-primary" style="padding: 0.5rem 1rem; font-size: 0.75rem;" onclick="getCurrentLocation(this)">📍 Get Location</button>
+            </div>`;
+            break;
+            
+        case 'signature':
+            inputHtml = `<div style="border: 2px dashed #d1d5db; border-radius: 8px; padding: 2rem; text-align: center; background: #f9fafb;">
+                <div style="font-size: 2rem; margin-bottom: 0.5rem;">✍️</div>
+                <p style="margin: 0; color: #6b7280; font-size: 0.875rem;">Click to sign digitally</p>
+                <canvas id="signature-pad" width="300" height="150" style="border: 1px solid #e5e7eb; border-radius: 4px; margin-top: 1rem; display: none;"></canvas>
+                <div style="margin-top: 0.5rem;">
+                    <button type="button" class="btn btn-primary" style="font-size: 0.75rem; padding: 0.25rem 0.75rem;" onclick="clearSignature(this)">Clear</button>
+                </div>
+            </div>`;
+            break;
+            
+        case 'json':
+        case 'code':
+            inputHtml = `<textarea class="field-input field-textarea" placeholder='{"key": "value"}' style="font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace; font-size: 0.8rem;" ${required}></textarea>`;
+            break;
+            
+        case 'markdown':
+        case 'rich text':
+            inputHtml = `<div style="border: 1px solid #d1d5db; border-radius: 6px; padding: 0.75rem; background: white; min-height: 120px;" contenteditable="true" placeholder="${placeholder}" ${required ? 'required' : ''}></div>`;
+            break;
+            
+        case 'table':
+        case 'grid':
+            const columns = options ? options.split(',').map(col => col.trim()) : ['Column 1', 'Column 2', 'Column 3'];
+            const tableHtml = `
+                <div style="border: 1px solid #d1d5db; border-radius: 6px; overflow: hidden;">
+                    <table style="width: 100%; border-collapse: collapse;">
+                        <thead>
+                            <tr style="background: #f9fafb;">
+                                ${columns.map(col => `<th style="padding: 0.75rem; text-align: left; border-bottom: 1px solid #e5e7eb; font-weight: 600; color: #374151;">${col}</th>`).join('')}
+                                <th style="padding: 0.75rem; width: 50px;"><button type="button" onclick="addTableRow(this)" style="font-size: 0.75rem; padding: 0.25rem;">+</button></th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                            <tr>
+                                ${columns.map(() => `<td style="padding: 0.75rem; border-bottom: 1px solid #f3f4f6;"><input type="text" style="width: 100%; border: none; outline: none; background: transparent;"></td>`).join('')}
+                                <td style="padding: 0.75rem; text-align: center;"><button type="button" onclick="removeTableRow(this)" style="font-size: 0.75rem; color: #ef4444;">×</button></td>
+                            </tr>
+                        </tbody>
+                    </table>
+                </div>
+            `;
+            inputHtml = tableHtml;
+            break;
+            
+        case 'timezone':
+            inputHtml = `<select class="field-input field-select" ${required}>
+                <option value="">Select Timezone</option>
+                <option value="UTC">UTC</option>
+                <option value="America/New_York">Eastern Time</option>
+                <option value="America/Chicago">Central Time</option>
+                <option value="America/Denver">Mountain Time</option>
+                <option value="America/Los_Angeles">Pacific Time</option>
+                <option value="Europe/London">London</option>
+                <option value="Europe/Paris">Paris</option>
+                <option value="Asia/Tokyo">Tokyo</option>
+                <option value="Asia/Shanghai">Shanghai</option>
+                <option value="Australia/Sydney">Sydney</option>
+            </select>`;
+            break;
+            
+        case 'language':
+            inputHtml = `<select class="field-input field-select" ${required}>
+                <option value="">Select Language</option>
+                <option value="en">English</option>
+                <option value="es">Spanish</option>
+                <option value="fr">French</option>
+                <option value="de">German</option>
+                <option value="it">Italian</option>
+                <option value="pt">Portuguese</option>
+                <option value="ru">Russian</option>
+                <option value="ja">Japanese</option>
+                <option value="ko">Korean</option>
+                <option value="zh">Chinese</option>
+                <option value="ar">Arabic</option>
+                <option value="hi">Hindi</option>
+            </select>`;
+            break;
+            
+        default:
+            inputHtml = `<input type="text" class="field-input" placeholder="${placeholder}" ${required}>`;
+    }
+    
+    return `
+        <div class="form-preview-field ${required ? 'required' : ''}" data-field-key="${key}">
+            ${['check', 'checkbox', 'radio', 'address', 'location', 'geolocation', 'coordinates', 'signature', 'table', 'grid'].includes(fieldType.toLowerCase()) ? '' : `<label class="field-label">${label}</label>`}
+            ${inputHtml}
+            ${field.description ? `<small style="color: #6b7280; font-size: 0.75rem; margin-top: 0.5rem; display: block;">${field.description}</small>` : ''}
+        </div>
+    `;
+}
+
+async function sendMessage() {
+    const input = document.getElementById('userInput');
+    const message = input.value.trim();
+    
+    if (!message || !sessionId) return;
+    
+    // Hide prompts section on first message
+    document.body.classList.add('prompts-hidden');
+    
+    // Add user message
+    addMessage('user', message);
+    input.value = '';
+    
+    // Show loading
+    document.getElementById('loading').style.display = 'block';
+    document.getElementById('sendBtn').disabled = true;
+    
+    try {
+        const response = await fetch('/api/method/frappe_ai_form_builder.api.session.send_message', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Frappe-CSRF-Token': csrfToken
+            },
+            body: JSON.stringify({
+                session_id: sessionId,
+                message: message,
+                known_version: specVersion
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.message) {
+            const result = data.message;
+            addMessage('ai', result.message, applySpecUpdate(result), false);
+            
+            if (result.ready_to_generate) {
+                readyToGenerate = true;
+                document.getElementById('generateBtn').style.display = 'block';
+            }
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        addMessage('ai', '❌ Sorry, something went wrong. Please try again.');
+    } finally {
+        document.getElementById('loading').style.display = 'none';
+        document.getElementById('sendBtn').disabled = false;
+    }
+}
+
+async function generateDocType() {
+    if (!readyToGenerate || !sessionId) return;
+    
+    document.getElementById('generateBtn').disabled = true;
+    document.getElementById('generateBtn').textContent = 'Creating...';
+    
+    try {
+        const response = await fetch('/api/method/frappe_ai_form_builder.api.generator.generate_doctype', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'X-Frappe-CSRF-Token': csrfToken
+            },
+            body: JSON.stringify({
+                session_id: sessionId,
+                publish: false
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.message) {
+            const result = data.message;
+            const successMsg = `
+                <div class="success-message">
+                    <strong>✅ Form Created Successfully!</strong><br><br>
+                    <strong>Name:</strong> ${result.doctype_name}<br>
+                    <strong>Module:</strong> ${result.module}<br>
+                    <strong>Status:</strong> ${result.status}<br><br>
+                    <em style="color: #6b7280;">Your form has been submitted for admin approval. Once approved, it will be available for use.</em><br><br>
+                    <button class="btn btn-primary" onclick="createNewForm()" style="margin-top: 1rem;">
+                        <i class="fas fa-plus"></i> Create New Form
+                    </button>
+                </div>
+            `;
+            addMessage('ai', successMsg);
+            document.getElementById('generateBtn').style.display = 'none';
+            
+            // Clear the preview after successful creation
+            renderFormPreview(null);
+            specVersion = null;
+        }
+    } catch (error) {
+        console.error('Error:', error);
+        addMessage('ai', '❌ Failed to create form. Please try again.');
+    } finally {
+        document.getElementById('generateBtn').disabled = false;
+        document.getElementById('generateBtn').textContent = '✨ Create Form';
+    }
+}
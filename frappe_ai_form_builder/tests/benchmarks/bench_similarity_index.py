@@ -0,0 +1,40 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+"""
+Time similarity queries against a synthetic index of approved artifacts.
+
+Run with: bench execute frappe_ai_form_builder.tests.benchmarks.bench_similarity_index.run
+"""
+
+import time
+
+import numpy as np
+
+from frappe_ai_form_builder.api.similarity_index import SimilarityIndex
+
+# Per-query latency the lookup has to stay under at 10k artifacts
+TARGET_MS = 10
+
+
+def run(artifact_count=10000, queries=200):
+	rng = np.random.default_rng(0)
+	words = [f"word{i}" for i in range(5000)]
+	fieldtypes = ["Data", "Date", "Select", "Check", "Int", "Rating", "Attach"]
+
+	index = SimilarityIndex()
+	for i in range(artifact_count):
+		picks = rng.choice(len(words), size=25)
+		text = " ".join(words[p] for p in picks) + " " + " ".join(rng.choice(fieldtypes, size=10))
+		index.add(f"ART-{i}", text)
+
+	index.query("warm up")
+	query_texts = [" ".join(words[p] for p in rng.choice(len(words), size=12)) for _i in range(queries)]
+
+	start = time.perf_counter()
+	for text in query_texts:
+		index.query(text)
+	per_query_ms = (time.perf_counter() - start) * 1000 / queries
+
+	print(f"{artifact_count} artifacts: {per_query_ms:.2f} ms per query (target {TARGET_MS} ms)")
+	return per_query_ms
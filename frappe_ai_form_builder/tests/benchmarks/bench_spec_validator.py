@@ -0,0 +1,32 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+"""
+Time validation of a large generated spec.
+
+Run with: bench execute frappe_ai_form_builder.tests.benchmarks.bench_spec_validator.run
+"""
+
+import time
+
+from frappe_ai_form_builder.api.spec_validator import SpecValidator
+
+
+def run(field_count=1000, iterations=20):
+	fieldtypes = ["Data", "Int", "Date", "Select", "Check", "Small Text", "Rating", "Section Break"]
+	spec = {
+		"doctype_name": "Benchmark Form",
+		"fields": [
+			{"fieldname": f"field_{i}", "label": f"Field {i}", "fieldtype": fieldtypes[i % len(fieldtypes)]}
+			for i in range(field_count)
+		]
+	}
+	validator = SpecValidator()
+
+	start = time.perf_counter()
+	for _i in range(iterations):
+		validator.validate(spec)
+	per_call_ms = (time.perf_counter() - start) * 1000 / iterations
+
+	print(f"{field_count} fields: {per_call_ms:.2f} ms per validation")
+	return per_call_ms
@@ -0,0 +1,73 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+"""
+Time the submission tracker's hot paths.
+
+Run with:
+	bench execute frappe_ai_form_builder.tests.benchmarks.bench_submission_tracker.run_hook
+	bench execute frappe_ai_form_builder.tests.benchmarks.bench_submission_tracker.run_extractor
+"""
+
+import json
+import time
+
+import frappe
+
+from frappe_ai_form_builder.api.submission_tracker import (
+	compile_field_extractor, extract_submission_data, track_submission
+)
+
+
+def run_hook(inserts=100000):
+	"""Time the after_insert hook for inserts of DocTypes without a Web Form."""
+	doc = frappe._dict(doctype="ToDo")
+	results = {}
+
+	for in_web_form in (False, True):
+		frappe.flags.in_web_form = in_web_form
+		track_submission(doc, "after_insert")
+
+		start = time.perf_counter()
+		for _i in range(inserts):
+			track_submission(doc, "after_insert")
+		results["web_form_request" if in_web_form else "regular_request"] = (time.perf_counter() - start) * 1e6 / inserts
+
+	frappe.flags.in_web_form = False
+	for label, per_insert_us in results.items():
+		print(f"{label}: {per_insert_us:.3f} us per unrelated insert")
+	return results
+
+
+def run_extractor(field_count=100, submissions=20000):
+	"""Compare the compiled extractor with per-submission meta iteration."""
+	fieldtypes = ["Data", "Int", "Float", "Date", "Check", "Select", "Small Text", "Section Break", "Column Break"]
+	fields = [
+		frappe._dict(fieldname=f"field_{i}", fieldtype=fieldtypes[i % len(fieldtypes)])
+		for i in range(field_count)
+	]
+	sample_values = {"Data": "Jane Doe", "Int": 42, "Float": 3.5, "Date": "2025-01-31", "Check": 1,
+		"Select": "Option A", "Small Text": "Some longer comment text"}
+	doc = frappe._dict({f.fieldname: sample_values.get(f.fieldtype) for f in fields})
+
+	def legacy():
+		data = {}
+		for field in fields:
+			if field.fieldname and field.fieldname != 'name':
+				value = doc.get(field.fieldname)
+				if value is not None:
+					data[field.fieldname] = str(value)
+		return json.dumps(data, indent=2)
+
+	extractor = compile_field_extractor(fields)
+	results = {}
+	for label, run in (("legacy", legacy), ("compiled", lambda: extract_submission_data(doc, extractor))):
+		start = time.perf_counter()
+		for _i in range(submissions):
+			payload = run()
+		results[label] = {
+			"us_per_submission": (time.perf_counter() - start) * 1e6 / submissions,
+			"bytes": len(payload.encode())
+		}
+		print(f"{label}: {results[label]['us_per_submission']:.1f} us, {results[label]['bytes']} bytes")
+	return results
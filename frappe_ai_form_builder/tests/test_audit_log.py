@@ -0,0 +1,60 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+from unittest.mock import MagicMock, patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from frappe_ai_form_builder.api import audit_log
+
+
+class UnitTestAuditLog(UnitTestCase):
+	def setUp(self):
+		self.db = MagicMock()
+		for patcher in (
+			patch.object(frappe, "db", self.db),
+			patch.object(audit_log, "write_audit_rows")
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+		self.addCleanup(self.reset_local)
+
+	def reset_local(self):
+		frappe.local.request = None
+		frappe.local.ai_audit_events = None
+		frappe.local.ai_audit_committed = None
+
+	def record(self, action, artifact_id="ART-1"):
+		audit_log.record_audit_event(action, artifact_id, artifact_name="Test Form", actor="Administrator")
+
+	def commit(self):
+		self.db.before_commit.add.call_args[0][0]()
+
+	def test_request_writes_committed_events_once(self):
+		frappe.local.request = object()
+		self.record("approved")
+		self.record("approved")
+		self.commit()
+		self.record("generate", "ART-2")
+		self.commit()
+		audit_log.write_audit_rows.assert_not_called()
+
+		audit_log.flush_request_audit_events()
+		rows = audit_log.write_audit_rows.call_args[0][0]
+		self.assertEqual([(row["artifact_id"], row["action"]) for row in rows], [("ART-1", "approved"), ("ART-2", "generate")])
+		self.db.commit.assert_called_once()
+
+	def test_rolled_back_events_are_not_written(self):
+		frappe.local.request = object()
+		self.record("approved")
+		self.db.after_rollback.add.call_args[0][0]()
+
+		audit_log.flush_request_audit_events()
+		audit_log.write_audit_rows.assert_not_called()
+		self.db.commit.assert_not_called()
+
+	def test_jobs_write_before_each_commit(self):
+		self.record("rollback")
+		self.commit()
+		audit_log.write_audit_rows.assert_called_once()
@@ -0,0 +1,30 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+from frappe.tests import UnitTestCase
+
+from frappe_ai_form_builder.api import spec_validator
+from frappe_ai_form_builder.api.form_templates import FORM_TEMPLATES, render_template
+from frappe_ai_form_builder.tests.utils import make_default_validator
+
+
+class UnitTestFormTemplates(UnitTestCase):
+	def setUp(self):
+		self.validator = make_default_validator()
+		patcher = patch.object(spec_validator, "get_spec_validator", return_value=self.validator)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_every_template_validates_with_default_config(self):
+		for template in FORM_TEMPLATES:
+			with self.subTest(template=template):
+				spec = render_template(template)
+				self.assertEqual(self.validator.validate(spec), [])
+
+	def test_parameters_are_applied(self):
+		spec = render_template("support_ticket", {"doctype_name": "Helpdesk Ticket", "is_web_accessible": False})
+		self.assertEqual(spec["doctype_name"], "Helpdesk Ticket")
+		self.assertFalse(spec["is_web_accessible"])
+		self.assertEqual(spec["naming_rule"], "Autoincrement")
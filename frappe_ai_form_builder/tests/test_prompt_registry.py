@@ -0,0 +1,58 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from frappe_ai_form_builder.api import prompt_registry, spec_validator
+from frappe_ai_form_builder.api.spec_validator import SpecValidator
+from frappe_ai_form_builder.tests.utils import get_shipped_config_default, make_default_validator
+
+
+class UnitTestPromptRegistry(UnitTestCase):
+	def setUp(self):
+		self.config = {}
+		for patcher in (
+			patch.object(frappe.db, "get_singles_dict", side_effect=lambda doctype: self.config),
+			patch.object(spec_validator, "get_spec_validator", return_value=make_default_validator())
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def test_field_types_follow_allowed_fieldtypes(self):
+		prompt = prompt_registry.compile_prompt("openai", "generating")
+		self.assertIn("- Data: Short text", prompt.text)
+		self.assertIn("- Section Break / Column Break: Layout separators", prompt.text)
+		# Not in the shipped allow-list; Email is still accepted as an alias of Data
+		self.assertNotIn("Rating", prompt.text.split("Specification Rules")[0])
+		self.assertIn("- Email: Contact details", prompt.text)
+
+		with patch.object(spec_validator, "get_spec_validator", return_value=SpecValidator()):
+			everything = prompt_registry.compile_prompt("openai", "generating")
+		self.assertIn("- Rating: Star rating", everything.text)
+		self.assertNotEqual(prompt.version, everything.version)
+
+	def test_json_format_has_no_unused_keys(self):
+		prompt = prompt_registry.compile_prompt("openai", "generating")
+		self.assertNotIn('"autoname"', prompt.text)
+
+	def test_over_budget_prompt_is_still_compiled(self):
+		self.config = {"system_prompt": "Always be polite. " * 50, "prompt_token_budget": 100}
+		examples = [{"id": "EX-1", "text": "Example form"}]
+		prompt = prompt_registry.compile_prompt("gemini", "clarifying", examples=examples)
+		self.assertIn("Always be polite.", prompt.text)
+		self.assertNotIn("Example form", prompt.text)
+		self.assertGreater(prompt.tokens, 100)
+
+	def test_config_budget_is_validated(self):
+		config = {
+			"system_prompt": "Always be polite. " * 50,
+			"prompt_token_budget": get_shipped_config_default("prompt_token_budget"),
+			"allowed_fieldtypes": get_shipped_config_default("allowed_fieldtypes")
+		}
+		prompt_registry.validate_prompt_budget(config)
+
+		config["system_prompt"] = "Always be polite. " * 2000
+		self.assertRaises(frappe.ValidationError, prompt_registry.validate_prompt_budget, config)
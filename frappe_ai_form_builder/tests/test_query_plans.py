@@ -0,0 +1,79 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from frappe_ai_form_builder.api import (
+	audit_log, generator, public_directory, review_queue, similarity_index, submission_export,
+	submission_stats, submission_tracker
+)
+from frappe_ai_form_builder.api.submission_archive import HOT_TABLE
+
+# Tables read in full by design: the public directory lists every public form
+# and is served from cache, so its driving table has nothing to filter on
+FULL_SCAN_TABLES = ("tabPublic Forms",)
+
+
+class IntegrationTestQueryPlans(IntegrationTestCase):
+	"""
+	Run the app's read paths, capture the SELECTs they issue and EXPLAIN each
+	one, failing when a table in the plan is read without an index.
+	"""
+
+	def setUp(self):
+		if frappe.db.db_type != "mariadb":
+			self.skipTest("Query plan checks read MariaDB EXPLAIN output")
+
+	def test_api_queries_use_indexes(self):
+		with capture_selects() as queries:
+			generator.get_approved_artifacts()
+			generator.get_revision_target(frappe._dict(name="ART-0", session_id="CONV-0", artifact_name="Test Form"))
+			review_queue.invalidate_review_queue()
+			review_queue.get_review_queue("draft", "DocType")
+			review_queue._load_page("draft", None, "2026-01-01T00:00:00|ART-0", 50)
+			review_queue.get_review_counts()
+
+			index = similarity_index.SimilarityIndex()
+			index.last_synced = frappe.utils.add_days(frappe.utils.now_datetime(), -1)
+			similarity_index._sync(index)
+
+			submission_tracker.query_submissions("ToDo", {"description": "x"})
+			submission_tracker.count_submissions("ToDo", {"description": "x"})
+			filters = submission_export._build_filters("ToDo", "2026-01-01", None)
+			next(submission_export._iter_batches(HOT_TABLE, filters), None)
+
+			submission_stats.get_total_submission_count("test-form")
+			submission_stats.get_daily_stats("test-form", "2026-01-01", "2026-01-31")
+
+			audit_log.get_audit_summary("2026-01-01", "2026-01-31", action="approved")
+
+			public_directory.build_directory_payload()
+
+		self.assertTrue(queries)
+		for query in queries:
+			for row in frappe.db.sql(f"EXPLAIN {query}", as_dict=True):
+				if not row.table or row.table.startswith("<") or row.table in FULL_SCAN_TABLES:
+					continue
+				self.assertTrue(row.key, f"No index used for {row.table} in:\n{query}")
+				self.assertNotEqual(row.type, "ALL", f"Full scan of {row.table} in:\n{query}")
+
+
+@contextmanager
+def capture_selects():
+	"""Record every SELECT sent through frappe.db.sql, with values interpolated."""
+	queries = []
+	run_sql = frappe.db.sql
+
+	def recording_sql(query, values=(), *args, **kwargs):
+		query_text = str(query)
+		# Unions of parenthesized SELECTs count too
+		if query_text.lstrip(" \t\n(").upper().startswith("SELECT"):
+			queries.append(frappe.db.mogrify(query_text, values) if values else query_text)
+		return run_sql(query, values, *args, **kwargs)
+
+	with patch.object(frappe.db, "sql", recording_sql):
+		yield queries
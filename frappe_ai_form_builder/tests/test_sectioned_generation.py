@@ -0,0 +1,85 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+import json
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import UnitTestCase
+
+from frappe_ai_form_builder.api import llm_adapter, sectioned_generation, spec_validator
+from frappe_ai_form_builder.tests.utils import make_default_validator
+
+PLAN = {
+	"doctype_name": "Site Inspection",
+	"module": "Website",
+	"is_web_accessible": True,
+	"title_field": "site_name",
+	"sections": [
+		{"title": "Site", "fields": ["Site Name", "Inspection Date", "Contact Email"]},
+		{"title": "Safety", "fields": ["Fire Exits Clear", "Extinguisher Count", "Contact Email"]}
+	]
+}
+
+SECTION_FIELDS = {
+	"Site": [
+		{"fieldname": "site_name", "label": "Site Name", "fieldtype": "Data", "mandatory": True},
+		{"fieldname": "inspection_date", "label": "Inspection Date", "fieldtype": "Date"},
+		{"fieldname": "contact_email", "label": "Contact Email", "fieldtype": "Email"}
+	],
+	"Safety": [
+		{"fieldtype": "Section Break", "label": "Ignored"},
+		{"fieldname": "fire_exits_clear", "label": "Fire Exits Clear", "fieldtype": "Check"},
+		{"fieldname": "extinguisher_count", "label": "Extinguisher Count", "fieldtype": "Int"},
+		{"fieldname": "contact_email", "label": "Contact Email", "fieldtype": "Email"}
+	]
+}
+
+
+def fake_complete_chat(provider, api_key, model_name, system_prompt, messages, max_tokens):
+	if sectioned_generation.PLAN_INSTRUCTIONS in system_prompt:
+		return f"```json\n{json.dumps(PLAN)}\n```", False
+
+	prompt = messages[-1]["content"]
+	title = next(title for title in SECTION_FIELDS if f"Section: {title}\n" in prompt)
+	return f"```json\n{json.dumps(SECTION_FIELDS[title])}\n```", False
+
+
+class UnitTestSectionedGeneration(UnitTestCase):
+	def setUp(self):
+		self.validator = make_default_validator()
+		for target, attribute, value in (
+			(spec_validator, "get_spec_validator", self.validator),
+			(sectioned_generation, "get_section_config", {"enabled": 1, "threshold": 40, "workers": 2}),
+			(llm_adapter, "get_api_key", "test-key")
+		):
+			patcher = patch.object(target, attribute, return_value=value)
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def test_merged_spec_validates(self):
+		route = frappe._dict(provider="openai", model="test-model")
+		with patch.object(llm_adapter, "complete_chat", side_effect=fake_complete_chat):
+			response = sectioned_generation.generate_in_sections(
+				route, [], "A site inspection form with 2 sections", "System prompt", 2000
+			)
+
+		spec = response["draft_spec"]
+		self.assertTrue(response["ready_to_generate"])
+		self.assertEqual(self.validator.validate(spec), [])
+		self.assertEqual(
+			[(f["fieldtype"], f.get("fieldname")) for f in spec["fields"]],
+			[
+				("Section Break", None), ("Data", "site_name"), ("Date", "inspection_date"),
+				("Email", "contact_email"),
+				("Section Break", None), ("Check", "fire_exits_clear"), ("Int", "extinguisher_count"),
+				("Email", "contact_email_2")
+			]
+		)
+
+	def test_surplus_sections_are_merged(self):
+		sections = [{"title": f"Part {i}", "fields": [f"Field {i}"]} for i in range(25)]
+		merged = sectioned_generation.merge_sections(sections, sectioned_generation.MAX_SECTIONS)
+
+		self.assertEqual(len(merged), sectioned_generation.MAX_SECTIONS)
+		self.assertEqual(sum(len(s["fields"]) for s in merged), 25)
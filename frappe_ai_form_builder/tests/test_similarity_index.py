@@ -0,0 +1,59 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+from frappe.tests import UnitTestCase
+
+from frappe_ai_form_builder.api.similarity_index import SimilarityIndex, spec_text, tokenize
+
+
+class UnitTestSimilarityIndex(UnitTestCase):
+	def setUp(self):
+		self.index = SimilarityIndex()
+		self.index.add("ART-1", "Customer Feedback rating comments email Data Rating Small Text")
+		self.index.add("ART-2", "Event Registration attendee email ticket type Data Select")
+		self.index.add("ART-3", "Job Application resume cover letter position Attach Text")
+
+	def test_ranks_closest_artifact_first(self):
+		matches = self.index.query("customer feedback with a rating, comments and an email", limit=3)
+
+		self.assertEqual(matches[0][0], "ART-1")
+		self.assertEqual([artifact_id for artifact_id, _score in matches], ["ART-1", "ART-2"])
+		self.assertGreater(matches[0][1], matches[1][1])
+		self.assertLessEqual(matches[0][1], 1.0)
+
+	def test_identical_text_scores_one(self):
+		index = SimilarityIndex()
+		index.add("ART-1", "incident report severity location")
+		index.add("ART-2", "vendor onboarding tax id bank")
+
+		[(artifact_id, score)] = index.query("incident report severity location", limit=1)
+		self.assertEqual(artifact_id, "ART-1")
+		self.assertAlmostEqual(score, 1.0, places=5)
+
+	def test_unknown_or_stop_words_match_nothing(self):
+		self.assertEqual(self.index.query("please create a form for me"), [])
+		self.assertEqual(self.index.query("spaceship telemetry"), [])
+		self.assertEqual(SimilarityIndex().query("customer feedback"), [])
+
+	def test_re_adding_replaces_the_document(self):
+		self.index.add("ART-1", "Vehicle Inspection mileage tyres brakes")
+
+		self.assertEqual(len(self.index), 3)
+		self.assertEqual(self.index.query("customer feedback rating"), [])
+		self.assertEqual(self.index.query("vehicle inspection brakes")[0][0], "ART-1")
+
+	def test_limit(self):
+		self.assertEqual(len(self.index.query("email data", limit=1)), 1)
+
+	def test_spec_text_and_tokenize(self):
+		spec = {
+			"doctype_name": "Support Ticket",
+			"fields": [
+				{"fieldname": "subject", "label": "Subject", "fieldtype": "Data"},
+				{"fieldname": "priority", "fieldtype": "Select"}
+			]
+		}
+		self.assertEqual(
+			tokenize(spec_text("Support Ticket", spec)),
+			["support", "ticket", "support", "ticket", "subject", "data", "priority", "select"]
+		)
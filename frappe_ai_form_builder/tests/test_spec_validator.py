@@ -0,0 +1,87 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+from frappe.tests import UnitTestCase
+
+from frappe_ai_form_builder.api.spec_validator import SpecValidator
+from frappe_ai_form_builder.tests.utils import make_default_validator
+
+
+def make_spec(*fields, doctype_name="Test Form"):
+	return {"doctype_name": doctype_name, "fields": list(fields)}
+
+
+class UnitTestSpecValidator(UnitTestCase):
+	def setUp(self):
+		self.validator = SpecValidator()
+
+	def test_valid_spec(self):
+		spec = make_spec(
+			{"fieldname": "customer_name", "label": "Customer Name", "fieldtype": "Data"},
+			{"fieldtype": "Section Break", "label": "Details"},
+			{"fieldname": "customer_email", "label": "Email", "fieldtype": "Email"},
+			{"fieldname": "customer", "label": "Customer", "fieldtype": "Link", "options": "Customer"}
+		)
+		self.assertEqual(self.validator.validate(spec), [])
+
+	def test_missing_name_and_fields(self):
+		self.assertEqual(self.validator.validate({}), ["DocType name is required", "Fields array is required"])
+		self.assertEqual(self.validator.validate([]), ["Specification must be a JSON object"])
+
+	def test_collects_every_field_error(self):
+		spec = make_spec(
+			{"fieldname": "owner", "fieldtype": "Data"},
+			{"fieldname": "Customer Name", "fieldtype": "Data"},
+			{"fieldname": "customer", "fieldtype": "Link"},
+			{"fieldname": "notes", "fieldtype": "Spreadsheet"},
+			{"label": "No Fieldname", "fieldtype": "Data"}
+		)
+		self.assertEqual(self.validator.validate(spec), [
+			"Field 'owner' uses a reserved name",
+			"Field 'Customer Name' must be lowercase with underscores only",
+			"Link field 'customer' must specify options (target DocType)",
+			"Field has invalid fieldtype: Spreadsheet",
+			"Field with type 'Data' is missing fieldname"
+		])
+
+	def test_duplicate_fieldnames(self):
+		spec = make_spec(
+			{"fieldname": "email", "fieldtype": "Data"},
+			{"fieldname": "email", "fieldtype": "Email"}
+		)
+		self.assertEqual(self.validator.validate(spec), ["Field 'email' is defined more than once"])
+
+	def test_fieldname_length(self):
+		fieldname = "a" * 141
+		spec = make_spec({"fieldname": fieldname, "fieldtype": "Data"})
+		self.assertEqual(self.validator.validate(spec), [f"Field '{fieldname}' exceeds 140 character limit"])
+
+	def test_blacklisted_fields(self):
+		validator = SpecValidator(blacklisted_fields=["password"])
+		spec = make_spec({"fieldname": "password", "fieldtype": "Data"})
+		self.assertEqual(validator.validate(spec), ["Field 'password' is blacklisted in AI Config"])
+
+	def test_configured_fieldtypes(self):
+		validator = SpecValidator(allowed_fieldtypes=["Data", "Small Text"])
+
+		# Aliases are checked as the type they are created with
+		spec = make_spec(
+			{"fieldname": "email", "fieldtype": "Email"},
+			{"fieldname": "notes", "fieldtype": "Textarea"}
+		)
+		self.assertEqual(validator.validate(spec), [])
+
+		# Layout types are only exempt from the fieldname checks, not the allow-list
+		spec = make_spec({"fieldname": "email", "fieldtype": "Data"}, {"fieldtype": "Section Break"})
+		self.assertEqual(validator.validate(spec), ["Field has invalid fieldtype: Section Break"])
+
+	def test_shipped_default_allows_layout_fields(self):
+		spec = make_spec(
+			{"fieldtype": "Section Break", "label": "Contact"},
+			{"fieldname": "customer_name", "label": "Customer Name", "fieldtype": "Data"},
+			{"fieldtype": "Column Break"},
+			{"fieldname": "customer_email", "label": "Email", "fieldtype": "Email"},
+			{"fieldtype": "Section Break", "label": "Feedback"},
+			{"fieldname": "comments", "label": "Comments", "fieldtype": "Text"}
+		)
+		self.assertEqual(make_default_validator().validate(spec), [])
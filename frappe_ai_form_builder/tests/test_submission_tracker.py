@@ -0,0 +1,94 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+import json
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase, UnitTestCase
+
+from frappe_ai_form_builder.api import submission_tracker
+
+
+class IntegrationTestSubmissionTracker(IntegrationTestCase):
+	def tearDown(self):
+		frappe.flags.in_web_form = False
+
+	def track(self, doc):
+		with patch.object(submission_tracker, "buffer_submission") as buffer_submission, \
+			patch.object(submission_tracker, "increment_submission_count") as increment_submission_count:
+			submission_tracker.track_submission(doc, "after_insert")
+		return buffer_submission, increment_submission_count
+
+	def test_ignores_inserts_outside_web_forms(self):
+		frappe.flags.in_web_form = False
+		with patch.object(submission_tracker, "get_web_form_registry") as get_web_form_registry:
+			buffer_submission, _increment = self.track(frappe._dict(doctype="ToDo"))
+
+		get_web_form_registry.assert_not_called()
+		buffer_submission.assert_not_called()
+
+	def test_ignores_doctypes_without_web_form(self):
+		frappe.flags.in_web_form = True
+		with patch.object(submission_tracker, "get_web_form_registry", return_value={}):
+			buffer_submission, increment_submission_count = self.track(frappe._dict(doctype="ToDo"))
+
+		buffer_submission.assert_not_called()
+		increment_submission_count.assert_not_called()
+
+	def test_buffers_web_form_submissions(self):
+		frappe.flags.in_web_form = True
+		doc = frappe.get_doc({"doctype": "ToDo", "description": "Call the customer back", "priority": "High"})
+		with patch.object(submission_tracker, "get_web_form_registry", return_value={"ToDo": "todo-form"}):
+			buffer_submission, increment_submission_count = self.track(doc)
+
+		record = buffer_submission.call_args.args[0]
+		self.assertEqual(record["form_name"], "todo-form")
+		self.assertEqual(record["form_type"], "ToDo")
+		self.assertEqual(record["status"], "New")
+		self.assertEqual(json.loads(record["submission_data"])["description"], "Call the customer back")
+		increment_submission_count.assert_called_once_with("todo-form", "ToDo")
+
+	def test_registry_is_rebuilt_after_invalidation(self):
+		version = submission_tracker._get_registry_state()[0]
+		self.assertEqual(submission_tracker._get_registry_state()[0], version)
+
+		submission_tracker.invalidate_web_form_registry()
+		self.assertNotEqual(submission_tracker._get_registry_state()[0], version)
+
+
+class UnitTestFieldExtractor(UnitTestCase):
+	def setUp(self):
+		self.fields = [
+			frappe._dict(fieldname="name", fieldtype="Data"),
+			frappe._dict(fieldname="customer_name", fieldtype="Data"),
+			frappe._dict(fieldname="details", fieldtype="Section Break"),
+			frappe._dict(fieldname="quantity", fieldtype="Int"),
+			frappe._dict(fieldname="agree", fieldtype="Check"),
+			frappe._dict(fieldname="amount", fieldtype="Currency"),
+			frappe._dict(fieldname="visit_date", fieldtype="Date"),
+			frappe._dict(fieldname="items", fieldtype="Table"),
+			frappe._dict(fieldname="", fieldtype="Column Break")
+		]
+
+	def test_compile_keeps_data_fields_in_order(self):
+		extractor = submission_tracker.compile_field_extractor(self.fields)
+		self.assertEqual(
+			[fieldname for fieldname, _encode in extractor],
+			["customer_name", "quantity", "agree", "amount", "visit_date"]
+		)
+
+	def test_extract_encodes_numbers_and_skips_empty_values(self):
+		extractor = submission_tracker.compile_field_extractor(self.fields)
+		doc = frappe._dict(name="SUB-1", customer_name="Jane Doe", quantity="3", agree=1, amount="12.50",
+			visit_date="2026-01-31", details="ignored")
+
+		payload = submission_tracker.extract_submission_data(doc, extractor)
+		self.assertEqual(json.loads(payload), {
+			"customer_name": "Jane Doe",
+			"quantity": 3,
+			"agree": 1,
+			"amount": 12.5,
+			"visit_date": "2026-01-31"
+		})
+		self.assertNotIn(" ", payload.replace("Jane Doe", ""))
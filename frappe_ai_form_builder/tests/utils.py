@@ -0,0 +1,26 @@
+# Copyright (c) 2025, Your Name and Contributors
+# See license.txt
+
+import json
+import os
+
+from frappe_ai_form_builder.api.spec_validator import SpecValidator, _split_lines
+
+AI_CONFIG_JSON = os.path.join(
+	os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ai_config", "doctype", "ai_config", "ai_config.json"
+)
+
+
+def get_shipped_config_default(fieldname):
+	"""Default of an AI Config field as shipped in the DocType JSON."""
+	with open(AI_CONFIG_JSON) as f:
+		fields = json.load(f)["fields"]
+	return next(field.get("default") for field in fields if field.get("fieldname") == fieldname)
+
+
+def make_default_validator():
+	"""SpecValidator built from the shipped AI Config defaults, as on a fresh install."""
+	return SpecValidator(
+		allowed_fieldtypes=_split_lines(get_shipped_config_default("allowed_fieldtypes")),
+		blacklisted_fields=_split_lines(get_shipped_config_default("blacklisted_fields"))
+	)
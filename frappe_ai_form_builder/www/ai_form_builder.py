@@ -1,11 +1,32 @@
 import frappe
+import hashlib
+import os
+
+# Static assets of the page, fingerprinted into their URLs
+PAGE_ASSETS = ("css/ai_form_builder_page.css", "js/ai_form_builder_page.js")
+
+_asset_version = None
+
 
 def get_context(context):
     """Web page context"""
-    context.no_cache = 1
+    # The page is a static shell; the CSRF token is fetched by the page
+    # (api.session.get_session_bootstrap), so it can be cached
+    context.no_cache = 0
     context.show_sidebar = False
-    
-    # Pass CSRF token to template (allow Guest for demo)
-    context.csrf_token = frappe.sessions.get_csrf_token()
+    context.asset_version = get_asset_version()
     
     return context
+
+
+def get_asset_version():
+    """Short hash of the page's CSS and JS, so a new build gets new asset URLs."""
+    global _asset_version
+    if _asset_version is None:
+        digest = hashlib.sha1()
+        public_path = frappe.get_app_path("frappe_ai_form_builder", "public")
+        for asset in PAGE_ASSETS:
+            with open(os.path.join(public_path, asset), "rb") as f:
+                digest.update(f.read())
+        _asset_version = digest.hexdigest()[:12]
+    return _asset_version